@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+import codec
+import protocol
+from gen import messages_pb2
+from status import RoomListPage, Status, StatusStore
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_TIMEOUT_S = 5
+DEFAULT_RATE = 16000
+DEFAULT_CHANNELS = 1
+DEFAULT_CHUNK_SIZE = 320
+
+
+class AsyncClient:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, user_id: int, username: str,
+                 encoder: codec.Codec, on_sound_packet: Optional[Callable[[messages_pb2.SoundPacket], None]] = None,
+                 rate: int = DEFAULT_RATE, channels: int = DEFAULT_CHANNELS):
+        self.user_id = user_id
+        self.username = username
+        self.encoder = encoder
+        # Format negotiated with the server, send_sound expects pcm in it
+        self.rate = rate
+        self.channels = channels
+
+        self._reader = reader
+        self._writer = writer
+        self._loop = asyncio.get_running_loop()
+        self._on_sound_packet = on_sound_packet
+        self._status_store = StatusStore(lambda: self._send_message(messages_pb2.StatusRequest()))
+        self._status_waiters: list[tuple[Callable[[Status], bool], asyncio.Future]] = []
+        self._create_room_waiters: list[asyncio.Future] = []
+        self._room_list_waiters: dict[int, asyncio.Future] = dict()
+        self._room_list_request_id = 0
+        self._outgoing: asyncio.Queue = asyncio.Queue()
+        self._sequence_number = 0
+        self._writer_task = asyncio.create_task(self._write_messages())
+        self._reader_task = asyncio.create_task(self._read_messages())
+
+    @staticmethod
+    async def connect(server_ip: str, server_port: int, sign_up_username: str,
+                      on_sound_packet: Optional[Callable[[messages_pb2.SoundPacket], None]] = None,
+                      codecs: Optional[list[int]] = None, rate: int = DEFAULT_RATE, channels: int = DEFAULT_CHANNELS,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'AsyncClient':
+        if codecs is None:
+            codecs = codec.available_codecs(rate, chunk_size)
+        reader, writer = await asyncio.open_connection(server_ip, server_port)
+        try:
+            request = protocol.TransportMessage.from_protobuf(
+                messages_pb2.SignUpRequest(username=sign_up_username, codecs=codecs, status_updates=True, rate=rate,
+                                           channels=channels))
+            protocol.write_transport_messages_async((request,), writer)
+            await writer.drain()
+            auth_response = (await protocol.read_transport_message_async(reader)).to_protobuf()
+            if type(auth_response) is not messages_pb2.AuthorizationResponse:
+                raise TypeError('Expected AuthorizationResponse')
+            if not auth_response.ok:
+                raise ValueError('AuthorizationResponse.ok = false')
+            rate = auth_response.rate or protocol.LEGACY_RATE
+            channels = auth_response.channels or protocol.LEGACY_CHANNELS
+            encoder = codec.create_codec(auth_response.codec, rate, channels, chunk_size)
+        except Exception:
+            writer.close()
+            raise
+        logger.debug(f'Connected to Server, username: {auth_response.username}')
+        return AsyncClient(reader, writer, auth_response.user_id, auth_response.username, encoder, on_sound_packet,
+                           rate, channels)
+
+    def get_status(self) -> Optional[Status]:
+        return self._status_store.get()
+
+    async def create_room(self, name: str = '') -> int:
+        future = self._loop.create_future()
+        self._create_room_waiters.append(future)
+        self._send_message(messages_pb2.CreateRoomRequest(name=name))
+        response = await asyncio.wait_for(future, RESPONSE_TIMEOUT_S)
+        return response.room_id
+
+    async def list_rooms(self, offset: int = 0, limit: int = 0, room_filter: str = '') -> RoomListPage:
+        self._room_list_request_id += 1
+        request_id = self._room_list_request_id
+        future = self._loop.create_future()
+        self._room_list_waiters[request_id] = future
+        self._send_message(messages_pb2.RoomListRequest(request_id=request_id, offset=offset, limit=limit,
+                                                        filter=room_filter))
+        try:
+            return await asyncio.wait_for(future, RESPONSE_TIMEOUT_S)
+        finally:
+            del self._room_list_waiters[request_id]
+
+    async def join_room(self, room_id: int, mixed: bool = False) -> Status:
+        waiter = self._wait_for_status(lambda status: status.room is not None and status.room.id == room_id)
+        self._send_message(messages_pb2.JoinRoomRequest(room_id=room_id, mixed=mixed))
+        return await waiter
+
+    async def leave_room(self) -> Status:
+        waiter = self._wait_for_status(lambda status: status.room is None)
+        self._send_message(messages_pb2.LeaveRoomRequest())
+        return await waiter
+
+    def send_sound(self, data: bytes, capture_timestamp_us: Optional[int] = None) -> int:
+        self._sequence_number += 1
+        if capture_timestamp_us is None:
+            capture_timestamp_us = time.time_ns() // 1000
+        encoded = self.encoder.encode(data)
+        packet = protocol.new_sound_packet(user_id=self.user_id, data=encoded, sequence_number=self._sequence_number,
+                                           capture_timestamp_us=capture_timestamp_us, codec=self.encoder.codec_id,
+                                           rate=self.rate, channels=self.channels)
+        self._outgoing.put_nowait(protocol.encode_sound_packet(packet))
+        return len(encoded)
+
+    def send_sound_threadsafe(self, data: bytes, capture_timestamp_us: Optional[int] = None):
+        self._loop.call_soon_threadsafe(self.send_sound, data, capture_timestamp_us)
+
+    async def close(self):
+        self._reader_task.cancel()
+        self._writer_task.cancel()
+        await asyncio.gather(self._reader_task, self._writer_task, return_exceptions=True)
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        logger.debug(f'Closed, username: {self.username}')
+
+    def _send_message(self, pb_message):
+        self._outgoing.put_nowait(protocol.TransportMessage.from_protobuf(pb_message))
+
+    def _wait_for_status(self, predicate: Callable[[Status], bool]):
+        # The server publishes nothing when a request changes nothing, e.g. leaving while not in a room
+        future = self._loop.create_future()
+        status = self._status_store.get()
+        if status is not None and predicate(status):
+            future.set_result(status)
+        else:
+            self._status_waiters.append((predicate, future))
+        return asyncio.wait_for(future, RESPONSE_TIMEOUT_S)
+
+    async def _write_messages(self):
+        while True:
+            transport_messages = [await self._outgoing.get()]
+            while not self._outgoing.empty():
+                transport_messages.append(self._outgoing.get_nowait())
+            protocol.write_transport_messages_async(transport_messages, self._writer)
+            await self._writer.drain()
+
+    async def _read_messages(self):
+        sound_packet_parser = protocol.SoundPacketParser()
+        try:
+            while True:
+                transport_message = await protocol.read_transport_message_async(self._reader)
+                if transport_message.message_type == messages_pb2.SOUND_PACKET:
+                    if self._on_sound_packet is not None:
+                        self._on_sound_packet(sound_packet_parser.parse(transport_message.message_data))
+                    continue
+                message = transport_message.to_protobuf()
+                if type(message) == messages_pb2.Status:
+                    self._notify_status_waiters(self._status_store.apply_status(message))
+                elif type(message) == messages_pb2.StatusUpdate:
+                    self._notify_status_waiters(self._status_store.apply_update(message))
+                elif type(message) == messages_pb2.CreateRoomResponse:
+                    if self._create_room_waiters:
+                        future = self._create_room_waiters.pop(0)
+                        if not future.done():
+                            future.set_result(message)
+                elif type(message) == messages_pb2.RoomListResponse:
+                    future = self._room_list_waiters.get(message.request_id)
+                    if future is not None and not future.done():
+                        future.set_result(RoomListPage.from_protobuf(message))
+        finally:
+            waiters = self._create_room_waiters + list(self._room_list_waiters.values())
+            for future in waiters + [future for _, future in self._status_waiters]:
+                if not future.done():
+                    future.set_exception(ConnectionError('Connection to server lost'))
+            logger.debug('read_messages - exited')
+
+    def _notify_status_waiters(self, status: Optional[Status]):
+        if status is None:
+            return
+        waiters = []
+        for predicate, future in self._status_waiters:
+            if future.done():
+                continue
+            if predicate(status):
+                future.set_result(status)
+            else:
+                waiters.append((predicate, future))
+        self._status_waiters = waiters
@@ -0,0 +1,310 @@
+import dataclasses
+import logging
+import threading
+import time
+from typing import Callable, Optional, Union
+
+import numpy
+import sounddevice
+from google.protobuf.message import DecodeError
+
+import capture
+import codec
+import metrics
+import protocol
+import vad
+from mixer import AUDIO_FORMAT, MIXED_STREAM_ID, Mixer
+from resampler import Resampler, convert_channels
+from ringbuffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_BUFFER_BLOCKS = 8
+PLAYBACK_BUFFER_BLOCKS = 2
+ECHO_REFERENCE_BLOCKS = 4
+
+
+def _default_device_rate(kind: str) -> int:
+    return int(sounddevice.query_devices(kind=kind)['default_samplerate'])
+
+
+@dataclasses.dataclass(frozen=True)
+class AudioMetrics:
+    capture_overflows: int = 0
+    playback_underruns: int = 0
+    speakers: tuple[metrics.SpeakerMetrics, ...] = ()
+    capture_stages: tuple[metrics.CaptureStageMetrics, ...] = ()
+
+
+class _MultiplePeopleVoicePlayer:
+    def __init__(self, on_speaking_changed: Optional[Callable[[frozenset[int]], None]], block_size: int, rate: int,
+                 channels: int):
+        self._m = threading.Condition()
+        self._mixer = Mixer(block_size, rate, channels)
+        self._on_speaking_changed = on_speaking_changed
+        self._speaking_users_ids: frozenset[int] = frozenset()
+        self._mixed_speaking_users_ids: list[int] = []
+        self._close = False
+        self._block_size = block_size
+        self.rate = rate
+        self.channels = channels
+        self._playback_buffer = RingBuffer(PLAYBACK_BUFFER_BLOCKS * block_size, channels, AUDIO_FORMAT)
+        # What the output device played, read by the capture thread as the echo cancellation reference
+        self.echo_reference = RingBuffer(ECHO_REFERENCE_BLOCKS * block_size, channels, AUDIO_FORMAT)
+        self._playback_space = threading.Event()
+        self.underruns = 0
+        self._thread = threading.Thread(target=self._play)
+        self._thread.start()
+
+    def write_user_data(self, user_id: int, data: bytes, sequence_number: int = 0, capture_timestamp_us: int = 0):
+        with self._m:
+            self._mixer.write_user_data(user_id, data, sequence_number, capture_timestamp_us)
+            self._m.notify()
+
+    def write_mixed_data(self, data: bytes, sequence_number: int, capture_timestamp_us: int,
+                         speaking_users_ids: list[int]):
+        with self._m:
+            self._mixer.write_user_data(MIXED_STREAM_ID, data, sequence_number, capture_timestamp_us)
+            self._mixed_speaking_users_ids = speaking_users_ids
+            self._m.notify()
+
+    def get_speaking_users_ids(self) -> list[int]:
+        with self._m:
+            return self._get_speaking_users_ids()
+
+    def get_speakers_metrics(self) -> list[metrics.SpeakerMetrics]:
+        with self._m:
+            return self._mixer.get_speakers_metrics()
+
+    def close(self):
+        with self._m:
+            self._close = True
+            self._m.notify()
+        self._playback_space.set()
+        self._thread.join()
+        logger.debug("Player closed")
+
+    def _play(self):
+        with sounddevice.OutputStream(samplerate=self.rate, blocksize=self._block_size, dtype=AUDIO_FORMAT,
+                                      channels=self.channels, callback=self._output_callback):
+            while True:
+                with self._m:
+                    while not self._close and not self._mixer.has_users():
+                        self._m.wait()
+                    if self._close:
+                        break
+                self._playback_space.clear()
+                if self._playback_buffer.writable() < self._block_size:
+                    self._playback_space.wait()
+                    continue
+                with self._m:
+                    self._playback_buffer.write(self._mixer.mix_next_chunk())
+                    speaking_users_ids = frozenset(self._get_speaking_users_ids())
+                self._publish_speaking_users_ids(speaking_users_ids)
+
+    def _get_speaking_users_ids(self) -> list[int]:
+        users_ids = self._mixer.get_speaking_users_ids()
+        if MIXED_STREAM_ID in users_ids:
+            users_ids.remove(MIXED_STREAM_ID)
+            users_ids.extend(self._mixed_speaking_users_ids)
+        return users_ids
+
+    def _output_callback(self, outdata: numpy.ndarray, frames: int, time_info, status):
+        n = self._playback_buffer.read_into(outdata)
+        if n < frames:
+            outdata[n:] = 0
+            if self._mixer.has_users():
+                self.underruns += 1
+        self.echo_reference.write(outdata)
+        self._playback_space.set()
+
+    def _publish_speaking_users_ids(self, speaking_users_ids: frozenset[int]):
+        if speaking_users_ids != self._speaking_users_ids:
+            self._speaking_users_ids = speaking_users_ids
+            if self._on_speaking_changed is not None:
+                self._on_speaking_changed(speaking_users_ids)
+
+
+class AudioEngine:
+    # Everything between the sound devices and the sound packets: capture, capture processing, VAD and encoding on
+    # one side, decoding, resampling and mixing on the other. Client runs it in its own process or in an
+    # audio_worker.AudioWorker, which has the same methods.
+    def __init__(self, on_sound_packet: Callable[[protocol.TransportMessage], None],
+                 on_speaking_changed: Optional[Callable[[frozenset[int]], None]], block_size: int, rate: int,
+                 channels: int, vad_threshold_db: Optional[float] = vad.DEFAULT_THRESHOLD_DB,
+                 echo_cancellation: bool = True, noise_suppression: bool = True):
+        self._on_sound_packet = on_sound_packet
+        self._on_speaking_changed = on_speaking_changed
+        # block_size is in frames of the wire rate, the devices run at their own rate and are resampled
+        self._block_size = block_size
+        self._channels = channels
+        self._capture_rate = _default_device_rate('input')
+        self._playback_rate = _default_device_rate('output')
+        self._playback_block_size = max(1, round(block_size * self._playback_rate / rate))
+        capture_block_size = max(1, round(block_size * self._capture_rate / rate))
+        self._capture_buffer = RingBuffer(CAPTURE_BUFFER_BLOCKS * capture_block_size, channels, AUDIO_FORMAT)
+        self._capture_block = numpy.zeros((capture_block_size, channels), dtype=AUDIO_FORMAT)
+        self._capture_ready = threading.Event()
+        self._echo_cancellation = echo_cancellation
+        self._noise_suppression = noise_suppression
+        self._capture_pipeline: Optional[capture.CapturePipeline] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self.capture_overflows = 0
+        self._vad = None if vad_threshold_db is None else \
+            vad.VoiceActivityDetector(vad_threshold_db, vad.hangover_chunks(block_size, rate))
+        # Replaced together, so the capture thread never encodes with a codec made for another format
+        self._wire: Optional[tuple[codec.Codec, tuple[int, int]]] = None
+        self._decoders: dict[int, tuple[tuple[int, int, int], codec.Codec, Resampler]] = dict()
+        self._decode_lock = threading.Lock()
+        self._sound_packet_parser = protocol.SoundPacketParser()
+        self._player: Optional[_MultiplePeopleVoicePlayer] = None
+        self._user_id = 0
+        self._sequence_number = 0
+        self._is_muted = False
+        self._close = False
+
+    def set_wire_format(self, codec_id: int, wire_format: tuple[int, int]):
+        if self._wire is None or self._wire[0].codec_id != codec_id or wire_format != self._wire[1]:
+            self._wire = (codec.create_codec(codec_id, *wire_format, self._block_size), wire_format)
+
+    def start(self, user_id: int):
+        self._user_id = user_id
+        self._player = _MultiplePeopleVoicePlayer(self._on_speaking_changed, self._playback_block_size,
+                                                  self._playback_rate, self._channels)
+        self._capture_thread = threading.Thread(target=self._encode_and_send_voice)
+        self._capture_thread.start()
+
+    def mute(self):
+        self._is_muted = True
+
+    def unmute(self):
+        self._is_muted = False
+
+    def play_sound_packet(self, message_data: Union[bytes, memoryview]):
+        # Both receive threads call this; the parsed packet is shared, so it is only used under the lock
+        with self._decode_lock:
+            try:
+                packet = self._sound_packet_parser.parse(message_data)
+            except (ValueError, DecodeError) as e:
+                # A malformed packet must not end the receive thread that got it
+                logger.debug(f'Dropped malformed sound packet: {e}')
+                return
+            try:
+                data = self._decode_sound_packet(packet) if packet.data else b''
+            except ValueError as e:
+                logger.debug(f'Dropped sound packet from user {packet.user_id}: {e}')
+                return
+            if packet.mixed:
+                self._player.write_mixed_data(data, packet.sequence_number, packet.capture_timestamp_us,
+                                              list(packet.speaking_users_ids))
+            else:
+                self._player.write_user_data(packet.user_id, data, packet.sequence_number,
+                                             packet.capture_timestamp_us)
+
+    def get_speaking_users_ids(self) -> list[int]:
+        return [] if self._player is None else self._player.get_speaking_users_ids()
+
+    def get_metrics(self) -> AudioMetrics:
+        if self._player is None:
+            return AudioMetrics()
+        pipeline = self._capture_pipeline
+        return AudioMetrics(capture_overflows=self.capture_overflows, playback_underruns=self._player.underruns,
+                            speakers=tuple(self._player.get_speakers_metrics()),
+                            capture_stages=() if pipeline is None else pipeline.get_stats())
+
+    def close(self):
+        self._close = True
+        self._capture_ready.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join()
+        if self._player is not None:
+            self._player.close()
+
+    def _input_callback(self, indata: numpy.ndarray, frames: int, time_info, status):
+        if status.input_overflow:
+            self.capture_overflows += 1
+        if not self._is_muted and self._capture_buffer.write(indata) < frames:
+            self.capture_overflows += 1
+        self._capture_ready.set()
+
+    def _encode_and_send_voice(self):
+        is_speech = False
+        device_block = self._capture_block
+        echo_reference = self._player.echo_reference
+        played = numpy.zeros((echo_reference.capacity, self._player.channels), dtype=AUDIO_FORMAT)
+        wire_format = None
+        message = protocol.new_sound_packet(user_id=self._user_id)
+        try:
+            with sounddevice.InputStream(samplerate=self._capture_rate, blocksize=len(device_block), dtype=AUDIO_FORMAT,
+                                         channels=self._channels, callback=self._input_callback):
+                while not self._close:
+                    self._capture_ready.clear()
+                    if self._capture_buffer.readable() < len(device_block):
+                        self._capture_ready.wait()
+                        continue
+                    self._capture_buffer.read_into(device_block)
+                    encoder, current_format = self._wire
+                    if wire_format != current_format:
+                        # The server may pick another format after a reconnect
+                        wire_format = current_format
+                        wire_rate, wire_channels = wire_format
+                        resampler = Resampler(self._capture_rate, wire_rate, wire_channels)
+                        resampled = numpy.zeros((resampler.max_output_frames(len(device_block)), wire_channels),
+                                                dtype=AUDIO_FORMAT)
+                        wire_buffer = RingBuffer(CAPTURE_BUFFER_BLOCKS * self._block_size, wire_channels, AUDIO_FORMAT)
+                        block = numpy.zeros((self._block_size, wire_channels), dtype=AUDIO_FORMAT)
+                        message.rate, message.channels = wire_format
+                        pipeline = capture.create_pipeline(self._block_size, wire_rate, wire_channels,
+                                                           self._echo_cancellation, self._noise_suppression)
+                        echo_canceller = next((s for s in pipeline.stages if isinstance(s, capture.EchoCanceller)),
+                                              None)
+                        echo_resampler = Resampler(self._player.rate, wire_rate)
+                        echo_resampled = numpy.zeros((echo_resampler.max_output_frames(len(played)), 1),
+                                                     dtype=AUDIO_FORMAT)
+                        echo_scaled = numpy.zeros(len(echo_resampled), dtype=numpy.float32)
+                        self._capture_pipeline = pipeline
+                    if echo_reference.writable() == 0:
+                        # Capture stopped for a while (muted), what was played back then is no echo of anything now
+                        echo_reference.clear()
+                    n = echo_reference.read_into(played)
+                    if echo_canceller is not None:
+                        reference = echo_resampler.process(played[:n], out=echo_resampled)
+                        scaled = echo_scaled[:len(reference)]
+                        numpy.divide(reference[:, 0], capture.SAMPLE_SCALE, out=scaled)
+                        echo_canceller.put_reference(scaled)
+                    # Resampling and channel conversion write into arrays made for the format, not new ones per block
+                    wire_buffer.write(resampler.process(device_block, out=resampled))
+                    while wire_buffer.readable() >= self._block_size:
+                        wire_buffer.read_into(block)
+                        processed = pipeline.process(block)
+                        buffered_s = self._capture_buffer.readable() / self._capture_rate + \
+                            (wire_buffer.readable() + self._block_size) / wire_rate
+                        message.capture_timestamp_us = time.time_ns() // 1000 - int(buffered_s * 1_000_000)
+                        message.codec = encoder.codec_id
+                        if self._vad is not None and not self._vad.is_speech(processed):
+                            if is_speech:
+                                message.data = b''
+                                message.sequence_number = 0
+                                self._on_sound_packet(protocol.encode_sound_packet(message))
+                            is_speech = False
+                            continue
+                        is_speech = True
+                        self._sequence_number += 1
+                        message.data = encoder.encode(processed)
+                        message.sequence_number = self._sequence_number
+                        self._on_sound_packet(protocol.encode_sound_packet(message))
+        finally:
+            logger.debug('encode_and_send_voice - exited')
+
+    def _decode_sound_packet(self, packet) -> bytes:
+        # Every stream is converted to the playback device format, whatever rate and channels the sender used
+        stream_id = MIXED_STREAM_ID if packet.mixed else packet.user_id
+        rate, channels = protocol.sound_packet_format(packet)
+        key = (packet.codec, rate, channels)
+        decoder_key, decoder, resampler = self._decoders.get(stream_id, (None, None, None))
+        if decoder_key != key:
+            decoder = codec.create_codec(packet.codec, rate, channels, self._block_size)
+            resampler = Resampler(rate, self._playback_rate, self._channels)
+            self._decoders[stream_id] = (key, decoder, resampler)
+        frames = numpy.frombuffer(decoder.decode(packet.data), dtype=AUDIO_FORMAT).reshape(-1, channels)
+        return resampler.process(convert_channels(frames, self._channels)).tobytes()
@@ -0,0 +1,272 @@
+import dataclasses
+import json
+import logging
+import multiprocessing
+import struct
+import sys
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional, Union
+
+import numpy
+
+import metrics
+import protocol
+import vad
+from audio import AudioEngine, AudioMetrics
+from gen import messages_pb2
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RING_SIZE = 1 << 20
+# The write and the read index are on cache lines of their own, each one is only stored to by one process
+INDEX_STRIDE = 64
+HEADER_SIZE = 2 * INDEX_STRIDE
+FRAME_HEADER = struct.Struct('<IB')
+POLL_INTERVAL_S = 0.5
+METRICS_INTERVAL_S = 0.5
+CONTROL_TIMEOUT_S = 1
+CLOSE_TIMEOUT_S = 5
+
+_SOUND_PACKET = 1
+_START = 2
+_WIRE_FORMAT = 3
+_MUTE = 4
+_UNMUTE = 5
+_CLOSE = 6
+_SPEAKING_USERS_IDS = 7
+_METRICS = 8
+
+_WIRE_FORMAT_PAYLOAD = struct.Struct('<III')
+_START_PAYLOAD = struct.Struct('<I')
+
+
+class SharedRingBuffer:
+    # Single producer, single consumer like RingBuffer, but both indexes live in the shared memory so the ends may be
+    # in different processes. Frames are a length, a type and a payload, and the write index is only moved once the
+    # frame is in place, so the reader never sees half of one. Stores to shared memory are not ordered between
+    # processes on every CPU (ARM may publish the index before the frame), so both ends read and store the indexes
+    # under index_lock, a multiprocessing lock that acts as the fence. Threads of the producing process also take a
+    # lock of their own.
+    def __init__(self, index_lock, name: Optional[str] = None, size: int = DEFAULT_RING_SIZE):
+        self._owner = name is None
+        self.index_lock = index_lock
+        if not self._owner and sys.version_info >= (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name, size=HEADER_SIZE + size, track=False)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name, create=self._owner, size=HEADER_SIZE + size)
+            if not self._owner and multiprocessing.parent_process() is None:
+                # Attaching registers the segment with the resource tracker of this process, which would unlink it
+                # at exit. Child processes share the tracker of their parent instead, where the segment has to stay
+                # registered until its creator unlinks it.
+                resource_tracker.unregister(self._shm._name, 'shared_memory')
+        self._indexes = numpy.ndarray((2,), dtype=numpy.uint64, buffer=self._shm.buf, strides=(INDEX_STRIDE,))
+        self._data = self._shm.buf[HEADER_SIZE:HEADER_SIZE + size]
+        self._capacity = size
+        self._write_lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(self, frame_type: int, payload: Union[bytes, memoryview] = b'') -> bool:
+        n = FRAME_HEADER.size + len(payload)
+        with self._write_lock:
+            with self.index_lock:
+                write_index, read_index = int(self._indexes[0]), int(self._indexes[1])
+            if self._capacity - (write_index - read_index) < n:
+                return False
+            self._copy_in(write_index, FRAME_HEADER.pack(len(payload), frame_type))
+            self._copy_in(write_index + FRAME_HEADER.size, payload)
+            with self.index_lock:
+                self._indexes[0] = write_index + n
+            return True
+
+    def read(self) -> Optional[tuple[int, bytes]]:
+        with self.index_lock:
+            write_index, read_index = int(self._indexes[0]), int(self._indexes[1])
+        if write_index == read_index:
+            return None
+        length, frame_type = FRAME_HEADER.unpack(self._copy_out(read_index, FRAME_HEADER.size))
+        payload = self._copy_out(read_index + FRAME_HEADER.size, length)
+        with self.index_lock:
+            self._indexes[1] = read_index + FRAME_HEADER.size + length
+        return frame_type, payload
+
+    def close(self):
+        # Views into the segment have to be gone before it can be closed
+        self._indexes = None
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    def _copy_in(self, index: int, data: Union[bytes, memoryview]):
+        start = index % self._capacity
+        first = min(len(data), self._capacity - start)
+        self._data[start:start + first] = data[:first]
+        self._data[:len(data) - first] = data[first:]
+
+    def _copy_out(self, index: int, n: int) -> bytes:
+        start = index % self._capacity
+        first = min(n, self._capacity - start)
+        if first == n:
+            return bytes(self._data[start:start + n])
+        return bytes(self._data[start:]) + bytes(self._data[:n - first])
+
+
+def _audio_metrics_from_json(payload: bytes) -> AudioMetrics:
+    fields = json.loads(payload)
+    return AudioMetrics(capture_overflows=fields['capture_overflows'],
+                        playback_underruns=fields['playback_underruns'],
+                        speakers=tuple(metrics.SpeakerMetrics(**s) for s in fields['speakers']),
+                        capture_stages=tuple(metrics.CaptureStageMetrics(**s) for s in fields['capture_stages']))
+
+
+def _run_worker(to_worker_name: str, from_worker_name: str, ring_size: int, to_worker_lock, from_worker_lock,
+                to_worker_ready, from_worker_ready, engine_args: tuple, log_level: int):
+    logging.basicConfig(level=log_level, format='%(asctime)s %(processName)s %(levelname)s %(message)s')
+    to_worker = SharedRingBuffer(to_worker_lock, to_worker_name, ring_size)
+    from_worker = SharedRingBuffer(from_worker_lock, from_worker_name, ring_size)
+
+    def post(frame_type: int, payload: Union[bytes, memoryview]):
+        if from_worker.write(frame_type, payload):
+            from_worker_ready.set()
+
+    def post_speaking_users_ids(speaking_users_ids: frozenset[int]):
+        post(_SPEAKING_USERS_IDS, numpy.array(sorted(speaking_users_ids), dtype=numpy.uint32).tobytes())
+
+    engine = AudioEngine(lambda m: post(_SOUND_PACKET, m.message_data), post_speaking_users_ids, *engine_args)
+    parent = multiprocessing.parent_process()
+    last_metrics_time = 0.0
+    try:
+        while parent is None or parent.is_alive():
+            to_worker_ready.wait(POLL_INTERVAL_S)
+            to_worker_ready.clear()
+            while True:
+                frame = to_worker.read()
+                if frame is None:
+                    break
+                frame_type, payload = frame
+                if frame_type == _SOUND_PACKET:
+                    engine.play_sound_packet(payload)
+                elif frame_type == _WIRE_FORMAT:
+                    codec_id, rate, channels = _WIRE_FORMAT_PAYLOAD.unpack(payload)
+                    engine.set_wire_format(codec_id, (rate, channels))
+                elif frame_type == _START:
+                    engine.start(*_START_PAYLOAD.unpack(payload))
+                elif frame_type == _MUTE:
+                    engine.mute()
+                elif frame_type == _UNMUTE:
+                    engine.unmute()
+                elif frame_type == _CLOSE:
+                    return
+            if time.monotonic() - last_metrics_time >= METRICS_INTERVAL_S:
+                last_metrics_time = time.monotonic()
+                post(_METRICS, json.dumps(dataclasses.asdict(engine.get_metrics())).encode())
+    finally:
+        engine.close()
+        to_worker.close()
+        from_worker.close()
+
+
+class AudioWorker:
+    # Runs the AudioEngine in a process of its own, so the GUI and the network threads never hold the GIL the audio
+    # threads need. Sound packets cross through two SharedRingBuffer, one per direction, and an Event wakes the
+    # reading side. Metrics come every METRICS_INTERVAL_S, so get_metrics may be that old.
+    def __init__(self, on_sound_packet: Callable[[protocol.TransportMessage], None],
+                 on_speaking_changed: Optional[Callable[[frozenset[int]], None]], block_size: int, rate: int,
+                 channels: int, vad_threshold_db: Optional[float] = vad.DEFAULT_THRESHOLD_DB,
+                 echo_cancellation: bool = True, noise_suppression: bool = True, ring_size: int = DEFAULT_RING_SIZE):
+        # A forked child would get the locks of the Qt and network threads in whatever state they were at the fork
+        context = multiprocessing.get_context('spawn')
+        self._on_sound_packet = on_sound_packet
+        self._on_speaking_changed = on_speaking_changed
+        self._speaking_users_ids: frozenset[int] = frozenset()
+        self._metrics = AudioMetrics()
+        self._close = False
+        self._to_worker = SharedRingBuffer(context.Lock(), size=ring_size)
+        self._from_worker = SharedRingBuffer(context.Lock(), size=ring_size)
+        self._to_worker_ready = context.Event()
+        self._from_worker_ready = context.Event()
+        engine_args = (block_size, rate, channels, vad_threshold_db, echo_cancellation, noise_suppression)
+        self._process = context.Process(target=_run_worker, name='audio', daemon=True,
+                                        args=(self._to_worker.name, self._from_worker.name, ring_size,
+                                              self._to_worker.index_lock, self._from_worker.index_lock,
+                                              self._to_worker_ready, self._from_worker_ready, engine_args,
+                                              logging.getLogger().getEffectiveLevel()))
+        self._process.start()
+        self._thread = threading.Thread(target=self._read_frames)
+        self._thread.start()
+
+    def set_wire_format(self, codec_id: int, wire_format: tuple[int, int]):
+        self._send_control(_WIRE_FORMAT, _WIRE_FORMAT_PAYLOAD.pack(codec_id, *wire_format))
+
+    def start(self, user_id: int):
+        self._send_control(_START, _START_PAYLOAD.pack(user_id))
+
+    def mute(self):
+        self._send_control(_MUTE)
+
+    def unmute(self):
+        self._send_control(_UNMUTE)
+
+    def play_sound_packet(self, message_data: Union[bytes, memoryview]):
+        # A full ring means the worker fell behind by seconds, the packet is as good as late
+        if self._to_worker.write(_SOUND_PACKET, message_data):
+            self._to_worker_ready.set()
+
+    def get_speaking_users_ids(self) -> list[int]:
+        return list(self._speaking_users_ids)
+
+    def get_metrics(self) -> AudioMetrics:
+        return self._metrics
+
+    def close(self):
+        self._close = True
+        self._send_control(_CLOSE)
+        self._process.join(CLOSE_TIMEOUT_S)
+        if self._process.is_alive():
+            logger.warning('Audio worker did not exit, terminating it')
+            self._process.terminate()
+            self._process.join()
+        self._from_worker_ready.set()
+        self._thread.join()
+        self._to_worker.close()
+        self._from_worker.close()
+        logger.debug('Audio worker closed')
+
+    def _send_control(self, frame_type: int, payload: bytes = b''):
+        # Control frames are small and rare, they only wait while the ring is full of sound packets
+        deadline = time.monotonic() + CONTROL_TIMEOUT_S
+        while not self._to_worker.write(frame_type, payload):
+            if time.monotonic() > deadline or not self._process.is_alive():
+                logger.warning(f'Dropped control frame = {frame_type} for the audio worker')
+                return
+            time.sleep(0.001)
+        self._to_worker_ready.set()
+
+    def _read_frames(self):
+        try:
+            while not self._close:
+                self._from_worker_ready.wait(POLL_INTERVAL_S)
+                self._from_worker_ready.clear()
+                while True:
+                    frame = self._from_worker.read()
+                    if frame is None:
+                        break
+                    frame_type, payload = frame
+                    if frame_type == _SOUND_PACKET:
+                        self._on_sound_packet(protocol.TransportMessage(messages_pb2.SOUND_PACKET, payload))
+                    elif frame_type == _SPEAKING_USERS_IDS:
+                        self._speaking_users_ids = frozenset(numpy.frombuffer(payload, dtype=numpy.uint32).tolist())
+                        if self._on_speaking_changed is not None:
+                            self._on_speaking_changed(self._speaking_users_ids)
+                    elif frame_type == _METRICS:
+                        self._metrics = _audio_metrics_from_json(payload)
+                if not self._close and not self._process.is_alive():
+                    logger.error(f'Audio worker exited, exit code = {self._process.exitcode}')
+                    break
+        finally:
+            logger.debug('read_frames - exited')
@@ -0,0 +1,346 @@
+import argparse
+import copy
+import dataclasses
+import json
+import logging
+import platform
+import random
+import socket
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import numpy
+
+import capture
+import protocol
+import soundpacket
+from async_client import DEFAULT_CHANNELS, DEFAULT_CHUNK_SIZE, DEFAULT_RATE
+from gen import messages_pb2
+from mixer import Mixer
+from resampler import Resampler
+from status import Status
+
+logger = logging.getLogger(__name__)
+
+FRAMING_BATCH_SIZE = 16
+FRAMING_PAYLOAD_SIZES = (64, DEFAULT_CHUNK_SIZE * 2)
+STATUS_ROOMS = (10, 1_000, 100_000)
+STATUS_ROOM_USERS = 10
+# Page the room list of main.py asks for
+ROOM_LIST_PAGE_SIZE = 100
+MIXER_SPEAKERS = (1, 4, 16, 64)
+CAPTURE_PIPELINES = (('echo_cancellation', True, False), ('noise_suppression', False, True), ('both', True, True))
+RESAMPLER_RATES = ((48000, 16000), (16000, 48000), (44100, 16000), (20000, 48000))
+SOUND_PACKET_CHECKS = 2000
+BENCHMARKS = ('framing', 'protobuf', 'soundpacket', 'status', 'mixer', 'resampler', 'capture')
+
+
+def measure(fn: Callable[[], object], min_time_s: float) -> tuple[int, float]:
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s:
+            return iterations, elapsed
+        iterations = max(iterations * 2, int(iterations * min_time_s / max(elapsed, 1e-9)))
+
+
+def measure_peak_bytes(fn: Callable[[], object], iterations: int = 8) -> int:
+    fn()
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def result(benchmark: str, name: str, iterations: int, elapsed: float, per_iteration: int = 1, **extra) -> dict:
+    return {
+        'benchmark': benchmark,
+        'name': name,
+        'ops_per_s': round(iterations * per_iteration / elapsed, 1),
+        'us_per_op': round(elapsed * 1_000_000 / (iterations * per_iteration), 3),
+        **extra,
+    }
+
+
+def sample_messages() -> dict:
+    users = [messages_pb2.User(id=i, name=f'user-{i}') for i in range(STATUS_ROOM_USERS)]
+    rooms = [messages_pb2.RoomInfo(id=1000 + i, name=f'room-{1000 + i}', users_count=i % STATUS_ROOM_USERS)
+             for i in range(ROOM_LIST_PAGE_SIZE)]
+    samples = [
+        messages_pb2.SignInRequest(token='t' * 32, codecs=[messages_pb2.CODEC_MU_LAW, messages_pb2.CODEC_RAW_PCM],
+                                   status_updates=True, udp_media=True, rate=DEFAULT_RATE, channels=DEFAULT_CHANNELS,
+                                   paged_rooms=True),
+        messages_pb2.SignUpRequest(username='username', codecs=[messages_pb2.CODEC_MU_LAW, messages_pb2.CODEC_RAW_PCM],
+                                   status_updates=True, udp_media=True, rate=DEFAULT_RATE, channels=DEFAULT_CHANNELS,
+                                   paged_rooms=True),
+        messages_pb2.AuthorizationResponse(ok=True, user_id=1, username='username', codec=messages_pb2.CODEC_MU_LAW,
+                                           media_session_key=bytes(protocol.MEDIA_SESSION_KEY_SIZE), media_port=8081,
+                                           token='t' * 32, rate=DEFAULT_RATE, channels=DEFAULT_CHANNELS),
+        messages_pb2.JoinRoomRequest(room_id=1),
+        messages_pb2.SoundPacket(user_id=1, data=bytes(DEFAULT_CHUNK_SIZE), sequence_number=1000,
+                                 capture_timestamp_us=time.time_ns() // 1000, codec=messages_pb2.CODEC_MU_LAW,
+                                 rate=DEFAULT_RATE, channels=DEFAULT_CHANNELS),
+        messages_pb2.CreateRoomRequest(name='room-1000'),
+        messages_pb2.CreateRoomResponse(room_id=1),
+        messages_pb2.Status(rooms_ids=range(100), is_in_room=True,
+                            room=messages_pb2.Room(id=1, users=users, name='room-1'), version=1, rooms_version=100),
+        messages_pb2.StatusUpdate(version=2, added_rooms_ids=[100], joined_users=users[:1], left_users_ids=[2]),
+        messages_pb2.MediaHello(confirmed=True),
+        messages_pb2.RoomListRequest(request_id=1, offset=1000, limit=ROOM_LIST_PAGE_SIZE, filter='room'),
+        messages_pb2.RoomListResponse(request_id=1, offset=1000, total=100_000, rooms=rooms, rooms_version=100),
+    ]
+    return {type(sample): sample for sample in samples}
+
+
+def bench_framing(min_time_s: float) -> list[dict]:
+    results = []
+    for payload_size in FRAMING_PAYLOAD_SIZES:
+        transport_message = protocol.TransportMessage(messages_pb2.SOUND_PACKET, bytes(payload_size))
+        batch = [transport_message] * FRAMING_BATCH_SIZE
+        params = {'payload_bytes': payload_size, 'batch': FRAMING_BATCH_SIZE}
+
+        a, b = socket.socketpair()
+        try:
+            writer, reader = a.makefile('wb', buffering=0), b.makefile('rb')
+
+            def file_round_trip():
+                for m in batch:
+                    protocol.write_transport_message(m, writer)
+                for _ in batch:
+                    protocol.read_transport_message(reader)
+
+            iterations, elapsed = measure(file_round_trip, min_time_s)
+            results.append(result('framing', 'write_transport_message+read_transport_message', iterations, elapsed,
+                                  FRAMING_BATCH_SIZE, peak_traced_bytes=measure_peak_bytes(file_round_trip), **params))
+
+            message_reader = iter(protocol.TransportMessageReader(b))
+
+            def socket_round_trip():
+                protocol.send_transport_messages(batch, a)
+                for _ in batch:
+                    next(message_reader)
+
+            iterations, elapsed = measure(socket_round_trip, min_time_s)
+            results.append(result('framing', 'send_transport_messages+TransportMessageReader', iterations, elapsed,
+                                  FRAMING_BATCH_SIZE, peak_traced_bytes=measure_peak_bytes(socket_round_trip),
+                                  **params))
+        finally:
+            a.close()
+            b.close()
+    return results
+
+
+def bench_protobuf(min_time_s: float) -> list[dict]:
+    results = []
+    samples = sample_messages()
+    for message_type, pb_class in protocol.MESSAGE_TYPE_TO_PB_CLASS.items():
+        sample = samples.get(pb_class, pb_class())
+        transport_message = protocol.TransportMessage.from_protobuf(sample)
+        params = {'message': pb_class.__name__, 'encoded_bytes': len(transport_message.message_data)}
+
+        iterations, elapsed = measure(lambda: protocol.TransportMessage.from_protobuf(sample), min_time_s)
+        results.append(result('protobuf', 'from_protobuf', iterations, elapsed, **params))
+        iterations, elapsed = measure(transport_message.to_protobuf, min_time_s)
+        results.append(result('protobuf', 'to_protobuf', iterations, elapsed, **params))
+    return results
+
+
+def random_sound_packet_fields(rng: random.Random) -> dict:
+    fields = {}
+    if rng.random() < 0.8:
+        fields['data'] = rng.randbytes(rng.choice((1, 127, 128, DEFAULT_CHUNK_SIZE, DEFAULT_CHUNK_SIZE * 2)))
+    for name, bits in (('user_id', 32), ('sequence_number', 32), ('capture_timestamp_us', 64), ('rate', 32),
+                       ('channels', 32)):
+        if rng.random() < 0.7:
+            fields[name] = rng.getrandbits(rng.randint(1, bits))
+    if rng.random() < 0.7:
+        fields['codec'] = rng.choice(messages_pb2.Codec.values())
+    if rng.random() < 0.3:
+        fields['mixed'] = True
+    if rng.random() < 0.3:
+        fields['speaking_users_ids'] = [rng.getrandbits(rng.randint(1, 32)) for _ in range(rng.randint(1, 8))]
+    return fields
+
+
+def check_sound_packet_codec(checks: int = SOUND_PACKET_CHECKS, seed: int = 0):
+    # The hand-rolled codec has to produce the same bytes as messages_pb2 and read back what messages_pb2 writes
+    rng = random.Random(seed)
+    for _ in range(checks):
+        fields = random_sound_packet_fields(rng)
+        pb = messages_pb2.SoundPacket(**fields)
+        expected = pb.SerializeToString()
+        for packet in (pb, soundpacket.SoundPacket(**fields)):
+            encoded = soundpacket.encode(packet)
+            if encoded != expected:
+                raise AssertionError(f'soundpacket.encode({fields}) = {encoded.hex()}, expected {expected.hex()}')
+        decoded = dataclasses.asdict(soundpacket.decode(expected))
+        if decoded != dataclasses.asdict(soundpacket.SoundPacket(**fields)):
+            raise AssertionError(f'soundpacket.decode of {fields} = {decoded}')
+        reparsed = messages_pb2.SoundPacket()
+        reparsed.ParseFromString(soundpacket.encode(soundpacket.SoundPacket(**fields)))
+        if reparsed != pb:
+            raise AssertionError(f'messages_pb2 reads {reparsed} from soundpacket.encode({fields})')
+
+
+def bench_soundpacket(min_time_s: float) -> list[dict]:
+    check_sound_packet_codec()
+    results = []
+    fields = {'data': bytes(DEFAULT_CHUNK_SIZE), 'user_id': 1, 'sequence_number': 1000,
+              'capture_timestamp_us': time.time_ns() // 1000, 'codec': messages_pb2.CODEC_MU_LAW}
+    pb = messages_pb2.SoundPacket(**fields)
+    packet = soundpacket.SoundPacket(**fields)
+    data = pb.SerializeToString()
+    reused_pb = messages_pb2.SoundPacket()
+    reused_packet = soundpacket.SoundPacket()
+    params = {'encoded_bytes': len(data), 'protobuf_backend': protocol.PROTOBUF_BACKEND}
+
+    def parse_new():
+        messages_pb2.SoundPacket().ParseFromString(data)
+
+    def parse_reused():
+        reused_pb.Clear()
+        reused_pb.ParseFromString(data)
+
+    cases = [
+        ('SoundPacket().ParseFromString', parse_new),
+        ('Clear+ParseFromString', parse_reused),
+        ('soundpacket.decode', lambda: soundpacket.decode(data, reused_packet)),
+        ('SerializeToString', pb.SerializeToString),
+        ('soundpacket.encode', lambda: soundpacket.encode(packet)),
+    ]
+    for name, fn in cases:
+        iterations, elapsed = measure(fn, min_time_s)
+        results.append(result('soundpacket', name, iterations, elapsed, **params))
+    return results
+
+
+def bench_status(min_time_s: float) -> list[dict]:
+    results = []
+    users = [messages_pb2.User(id=i, name=f'user-{i}') for i in range(STATUS_ROOM_USERS)]
+    for rooms in STATUS_ROOMS:
+        pb = messages_pb2.Status(rooms_ids=range(rooms), is_in_room=True, room=messages_pb2.Room(id=0, users=users),
+                                 version=1)
+        status = Status.from_protobuf(pb)
+
+        iterations, elapsed = measure(lambda: Status.from_protobuf(pb), min_time_s)
+        results.append(result('status', 'Status.from_protobuf', iterations, elapsed, rooms=rooms))
+        iterations, elapsed = measure(lambda: copy.deepcopy(status), min_time_s)
+        results.append(result('status', 'deepcopy', iterations, elapsed, rooms=rooms))
+    return results
+
+
+def bench_mixer(min_time_s: float) -> list[dict]:
+    results = []
+    chunk_s = DEFAULT_CHUNK_SIZE / DEFAULT_RATE
+    data = (numpy.sin(numpy.arange(DEFAULT_CHUNK_SIZE * DEFAULT_CHANNELS) / 5) * 8000).astype(numpy.int16).tobytes()
+    for speakers in MIXER_SPEAKERS:
+        mixer = Mixer(DEFAULT_CHUNK_SIZE, DEFAULT_RATE, DEFAULT_CHANNELS)
+        sequence_number = 0
+
+        def mix():
+            nonlocal sequence_number
+            sequence_number += 1
+            for user_id in range(speakers):
+                mixer.write_user_data(user_id, data, sequence_number)
+            mixer.mix_next_chunk()
+
+        iterations, elapsed = measure(mix, min_time_s)
+        results.append(result('mixer', 'write_user_data+mix_next_chunk', iterations, elapsed, speakers=speakers,
+                              realtime_factor=round(iterations * chunk_s / elapsed, 1)))
+    return results
+
+
+def bench_resampler(min_time_s: float) -> list[dict]:
+    results = []
+    for from_rate, to_rate in RESAMPLER_RATES:
+        chunk_s = DEFAULT_CHUNK_SIZE / from_rate
+        frames = (numpy.sin(numpy.arange(DEFAULT_CHUNK_SIZE) / 5) * 8000).astype(numpy.int16).reshape(-1, 1)
+        resampler = Resampler(from_rate, to_rate)
+        iterations, elapsed = measure(lambda: resampler.process(frames), min_time_s)
+        results.append(result('resampler', f'{from_rate}->{to_rate}', iterations, elapsed,
+                              realtime_factor=round(iterations * chunk_s / elapsed, 1)))
+    return results
+
+
+def bench_capture(min_time_s: float) -> list[dict]:
+    results = []
+    chunk_s = DEFAULT_CHUNK_SIZE / DEFAULT_RATE
+    rng = numpy.random.default_rng(0)
+    block = rng.integers(-4000, 4000, (DEFAULT_CHUNK_SIZE, DEFAULT_CHANNELS), dtype=numpy.int16)
+    reference = rng.standard_normal(DEFAULT_CHUNK_SIZE).astype(numpy.float32) * 0.1
+    for name, echo_cancellation, noise_suppression in CAPTURE_PIPELINES:
+        pipeline = capture.create_pipeline(DEFAULT_CHUNK_SIZE, DEFAULT_RATE, DEFAULT_CHANNELS, echo_cancellation,
+                                           noise_suppression)
+
+        def process():
+            for stage in pipeline.stages:
+                if isinstance(stage, capture.EchoCanceller):
+                    stage.put_reference(reference)
+            pipeline.process(block)
+
+        iterations, elapsed = measure(process, min_time_s)
+        results.append(result('capture', name, iterations, elapsed,
+                              realtime_factor=round(iterations * chunk_s / elapsed, 1)))
+    return results
+
+
+def run(benchmarks: tuple[str, ...], min_time_s: float) -> dict:
+    functions = {'framing': bench_framing, 'protobuf': bench_protobuf, 'soundpacket': bench_soundpacket,
+                 'status': bench_status, 'mixer': bench_mixer, 'resampler': bench_resampler,
+                 'capture': bench_capture}
+    results = []
+    for benchmark in benchmarks:
+        logger.info(f'Running {benchmark} benchmarks')
+        results.extend(functions[benchmark](min_time_s))
+    return {
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'protobuf_backend': protocol.PROTOBUF_BACKEND,
+        'min_time_s': min_time_s,
+        'results': results,
+    }
+
+
+def print_report(report: dict):
+    print(f'{"benchmark":>11} {"name":>48} {"ops/s":>14} {"us/op":>12}  parameters')
+    for r in report['results']:
+        params = ' '.join(f'{k}={v}' for k, v in r.items() if k not in ('benchmark', 'name', 'ops_per_s', 'us_per_op'))
+        print(f'{r["benchmark"]:>11} {r["name"]:>48} {r["ops_per_s"]:>14} {r["us_per_op"]:>12}  {params}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure protocol and audio pipeline costs')
+    parser.add_argument('--only', choices=BENCHMARKS, action='append', help='run only these benchmarks')
+    parser.add_argument('--min-time-s', type=float, default=0.5, help='minimal measured time per case')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--output', help='also write the JSON report to this file')
+    parser.add_argument('--check', action='store_true',
+                        help='only check the hand-rolled SoundPacket codec against messages_pb2')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.check:
+        check_sound_packet_codec()
+        logger.info(f'Hand-rolled SoundPacket codec matches messages_pb2 ({SOUND_PACKET_CHECKS} packets)')
+        return
+    report = run(tuple(args.only or BENCHMARKS), args.min_time_s)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import logging
+import time
+from typing import Optional
+
+import numpy
+
+from metrics import CaptureStageMetrics
+from mixer import AUDIO_FORMAT
+from ringbuffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MS = 10
+MIN_PARTITION_MS = 2
+SAMPLE_SCALE = 32768.0
+
+DEFAULT_ECHO_FILTER_MS = 200
+ECHO_STEP_SIZE = 0.5
+ECHO_POWER_SMOOTHING = 0.9
+ECHO_REGULARIZATION = 1e-6
+# Reference kept beyond one block; older reference is dropped so it never falls behind the echo it explains
+ECHO_REFERENCE_SLACK_PARTITIONS = 2
+
+DEFAULT_NOISE_SUPPRESSION_DB = 15.0
+NOISE_POWER_SMOOTHING = 0.7
+NOISE_FLOOR_RISE_DB_PER_S = 3.0
+NOISE_DECISION_DIRECTED = 0.95
+
+
+def partition_size(block_size: int, rate: int) -> int:
+    # The largest divisor of the block that is not longer than PARTITION_MS, so stages add no delay between blocks
+    longest = max(1, rate * PARTITION_MS // 1000)
+    return max(d for d in range(1, min(block_size, longest) + 1) if block_size % d == 0)
+
+
+class CaptureStage:
+    # Stages get and return float32 frames of shape (n, channels) scaled to [-1, 1), n is a multiple of the partition
+    # size the stage was created with
+    name = 'stage'
+
+    def process(self, frames: numpy.ndarray) -> numpy.ndarray:
+        raise NotImplementedError
+
+
+class EchoCanceller(CaptureStage):
+    # Partitioned block frequency domain adaptive filter (overlap-save, normalized per bin). The reference is what the
+    # player sent to the output device, the filter learns the path from the speakers to the microphone and subtracts
+    # its estimate from every capture channel.
+    name = 'echo_cancellation'
+
+    def __init__(self, rate: int, channels: int, partition: int, block_size: int,
+                 filter_ms: int = DEFAULT_ECHO_FILTER_MS):
+        self._partition = partition
+        partitions = max(1, -(-rate * filter_ms // 1000 // partition))
+        bins = partition + 1
+        self._reference = RingBuffer(block_size + ECHO_REFERENCE_SLACK_PARTITIONS * partition, 1, numpy.float32)
+        # The previous and the current partition of the reference, transformed together for overlap-save
+        self._reference_window = numpy.zeros(2 * partition, dtype=numpy.float32)
+        # Zeros, then the error of the current partition
+        self._error_window = numpy.zeros((2 * partition, channels), dtype=numpy.float32)
+        self._spectra = numpy.zeros((partitions, bins), dtype=numpy.complex64)
+        self._weights = numpy.zeros((partitions, bins, channels), dtype=numpy.complex64)
+        self._power = numpy.zeros(bins, dtype=numpy.float32)
+
+    def put_reference(self, frames: numpy.ndarray):
+        # Mono float32 frames at the capture rate, in the order they were played
+        frames = frames[-self._reference.capacity:]
+        excess = len(frames) - self._reference.writable()
+        if excess > 0:
+            self._reference.discard(excess)
+        self._reference.write(frames[:, None])
+
+    def process(self, frames: numpy.ndarray) -> numpy.ndarray:
+        out = numpy.empty_like(frames)
+        b = self._partition
+        for start in range(0, len(frames), b):
+            self._next_reference()
+            out[start:start + b] = self._process_partition(frames[start:start + b])
+        return out
+
+    def _next_reference(self):
+        # A reference that ran short is padded with silence
+        current = self._reference_window[self._partition:]
+        n = self._reference.read_into(current[:, None])
+        current[n:] = 0
+
+    def _process_partition(self, near: numpy.ndarray) -> numpy.ndarray:
+        b = self._partition
+        spectrum = numpy.fft.rfft(self._reference_window)
+        self._reference_window[:b] = self._reference_window[b:]
+        self._spectra[1:] = self._spectra[:-1]
+        self._spectra[0] = spectrum
+        if not self._power.any() and not spectrum.any():
+            # Nothing was played yet, there is no echo to remove and the filter would not learn anything
+            return near
+
+        echo = numpy.fft.irfft(numpy.einsum('pk,pkc->kc', self._spectra, self._weights), n=2 * b, axis=0)[b:]
+        error = numpy.subtract(near, echo, out=self._error_window[b:])
+        if not numpy.isfinite(error).all():
+            # Diverged, start learning the echo path again
+            self._weights[:] = 0
+            return near
+        error_spectrum = numpy.fft.rfft(self._error_window, axis=0)
+        self._power = ECHO_POWER_SMOOTHING * self._power + (1 - ECHO_POWER_SMOOTHING) * numpy.abs(spectrum) ** 2
+        # Every partition is updated with the same error, so the step is shared between them
+        normalized_error = error_spectrum / (len(self._spectra) * self._power + ECHO_REGULARIZATION * 2 * b)[:, None]
+        gradient = ECHO_STEP_SIZE * self._spectra.conj()[:, :, None] * normalized_error[None]
+        # Keep the filter causal and as long as a partition, otherwise overlap-save turns into circular convolution
+        gradient = numpy.fft.irfft(gradient, n=2 * b, axis=1)[:, :b]
+        self._weights += numpy.fft.rfft(gradient, n=2 * b, axis=1)
+        return error
+
+
+class NoiseSuppressor(CaptureStage):
+    # Wiener gain per bin from a decision directed a priori SNR, with the noise tracked as the minimum of the smoothed
+    # power that may rise slowly. Windows overlap by half, so the output is one partition late.
+    name = 'noise_suppression'
+
+    def __init__(self, rate: int, channels: int, partition: int,
+                 suppression_db: float = DEFAULT_NOISE_SUPPRESSION_DB):
+        self._partition = partition
+        bins = partition + 1
+        self._window = numpy.sqrt(numpy.hanning(2 * partition + 1)[:-1]).astype(numpy.float32)[:, None]
+        self._min_gain = 10 ** (-suppression_db / 20)
+        self._noise_rise = 10 ** (NOISE_FLOOR_RISE_DB_PER_S / 10 * partition / rate)
+        # The previous and the current partition of the input
+        self._input_window = numpy.zeros((2 * partition, channels), dtype=numpy.float32)
+        self._overlap = numpy.zeros((partition, channels), dtype=numpy.float32)
+        self._smoothed_power = numpy.zeros((bins, channels), dtype=numpy.float32)
+        self._noise: Optional[numpy.ndarray] = None
+        self._previous_clean_power = numpy.zeros((bins, channels), dtype=numpy.float32)
+
+    def process(self, frames: numpy.ndarray) -> numpy.ndarray:
+        out = numpy.empty_like(frames)
+        b = self._partition
+        for start in range(0, len(frames), b):
+            out[start:start + b] = self._process_partition(frames[start:start + b])
+        return out
+
+    def _process_partition(self, frames: numpy.ndarray) -> numpy.ndarray:
+        b = self._partition
+        self._input_window[b:] = frames
+        spectrum = numpy.fft.rfft(self._input_window * self._window, axis=0)
+        self._input_window[:b] = self._input_window[b:]
+        power = numpy.abs(spectrum) ** 2
+        self._smoothed_power = NOISE_POWER_SMOOTHING * self._smoothed_power + (1 - NOISE_POWER_SMOOTHING) * power
+        if self._noise is None:
+            self._noise = self._smoothed_power.copy()
+        self._noise = numpy.minimum(self._noise * self._noise_rise, self._smoothed_power)
+
+        noise = self._noise + 1e-12
+        prior_snr = NOISE_DECISION_DIRECTED * self._previous_clean_power / noise + \
+            (1 - NOISE_DECISION_DIRECTED) * numpy.maximum(power / noise - 1, 0)
+        gain = numpy.maximum(prior_snr / (1 + prior_snr), self._min_gain)
+        self._previous_clean_power = gain ** 2 * power
+
+        out = numpy.fft.irfft(spectrum * gain, n=2 * b, axis=0) * self._window
+        result = self._overlap + out[:b]
+        self._overlap = out[b:]
+        return result
+
+
+class CapturePipeline:
+    # Runs the stages on every captured block and measures the CPU time each one takes, so their cost can be checked
+    # against the duration of the block. The block it returns is overwritten by the next call.
+    def __init__(self, stages: list[CaptureStage], block_size: int, rate: int, channels: int):
+        self.stages = stages
+        self._frames = numpy.zeros((block_size, channels), dtype=numpy.float32)
+        self._block = numpy.zeros((block_size, channels), dtype=AUDIO_FORMAT)
+        self._block_ns = block_size * 1_000_000_000 // rate
+        self._blocks = [0] * len(stages)
+        self._total_ns = [0] * len(stages)
+        self._max_ns = [0] * len(stages)
+
+    def process(self, block: numpy.ndarray) -> numpy.ndarray:
+        if not self.stages:
+            return block
+        frames = self._frames
+        frames[:] = block
+        frames /= SAMPLE_SCALE
+        for i, stage in enumerate(self.stages):
+            start = time.thread_time_ns()
+            frames = stage.process(frames)
+            elapsed = time.thread_time_ns() - start
+            self._blocks[i] += 1
+            self._total_ns[i] += elapsed
+            self._max_ns[i] = max(self._max_ns[i], elapsed)
+        numpy.multiply(frames, SAMPLE_SCALE, out=self._frames)
+        numpy.clip(self._frames, -32768, 32767, out=self._frames)
+        self._block[:] = self._frames
+        return self._block
+
+    def get_stats(self) -> tuple[CaptureStageMetrics, ...]:
+        stats = []
+        for stage, blocks, total_ns, max_ns in zip(self.stages, self._blocks, self._total_ns, self._max_ns):
+            mean_ns = total_ns / blocks if blocks else 0.0
+            stats.append(CaptureStageMetrics(stage=stage.name, processed_blocks=blocks, mean_us=mean_ns / 1000,
+                                             max_us=max_ns / 1000, budget_fraction=mean_ns / self._block_ns))
+        return tuple(stats)
+
+
+def create_pipeline(block_size: int, rate: int, channels: int, echo_cancellation: bool,
+                    noise_suppression: bool) -> CapturePipeline:
+    partition = partition_size(block_size, rate)
+    if partition * 1000 < rate * MIN_PARTITION_MS and (echo_cancellation or noise_suppression):
+        logger.warning(f'Capture processing disabled, block size = {block_size} has no divisor close to '
+                       f'{PARTITION_MS} ms at rate = {rate}')
+        return CapturePipeline([], block_size, rate, channels)
+    stages = []
+    if echo_cancellation:
+        stages.append(EchoCanceller(rate, channels, partition, block_size))
+    if noise_suppression:
+        stages.append(NoiseSuppressor(rate, channels, partition))
+    return CapturePipeline(stages, block_size, rate, channels)
@@ -1,212 +1,393 @@
-import copy
 import dataclasses
 import logging
-import queue
+import random
 import socket
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
-
-import sounddevice
+from typing import Callable, Optional
 
+import audio
+import audio_worker
+import codec
+import metrics
+import outbound
 import protocol
+import recording
+import vad
 from gen import messages_pb2
+from status import RoomListPage, Status, StatusStore
 
 logger = logging.getLogger(__name__)
 
-CHUNK_SIZE = 1024
-AUDIO_FORMAT = 'int16'
+CHUNK_SIZE = 320
 CHANNELS = 1
-RATE = 20000
-SPEAK_TIME_MS = 200
-
+WIRE_RATE = 16000
+MEDIA_PROBE_ATTEMPTS = 5
+MEDIA_PROBE_INTERVAL_S = 0.2
+MEDIA_KEEPALIVE_INTERVAL_S = 5
+CONNECT_TIMEOUT_S = 5
+RECONNECT_MIN_DELAY_S = 0.5
+RECONNECT_MAX_DELAY_S = 30
+RECONNECT_JITTER = 0.25
 
-@dataclasses.dataclass
-class User:
-    id: int
-    name: str
-
-    @staticmethod
-    def from_protobuf(pb: messages_pb2.User):
-        return User(id=pb.id, name=pb.name)
 
-
-@dataclasses.dataclass
-class Room:
-    id: int
-    users: Optional[list[User]]
-
-    @staticmethod
-    def from_protobuf(pb: messages_pb2.Room):
-        return Room(
-            id=pb.id,
-            users=None if pb.users is None else [User.from_protobuf(u) for u in pb.users]
-        )
-
-
-@dataclasses.dataclass
-class Status:
-    rooms_ids: Optional[list[int]]
-    room: Optional[Room]
-
-    @staticmethod
-    def from_protobuf(pb: messages_pb2.Status):
-        return Status(
-            rooms_ids=None if pb.rooms_ids is None else [id for id in pb.rooms_ids],
-            room=None if pb.is_in_room is False else Room.from_protobuf(pb.room)
-        )
-
-
-class _MultiplePeopleVoicePlayer:
-    @dataclasses.dataclass
-    class _UserPlayerData:
-        thread: threading.Thread
-        queue: queue.Queue
-        last_write_time_in_ms: float
-
-    def __init__(self):
-        self._m = threading.Lock()
-        self._user_id_to_data: dict[int, _MultiplePeopleVoicePlayer._UserPlayerData] = dict()
-
-    def write_user_data(self, user_id: int, data: bytes):
-        with self._m:
-            if user_id not in self._user_id_to_data:
-                user_player_data = _MultiplePeopleVoicePlayer._UserPlayerData(None, queue.Queue(), 0)
-                user_player_data.thread = threading.Thread(target=self._play_user_voice, args=(user_player_data,))
-                user_player_data.thread.start()
-                self._user_id_to_data[user_id] = user_player_data
-            self._user_id_to_data[user_id].queue.put(data)
-
-    def get_speaking_users_ids(self) -> list[int]:
-        users_ids = []
-        with self._m:
-            cur_time = time.time_ns() / 1_000_000
-            for user_id, user_player_data in self._user_id_to_data.items():
-                if (cur_time - user_player_data.last_write_time_in_ms) <= SPEAK_TIME_MS:
-                    users_ids.append(user_id)
-        return users_ids
-
-    def close(self):
-        with self._m:
-            for user_player_data in self._user_id_to_data.values():
-                user_player_data.queue.put(None)
-            for user_player_data in self._user_id_to_data.values():
-                user_player_data.thread.join()
-        logger.debug("Player closed")
-
-    def _play_user_voice(self, user_player_data: _UserPlayerData):
-        with sounddevice.RawOutputStream(samplerate=RATE, blocksize=CHUNK_SIZE, dtype=AUDIO_FORMAT,
-                                         channels=CHANNELS) as playing_stream:
-            while True:
-                voice_data = user_player_data.queue.get()
-                if voice_data is None:
-                    break
-                user_player_data.last_write_time_in_ms = time.time_ns() / 1_000_000
-                playing_stream.write(voice_data)
+class AuthorizationError(ValueError):
+    pass
 
 
 class Client:
-    def __init__(self, server_ip: str, server_port: int, sing_in_token: str = None, sign_up_username: str = None):
+    def __init__(self, server_ip: str, server_port: int, sing_in_token: str = None, sign_up_username: str = None,
+                 codecs: Optional[list[int]] = None, vad_threshold_db: Optional[float] = vad.DEFAULT_THRESHOLD_DB,
+                 udp_media: bool = True, block_size: int = CHUNK_SIZE, record_path: Optional[str] = None,
+                 rate: int = WIRE_RATE, channels: int = CHANNELS, echo_cancellation: bool = True,
+                 noise_suppression: bool = True, paged_rooms: bool = True, audio_process: bool = False):
         super().__init__()
         assert (sing_in_token is None) + (sign_up_username is None) == 1
 
         self.server_ip = server_ip
         self.server_port = server_port
-
-        self._status: Optional[messages_pb2.Status] = None
-        self._player: Optional[_MultiplePeopleVoicePlayer] = None
+        self.token: Optional[str] = sing_in_token
+        self.user_id: Optional[int] = None
+        self.username: Optional[str] = sign_up_username
+
+        self._status_store = StatusStore(lambda: self._outbound_queue.put_control(messages_pb2.StatusRequest()))
+        self._status_listeners: list[Callable[[Status], None]] = []
+        self._room_list_listeners: list[Callable[[RoomListPage], None]] = []
+        self._room_list_request_id = 0
+        self._paged_rooms = paged_rooms
+        self._speaking_listeners: list[Callable[[frozenset[int]], None]] = []
         self._close = False
-        self._is_muted = False
+        self._closed = threading.Event()
+        self._connected = threading.Event()
+        self._mixed = False
+        self._outbound_queue = outbound.OutboundQueue()
+        self._requested_format = (rate, channels)
+        self._send_latency = metrics.LatencySummary()
+        self._s: Optional[socket.socket] = None
+        self._media_socket: Optional[socket.socket] = None
+        self._media_session_key = b''
+        self._udp_media = False
+        self._codecs = codec.available_codecs(rate, block_size) if codecs is None else codecs
+        self._request_udp_media = udp_media
+        self._recorder = None if record_path is None else recording.Recorder(record_path)
+        self._executor = ThreadPoolExecutor(5)
+        # With audio_process the devices, capture processing, codecs and mixing run in another process, so neither
+        # the GUI nor the network threads can hold the GIL when a sound device needs data
+        audio_engine = audio_worker.AudioWorker if audio_process else audio.AudioEngine
+        self._audio = audio_engine(self._outbound_queue.put_audio_message, self._notify_speaking_listeners,
+                                   block_size, rate, channels, vad_threshold_db, echo_cancellation, noise_suppression)
 
         try:
-            self._s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self._s.connect((self.server_ip, self.server_port))
-            self._f = self._s.makefile('rwb', buffering=0)
-
             if sign_up_username is not None:
-                protocol.write_protobuf_message(messages_pb2.SignUpRequest(username=sign_up_username), self._f)
+                auth_response = self._connect(messages_pb2.SignUpRequest(
+                    username=sign_up_username, codecs=self._codecs, status_updates=True, udp_media=udp_media,
+                    rate=rate, channels=channels, paged_rooms=paged_rooms))
             else:
-                raise NotImplementedError
-            auth_response = protocol.read_transport_message(self._f).to_protobuf()
-            if type(auth_response) is not messages_pb2.AuthorizationResponse:
-                raise TypeError('Expected AuthorizationResponse')
-            if not auth_response.ok:
-                raise ValueError(f'AuthorizationResponse.ok = false: {auth_response.reason}')
-            self.user_id: int = auth_response.user_id
-            self.username: str = auth_response.username
+                auth_response = self._connect(self._sign_in_request())
+            self.user_id = auth_response.user_id
+            self.username = auth_response.username
+            self._set_wire_format(auth_response)
 
-            self._executor = ThreadPoolExecutor(5)
-            self._executor.submit(self._send_voice_record_to_server)
+            self._audio.start(self.user_id)
             self._executor.submit(self._receive_server_data)
+            self._executor.submit(self._write_messages)
         except Exception:
             self.close()
             raise
 
         logger.debug(f'Connected to Server, username: {self.username}')
 
-    def get_status(self) -> Status:
-        return copy.deepcopy(self._status)
+    def get_status(self) -> Optional[Status]:
+        return self._status_store.get()
 
     def get_speaking_users_ids(self):
-        return self._player.get_speaking_users_ids()
+        return self._audio.get_speaking_users_ids()
+
+    def add_status_listener(self, listener: Callable[[Status], None]):
+        self._status_listeners.append(listener)
+
+    def add_speaking_listener(self, listener: Callable[[frozenset[int]], None]):
+        self._speaking_listeners.append(listener)
+
+    def add_room_list_listener(self, listener: Callable[[RoomListPage], None]):
+        self._room_list_listeners.append(listener)
 
     def mute(self):
-        self._is_muted = True
+        self._audio.mute()
 
     def unmute(self):
-        self._is_muted = False
+        self._audio.unmute()
 
-    def join_room(self, room_id: int):
-        message = messages_pb2.JoinRoomRequest(room_id=room_id)
-        self._submit_message_using_thread_pool(message)
+    def join_room(self, room_id: int, mixed: bool = False):
+        self._mixed = mixed
+        message = messages_pb2.JoinRoomRequest(room_id=room_id, mixed=mixed)
+        self._outbound_queue.put_control(message)
 
     def leave_room(self):
         message = messages_pb2.LeaveRoomRequest()
-        self._submit_message_using_thread_pool(message)
-
-    def create_room(self):
-        message = messages_pb2.CreateRoomRequest()
-        self._submit_message_using_thread_pool(message)
+        self._outbound_queue.put_control(message)
+
+    def create_room(self, name: str = ''):
+        message = messages_pb2.CreateRoomRequest(name=name)
+        self._outbound_queue.put_control(message)
+
+    def request_room_list(self, offset: int, limit: int, room_filter: str = '') -> int:
+        # The page is passed to the room list listeners with the returned request id
+        self._room_list_request_id += 1
+        message = messages_pb2.RoomListRequest(request_id=self._room_list_request_id, offset=offset, limit=limit,
+                                               filter=room_filter)
+        self._outbound_queue.put_control(message)
+        return self._room_list_request_id
+
+    def get_outbound_queue_stats(self) -> outbound.OutboundQueueStats:
+        return self._outbound_queue.get_stats()
+
+    def get_metrics(self) -> metrics.ClientMetrics:
+        audio_metrics = self._audio.get_metrics()
+        return metrics.ClientMetrics(capture_overflows=audio_metrics.capture_overflows,
+                                     playback_underruns=audio_metrics.playback_underruns,
+                                     send_latency=dataclasses.replace(self._send_latency),
+                                     outbound=self._outbound_queue.get_stats(),
+                                     speakers=audio_metrics.speakers,
+                                     protobuf_backend=protocol.PROTOBUF_BACKEND,
+                                     capture_stages=audio_metrics.capture_stages)
 
     def close(self):
         self._close = True
-        self._f.close()
-        self._s.close()
+        self._closed.set()
+        self._connected.set()
+        self._outbound_queue.close()
+        self._disconnect()
         self._executor.shutdown(wait=True, cancel_futures=True)
+        self._audio.close()
+        if self._recorder is not None:
+            self._recorder.close()
         logger.debug(f'Closed, username: {self.username}')
 
-    def _send_voice_record_to_server(self):
-        with sounddevice.RawInputStream(samplerate=RATE, blocksize=CHUNK_SIZE, dtype=AUDIO_FORMAT,
-                                        channels=CHANNELS) as recording_stream:
+    def _sign_in_request(self) -> messages_pb2.SignInRequest:
+        rate, channels = self._requested_format
+        return messages_pb2.SignInRequest(token=self.token, codecs=self._codecs, status_updates=True,
+                                          udp_media=self._request_udp_media, rate=rate, channels=channels,
+                                          paged_rooms=self._paged_rooms)
+
+    def _set_wire_format(self, auth_response: messages_pb2.AuthorizationResponse):
+        wire_format = (auth_response.rate or protocol.LEGACY_RATE, auth_response.channels or protocol.LEGACY_CHANNELS)
+        self._audio.set_wire_format(auth_response.codec, wire_format)
+
+    def _connect(self, request) -> messages_pb2.AuthorizationResponse:
+        s = socket.create_connection((self.server_ip, self.server_port), timeout=CONNECT_TIMEOUT_S)
+        try:
+            reader = protocol.TransportMessageReader(s)
+            protocol.send_protobuf_message(request, s)
+            auth_response = reader.read_transport_message().to_protobuf()
+            if type(auth_response) is not messages_pb2.AuthorizationResponse:
+                raise TypeError('Expected AuthorizationResponse')
+            if not auth_response.ok:
+                raise AuthorizationError(f'AuthorizationResponse.ok = false: {auth_response.reason}')
+            s.settimeout(None)
+        except Exception:
+            s.close()
+            raise
+
+        self._s, self._reader = s, reader
+        self.token = auth_response.token or self.token
+        if auth_response.media_session_key:
+            self._media_session_key = auth_response.media_session_key
+            self._media_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._media_socket.connect((self.server_ip, auth_response.media_port))
+            self._executor.submit(self._receive_media_datagrams, self._media_socket, self._media_session_key)
+        self._connected.set()
+        return auth_response
+
+    def _disconnect(self):
+        self._connected.clear()
+        self._udp_media = False
+        if self._s is not None:
+            self._shutdown_socket()
+            self._s.close()
+        if self._media_socket is not None:
+            self._media_socket.close()
+            self._media_socket = None
+
+    def _reconnect(self) -> bool:
+        status = self._status_store.get()
+        room_id = None if status is None or status.room is None else status.room.id
+        self._disconnect()
+        delay = RECONNECT_MIN_DELAY_S
+        while not self._close:
             try:
-                while not self._close:
-                    data, _ = recording_stream.read(CHUNK_SIZE)
-                    data = bytes(data)
-                    if not self._is_muted:
-                        message = messages_pb2.SoundPacket(user_id=self.user_id, data=data)
-                        protocol.write_protobuf_message(message, self._f)
-            finally:
-                self._f.close()
-                logger.debug('send_voice_record_to_server - exited')
+                auth_response = self._connect(self._sign_in_request())
+            except AuthorizationError as e:
+                logger.error(f'Reconnect rejected: {e}')
+                return False
+            except (OSError, TypeError) as e:
+                logger.info(f'Reconnect failed: {e}, retrying in {delay:.1f} s')
+                self._closed.wait(delay * random.uniform(1, 1 + RECONNECT_JITTER))
+                delay = min(delay * 2, RECONNECT_MAX_DELAY_S)
+                continue
+            self._set_wire_format(auth_response)
+            self._outbound_queue.clear_audio()
+            if room_id is not None:
+                self._outbound_queue.put_control(messages_pb2.JoinRoomRequest(room_id=room_id, mixed=self._mixed),
+                                                 first=True)
+            logger.info(f'Reconnected, username: {self.username}')
+            return True
+        return False
 
     def _receive_server_data(self):
-        self._player = _MultiplePeopleVoicePlayer()
         try:
             while not self._close:
-                message = protocol.read_protobuf_message(self._f)
-                if type(message) == messages_pb2.Status:
-                    self._status = Status.from_protobuf(message)
-                elif type(message) == messages_pb2.SoundPacket:
-                    self._player.write_user_data(message.user_id, message.data)
+                try:
+                    for transport_message in self._reader:
+                        if self._close:
+                            break
+                        if self._recorder is not None:
+                            self._recorder.record(transport_message)
+                        if transport_message.message_type == messages_pb2.SOUND_PACKET:
+                            self._audio.play_sound_packet(transport_message.message_data)
+                        else:
+                            self._handle_server_message(transport_message.to_protobuf())
+                except OSError as e:
+                    if self._close:
+                        break
+                    logger.info(f'Connection lost: {e}')
+                    if not self._reconnect():
+                        break
         finally:
             logger.debug(' receive_server_data - exit start')
-            self._player.close()
-            self._f.close()
+            self._outbound_queue.close()
+            self._connected.set()
+            self._disconnect()
             logger.debug(' receive_server_data - exit done')
 
-    def _submit_message_using_thread_pool(self, message):
-        def submit_message():
-            protocol.write_protobuf_message(message, self._f)
+    def _handle_server_message(self, message):
+        if type(message) == messages_pb2.Status:
+            previous_status = self._status_store.get()
+            status = self._status_store.apply_status(message)
+            if status != previous_status:
+                self._notify_status_listeners(status)
+        elif type(message) == messages_pb2.StatusUpdate:
+            status = self._status_store.apply_update(message)
+            if status is not None:
+                self._notify_status_listeners(status)
+        elif type(message) == messages_pb2.RoomListResponse:
+            page = RoomListPage.from_protobuf(message)
+            for listener in self._room_list_listeners:
+                listener(page)
+
+    def _notify_status_listeners(self, status: Status):
+        for listener in self._status_listeners:
+            listener(status)
+
+    def _notify_speaking_listeners(self, speaking_users_ids: frozenset[int]):
+        for listener in self._speaking_listeners:
+            listener(speaking_users_ids)
+
+    def _receive_media_datagrams(self, media_socket: socket.socket, session_key: bytes):
+        hello = protocol.TransportMessage.from_protobuf(messages_pb2.MediaHello())
+        confirmation = protocol.TransportMessage.from_protobuf(messages_pb2.MediaHello(confirmed=True))
+        buffer = bytearray(protocol.MAX_DATAGRAM_SIZE)
+        view = memoryview(buffer)
+        try:
+            media_socket.settimeout(MEDIA_PROBE_INTERVAL_S)
+            for _ in range(MEDIA_PROBE_ATTEMPTS):
+                protocol.send_datagram(hello, session_key, media_socket)
+                try:
+                    transport_message = self._receive_datagram(media_socket, session_key, view)
+                except socket.timeout:
+                    continue
+                if transport_message is not None and transport_message.message_type == messages_pb2.MEDIA_HELLO:
+                    break
+            else:
+                logger.info('No answer over UDP, sound packets stay on TCP')
+                return
+
+            protocol.send_datagram(confirmation, session_key, media_socket)
+            last_keepalive_time = time.monotonic()
+            if media_socket is not self._media_socket:
+                return
+            self._udp_media = True
+            logger.debug('Sound packets switched to UDP')
+            media_socket.settimeout(MEDIA_KEEPALIVE_INTERVAL_S)
+            while not self._close:
+                if time.monotonic() - last_keepalive_time >= MEDIA_KEEPALIVE_INTERVAL_S:
+                    protocol.send_datagram(confirmation, session_key, media_socket)
+                    last_keepalive_time = time.monotonic()
+                try:
+                    transport_message = self._receive_datagram(media_socket, session_key, view)
+                except socket.timeout:
+                    continue
+                if transport_message is not None and transport_message.message_type == messages_pb2.SOUND_PACKET:
+                    if self._recorder is not None:
+                        self._recorder.record(transport_message)
+                    self._audio.play_sound_packet(transport_message.message_data)
+        except OSError as e:
+            logger.debug(f'receive_media_datagrams - {e}')
+        finally:
+            if media_socket is self._media_socket:
+                self._udp_media = False
+            logger.debug('receive_media_datagrams - exited')
 
-        self._executor.submit(submit_message)
+    @staticmethod
+    def _receive_datagram(media_socket: socket.socket, session_key: bytes,
+                          view: memoryview) -> Optional[protocol.TransportMessage]:
+        n = media_socket.recv_into(view)
+        try:
+            datagram_session_key, transport_message = protocol.decode_datagram(view[:n])
+        except ValueError:
+            return None
+        return transport_message if datagram_session_key == session_key else None
+
+    def _write_messages(self):
+        try:
+            while True:
+                item = self._outbound_queue.get_batch()
+                if item is None:
+                    break
+                batch, queued_time_ns = item
+                if not self._connected.is_set():
+                    self._connected.wait()
+                    batch = [m for m in batch if m.message_type != messages_pb2.SOUND_PACKET]
+                if self._close:
+                    break
+                s = self._s
+                try:
+                    if self._udp_media:
+                        batch = self._send_sound_packets_as_datagrams(batch)
+                    if batch:
+                        protocol.send_transport_messages(batch, s)
+                except OSError as e:
+                    # The receiving thread notices the broken connection and reconnects
+                    logger.debug(f'Dropped {len(batch)} messages: {e}')
+                    self._shutdown(s)
+                    continue
+                self._send_latency.observe((time.monotonic_ns() - queued_time_ns) / 1_000_000)
+        finally:
+            logger.debug('write_messages - exited')
+
+    def _send_sound_packets_as_datagrams(self, batch: list[protocol.TransportMessage]):
+        media_socket, session_key = self._media_socket, self._media_session_key
+        if media_socket is None:
+            return [m for m in batch if m.message_type != messages_pb2.SOUND_PACKET]
+        signalling = []
+        for transport_message in batch:
+            if transport_message.message_type != messages_pb2.SOUND_PACKET:
+                signalling.append(transport_message)
+                continue
+            try:
+                protocol.send_datagram(transport_message, session_key, media_socket)
+            except OSError as e:
+                logger.debug(f'Dropped sound packet datagram: {e}')
+        return signalling
+
+    def _shutdown_socket(self):
+        if self._s is not None:
+            self._shutdown(self._s)
+
+    @staticmethod
+    def _shutdown(s: socket.socket):
+        try:
+            s.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
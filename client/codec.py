@@ -0,0 +1,103 @@
+import numpy
+
+from gen import messages_pb2
+
+try:
+    import opuslib
+except Exception:
+    opuslib = None
+
+OPUS_RATES = (8000, 12000, 16000, 24000, 48000)
+OPUS_FRAME_DURATIONS_US = (2500, 5000, 10000, 20000, 40000, 60000)
+
+_MU_LAW_BIAS = 0x84
+_MU_LAW_CLIP = 8159
+_MU_LAW_SEGMENT_ENDS = numpy.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF])
+
+
+def _build_mu_law_tables():
+    samples = numpy.arange(-32768, 32768, dtype=numpy.int32) >> 2
+    mask = numpy.where(samples < 0, 0x7F, 0xFF)
+    magnitude = numpy.minimum(numpy.abs(samples), _MU_LAW_CLIP) + (_MU_LAW_BIAS >> 2)
+    segment = numpy.searchsorted(_MU_LAW_SEGMENT_ENDS, magnitude)
+    code = numpy.where(segment < 8, (segment << 4) | ((magnitude >> (segment + 1)) & 0x0F), 0x7F)
+    encode_table = (code ^ mask).astype(numpy.uint8)
+    encode_table = numpy.roll(encode_table, -32768)
+
+    codes = ~numpy.arange(256, dtype=numpy.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    magnitude = ((((codes & 0x0F) << 3) + _MU_LAW_BIAS) << exponent) - _MU_LAW_BIAS
+    decode_table = numpy.where(codes & 0x80, -magnitude, magnitude).astype(numpy.int16)
+    return encode_table, decode_table
+
+
+_MU_LAW_ENCODE_TABLE, _MU_LAW_DECODE_TABLE = _build_mu_law_tables()
+
+
+class Codec:
+    codec_id = messages_pb2.CODEC_RAW_PCM
+
+    def encode(self, pcm: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class RawPcmCodec(Codec):
+    codec_id = messages_pb2.CODEC_RAW_PCM
+
+    def encode(self, pcm: bytes) -> bytes:
+        return bytes(pcm)
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+
+class MuLawCodec(Codec):
+    codec_id = messages_pb2.CODEC_MU_LAW
+
+    def encode(self, pcm: bytes) -> bytes:
+        samples = numpy.frombuffer(pcm, dtype=numpy.int16).view(numpy.uint16)
+        return _MU_LAW_ENCODE_TABLE[samples].tobytes()
+
+    def decode(self, data: bytes) -> bytes:
+        return _MU_LAW_DECODE_TABLE[numpy.frombuffer(data, dtype=numpy.uint8)].tobytes()
+
+
+class OpusCodec(Codec):
+    codec_id = messages_pb2.CODEC_OPUS
+
+    def __init__(self, rate: int, channels: int, chunk_size: int):
+        if not OpusCodec.is_supported(rate, chunk_size):
+            raise ValueError(f'Opus does not support rate = {rate} with chunk size = {chunk_size}')
+        self._chunk_size = chunk_size
+        self._encoder = opuslib.Encoder(rate, channels, opuslib.APPLICATION_VOIP)
+        self._decoder = opuslib.Decoder(rate, channels)
+
+    @staticmethod
+    def is_supported(rate: int, chunk_size: int) -> bool:
+        return opuslib is not None and rate in OPUS_RATES and chunk_size * 1_000_000 // rate in OPUS_FRAME_DURATIONS_US
+
+    def encode(self, pcm: bytes) -> bytes:
+        return self._encoder.encode(bytes(pcm), self._chunk_size)
+
+    def decode(self, data: bytes) -> bytes:
+        return self._decoder.decode(bytes(data), self._chunk_size)
+
+
+def available_codecs(rate: int, chunk_size: int) -> list[int]:
+    codecs = [messages_pb2.CODEC_MU_LAW, messages_pb2.CODEC_RAW_PCM]
+    if OpusCodec.is_supported(rate, chunk_size):
+        codecs.insert(0, messages_pb2.CODEC_OPUS)
+    return codecs
+
+
+def create_codec(codec_id: int, rate: int, channels: int, chunk_size: int) -> Codec:
+    if codec_id == messages_pb2.CODEC_RAW_PCM:
+        return RawPcmCodec()
+    if codec_id == messages_pb2.CODEC_MU_LAW:
+        return MuLawCodec()
+    if codec_id == messages_pb2.CODEC_OPUS:
+        return OpusCodec(rate, channels, chunk_size)
+    raise ValueError(f'Codec = {codec_id} is not supported')
@@ -11,10 +11,12 @@ from google.protobuf.internal import enum_type_wrapper
 _sym_db = _symbol_database.Default()
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-  b'\n\x0emessages.proto\x12\x03gen\"\x1e\n\rSignInRequest\x12\r\n\x05token\x18\x01 \x01(\t\"!\n\rSignUpRequest\x12\x10\n\x08username\x18\x01 \x01(\t\"F\n\x15\x41uthorizationResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\r\x12\x10\n\x08username\x18\x03 \x01(\t\"\"\n\x0fJoinRoomRequest\x12\x0f\n\x07room_id\x18\x01 \x01(\r\"\x12\n\x10LeaveRoomRequest\",\n\x0bSoundPacket\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0f\n\x07user_id\x18\x02 \x01(\r\"\x13\n\x11\x43reateRoomRequest\"%\n\x12\x43reateRoomResponse\x12\x0f\n\x07room_id\x18\x01 \x01(\r\" \n\x04User\x12\n\n\x02id\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\",\n\x04Room\x12\n\n\x02id\x18\x01 \x01(\r\x12\x18\n\x05users\x18\x02 \x03(\x0b\x32\t.gen.User\"V\n\x06Status\x12\x11\n\trooms_ids\x18\x01 \x03(\r\x12\x12\n\nis_in_room\x18\x02 \x01(\x08\x12\x1c\n\x04room\x18\x03 \x01(\x0b\x32\t.gen.RoomH\x00\x88\x01\x01\x42\x07\n\x05_room*\xd3\x01\n\x0bMessageType\x12\x13\n\x0fSIGN_IN_REQUEST\x10\x00\x12\x13\n\x0fSIGN_UP_REQUEST\x10\x01\x12\x1a\n\x16\x41UTHORIZATION_RESPONSE\x10\x03\x12\x15\n\x11JOIN_ROOM_REQUEST\x10\x04\x12\x16\n\x12LEAVE_ROOM_REQUEST\x10\x05\x12\x10\n\x0cSOUND_PACKET\x10\x06\x12\x17\n\x13\x43REATE_ROOM_REQUEST\x10\x07\x12\x18\n\x14\x43REATE_ROOM_RESPONSE\x10\x08\x12\n\n\x06STATUS\x10\tB\x06Z\x04/genb\x06proto3')
+  b'\n\x0emessages.proto\x12\x03gen\"\x9a\x01\n\rSignInRequest\x12\r\n\x05token\x18\x01 \x01(\t\x12\x1a\n\x06\x63odecs\x18\x02 \x03(\x0e\x32\n.gen.Codec\x12\x16\n\x0estatus_updates\x18\x03 \x01(\x08\x12\x11\n\tudp_media\x18\x04 \x01(\x08\x12\x0c\n\x04rate\x18\x05 \x01(\r\x12\x10\n\x08\x63hannels\x18\x06 \x01(\r\x12\x13\n\x0bpaged_rooms\x18\x07 \x01(\x08\"\x9d\x01\n\rSignUpRequest\x12\x10\n\x08username\x18\x01 \x01(\t\x12\x1a\n\x06\x63odecs\x18\x02 \x03(\x0e\x32\n.gen.Codec\x12\x16\n\x0estatus_updates\x18\x03 \x01(\x08\x12\x11\n\tudp_media\x18\x04 \x01(\x08\x12\x0c\n\x04rate\x18\x05 \x01(\r\x12\x10\n\x08\x63hannels\x18\x06 \x01(\r\x12\x13\n\x0bpaged_rooms\x18\x07 \x01(\x08\"\xcf\x01\n\x15\x41uthorizationResponse\x12\n\n\x02ok\x18\x01 \x01(\x08\x12\x0f\n\x07user_id\x18\x02 \x01(\r\x12\x10\n\x08username\x18\x03 \x01(\t\x12\x19\n\x05\x63odec\x18\x04 \x01(\x0e\x32\n.gen.Codec\x12\x19\n\x11media_session_key\x18\x05 \x01(\x0c\x12\x12\n\nmedia_port\x18\x06 \x01(\r\x12\r\n\x05token\x18\x07 \x01(\t\x12\x0e\n\x06reason\x18\x08 \x01(\t\x12\x0c\n\x04rate\x18\t \x01(\r\x12\x10\n\x08\x63hannels\x18\n \x01(\r\"1\n\x0fJoinRoomRequest\x12\x0f\n\x07room_id\x18\x01 \x01(\r\x12\r\n\x05mixed\x18\x02 \x01(\x08\"\x12\n\x10LeaveRoomRequest\"\xc9\x01\n\x0bSoundPacket\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0f\n\x07user_id\x18\x02 \x01(\r\x12\x17\n\x0fsequence_number\x18\x03 \x01(\r\x12\x1c\n\x14\x63\x61pture_timestamp_us\x18\x04 \x01(\x04\x12\x19\n\x05\x63odec\x18\x05 \x01(\x0e\x32\n.gen.Codec\x12\r\n\x05mixed\x18\x06 \x01(\x08\x12\x1a\n\x12speaking_users_ids\x18\x07 \x03(\r\x12\x0c\n\x04rate\x18\x08 \x01(\r\x12\x10\n\x08\x63hannels\x18\t \x01(\r\"!\n\x11\x43reateRoomRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"%\n\x12\x43reateRoomResponse\x12\x0f\n\x07room_id\x18\x01 \x01(\r\" \n\x04User\x12\n\n\x02id\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\":\n\x04Room\x12\n\n\x02id\x18\x01 \x01(\r\x12\x18\n\x05users\x18\x02 \x03(\x0b\x32\t.gen.User\x12\x0c\n\x04name\x18\x03 \x01(\t\"~\n\x06Status\x12\x11\n\trooms_ids\x18\x01 \x03(\r\x12\x12\n\nis_in_room\x18\x02 \x01(\x08\x12\x1c\n\x04room\x18\x03 \x01(\x0b\x32\t.gen.RoomH\x00\x88\x01\x01\x12\x0f\n\x07version\x18\x04 \x01(\x04\x12\x15\n\rrooms_version\x18\x05 \x01(\x04\x42\x07\n\x05_room\"\xe0\x01\n\x0cStatusUpdate\x12\x0f\n\x07version\x18\x01 \x01(\x04\x12\x17\n\x0f\x61\x64\x64\x65\x64_rooms_ids\x18\x02 \x03(\r\x12\x19\n\x11removed_rooms_ids\x18\x03 \x03(\r\x12\x14\n\x0croom_changed\x18\x04 \x01(\x08\x12\x1c\n\x04room\x18\x05 \x01(\x0b\x32\t.gen.RoomH\x00\x88\x01\x01\x12\x1f\n\x0cjoined_users\x18\x06 \x03(\x0b\x32\t.gen.User\x12\x16\n\x0eleft_users_ids\x18\x07 \x03(\r\x12\x15\n\rrooms_version\x18\x08 \x01(\x04\x42\x07\n\x05_room\"\x1f\n\nMediaHello\x12\x11\n\tconfirmed\x18\x01 \x01(\x08\"9\n\x08RoomInfo\x12\n\n\x02id\x18\x01 \x01(\r\x12\x0c\n\x04name\x18\x02 \x01(\t\x12\x13\n\x0busers_count\x18\x03 \x01(\r\"T\n\x0fRoomListRequest\x12\x12\n\nrequest_id\x18\x01 \x01(\r\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\r\n\x05limit\x18\x03 \x01(\r\x12\x0e\n\x06\x66ilter\x18\x04 \x01(\t\"z\n\x10RoomListResponse\x12\x12\n\nrequest_id\x18\x01 \x01(\r\x12\x0e\n\x06offset\x18\x02 \x01(\r\x12\r\n\x05total\x18\x03 \x01(\r\x12\x1c\n\x05rooms\x18\x04 \x03(\x0b\x32\r.gen.RoomInfo\x12\x15\n\rrooms_version\x18\x05 \x01(\x04\"\x0f\n\rStatusRequest*\xba\x02\n\x0bMessageType\x12\x13\n\x0fSIGN_IN_REQUEST\x10\x00\x12\x13\n\x0fSIGN_UP_REQUEST\x10\x01\x12\x1a\n\x16\x41UTHORIZATION_RESPONSE\x10\x03\x12\x15\n\x11JOIN_ROOM_REQUEST\x10\x04\x12\x16\n\x12LEAVE_ROOM_REQUEST\x10\x05\x12\x10\n\x0cSOUND_PACKET\x10\x06\x12\x17\n\x13\x43REATE_ROOM_REQUEST\x10\x07\x12\x18\n\x14\x43REATE_ROOM_RESPONSE\x10\x08\x12\n\n\x06STATUS\x10\t\x12\x11\n\rSTATUS_UPDATE\x10\n\x12\x0f\n\x0bMEDIA_HELLO\x10\x0b\x12\x15\n\x11ROOM_LIST_REQUEST\x10\x0c\x12\x16\n\x12ROOM_LIST_RESPONSE\x10\r\x12\x12\n\x0eSTATUS_REQUEST\x10\x0e*<\n\x05\x43odec\x12\x11\n\rCODEC_RAW_PCM\x10\x00\x12\x10\n\x0c\x43ODEC_MU_LAW\x10\x01\x12\x0e\n\nCODEC_OPUS\x10\x02\x42\x06Z\x04/genb\x06proto3')
 
 _MESSAGETYPE = DESCRIPTOR.enum_types_by_name['MessageType']
 MessageType = enum_type_wrapper.EnumTypeWrapper(_MESSAGETYPE)
+_CODEC = DESCRIPTOR.enum_types_by_name['Codec']
+Codec = enum_type_wrapper.EnumTypeWrapper(_CODEC)
 SIGN_IN_REQUEST = 0
 SIGN_UP_REQUEST = 1
 AUTHORIZATION_RESPONSE = 3
@@ -24,6 +26,14 @@ SOUND_PACKET = 6
 CREATE_ROOM_REQUEST = 7
 CREATE_ROOM_RESPONSE = 8
 STATUS = 9
+STATUS_UPDATE = 10
+MEDIA_HELLO = 11
+ROOM_LIST_REQUEST = 12
+ROOM_LIST_RESPONSE = 13
+STATUS_REQUEST = 14
+CODEC_RAW_PCM = 0
+CODEC_MU_LAW = 1
+CODEC_OPUS = 2
 
 _SIGNINREQUEST = DESCRIPTOR.message_types_by_name['SignInRequest']
 _SIGNUPREQUEST = DESCRIPTOR.message_types_by_name['SignUpRequest']
@@ -36,6 +46,12 @@ _CREATEROOMRESPONSE = DESCRIPTOR.message_types_by_name['CreateRoomResponse']
 _USER = DESCRIPTOR.message_types_by_name['User']
 _ROOM = DESCRIPTOR.message_types_by_name['Room']
 _STATUS = DESCRIPTOR.message_types_by_name['Status']
+_STATUSUPDATE = DESCRIPTOR.message_types_by_name['StatusUpdate']
+_MEDIAHELLO = DESCRIPTOR.message_types_by_name['MediaHello']
+_ROOMINFO = DESCRIPTOR.message_types_by_name['RoomInfo']
+_ROOMLISTREQUEST = DESCRIPTOR.message_types_by_name['RoomListRequest']
+_ROOMLISTRESPONSE = DESCRIPTOR.message_types_by_name['RoomListResponse']
+_STATUSREQUEST = DESCRIPTOR.message_types_by_name['StatusRequest']
 SignInRequest = _reflection.GeneratedProtocolMessageType('SignInRequest', (_message.Message,), {
   'DESCRIPTOR': _SIGNINREQUEST,
   '__module__': 'messages_pb2'
@@ -113,31 +129,87 @@ Status = _reflection.GeneratedProtocolMessageType('Status', (_message.Message,),
 })
 _sym_db.RegisterMessage(Status)
 
+StatusUpdate = _reflection.GeneratedProtocolMessageType('StatusUpdate', (_message.Message,), {
+  'DESCRIPTOR': _STATUSUPDATE,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.StatusUpdate)
+})
+_sym_db.RegisterMessage(StatusUpdate)
+
+MediaHello = _reflection.GeneratedProtocolMessageType('MediaHello', (_message.Message,), {
+  'DESCRIPTOR': _MEDIAHELLO,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.MediaHello)
+})
+_sym_db.RegisterMessage(MediaHello)
+
+RoomInfo = _reflection.GeneratedProtocolMessageType('RoomInfo', (_message.Message,), {
+  'DESCRIPTOR': _ROOMINFO,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.RoomInfo)
+})
+_sym_db.RegisterMessage(RoomInfo)
+
+RoomListRequest = _reflection.GeneratedProtocolMessageType('RoomListRequest', (_message.Message,), {
+  'DESCRIPTOR': _ROOMLISTREQUEST,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.RoomListRequest)
+})
+_sym_db.RegisterMessage(RoomListRequest)
+
+RoomListResponse = _reflection.GeneratedProtocolMessageType('RoomListResponse', (_message.Message,), {
+  'DESCRIPTOR': _ROOMLISTRESPONSE,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.RoomListResponse)
+})
+_sym_db.RegisterMessage(RoomListResponse)
+
+StatusRequest = _reflection.GeneratedProtocolMessageType('StatusRequest', (_message.Message,), {
+  'DESCRIPTOR': _STATUSREQUEST,
+  '__module__': 'messages_pb2'
+  # @@protoc_insertion_point(class_scope:gen.StatusRequest)
+})
+_sym_db.RegisterMessage(StatusRequest)
+
 if _descriptor._USE_C_DESCRIPTORS == False:
   DESCRIPTOR._options = None
   DESCRIPTOR._serialized_options = b'Z\004/gen'
-  _MESSAGETYPE._serialized_start = 493
-  _MESSAGETYPE._serialized_end = 704
-  _SIGNINREQUEST._serialized_start = 23
-  _SIGNINREQUEST._serialized_end = 53
-  _SIGNUPREQUEST._serialized_start = 55
-  _SIGNUPREQUEST._serialized_end = 88
-  _AUTHORIZATIONRESPONSE._serialized_start = 90
-  _AUTHORIZATIONRESPONSE._serialized_end = 160
-  _JOINROOMREQUEST._serialized_start = 162
-  _JOINROOMREQUEST._serialized_end = 196
-  _LEAVEROOMREQUEST._serialized_start = 198
-  _LEAVEROOMREQUEST._serialized_end = 216
-  _SOUNDPACKET._serialized_start = 218
-  _SOUNDPACKET._serialized_end = 262
-  _CREATEROOMREQUEST._serialized_start = 264
-  _CREATEROOMREQUEST._serialized_end = 283
-  _CREATEROOMRESPONSE._serialized_start = 285
-  _CREATEROOMRESPONSE._serialized_end = 322
-  _USER._serialized_start = 324
-  _USER._serialized_end = 356
-  _ROOM._serialized_start = 358
-  _ROOM._serialized_end = 402
-  _STATUS._serialized_start = 404
-  _STATUS._serialized_end = 490
+  _MESSAGETYPE._serialized_start = 1668
+  _MESSAGETYPE._serialized_end = 1982
+  _CODEC._serialized_start = 1984
+  _CODEC._serialized_end = 2044
+  _SIGNINREQUEST._serialized_start = 24
+  _SIGNINREQUEST._serialized_end = 178
+  _SIGNUPREQUEST._serialized_start = 181
+  _SIGNUPREQUEST._serialized_end = 338
+  _AUTHORIZATIONRESPONSE._serialized_start = 341
+  _AUTHORIZATIONRESPONSE._serialized_end = 548
+  _JOINROOMREQUEST._serialized_start = 550
+  _JOINROOMREQUEST._serialized_end = 599
+  _LEAVEROOMREQUEST._serialized_start = 601
+  _LEAVEROOMREQUEST._serialized_end = 619
+  _SOUNDPACKET._serialized_start = 622
+  _SOUNDPACKET._serialized_end = 823
+  _CREATEROOMREQUEST._serialized_start = 825
+  _CREATEROOMREQUEST._serialized_end = 858
+  _CREATEROOMRESPONSE._serialized_start = 860
+  _CREATEROOMRESPONSE._serialized_end = 897
+  _USER._serialized_start = 899
+  _USER._serialized_end = 931
+  _ROOM._serialized_start = 933
+  _ROOM._serialized_end = 991
+  _STATUS._serialized_start = 993
+  _STATUS._serialized_end = 1119
+  _STATUSUPDATE._serialized_start = 1122
+  _STATUSUPDATE._serialized_end = 1346
+  _MEDIAHELLO._serialized_start = 1348
+  _MEDIAHELLO._serialized_end = 1379
+  _ROOMINFO._serialized_start = 1381
+  _ROOMINFO._serialized_end = 1438
+  _ROOMLISTREQUEST._serialized_start = 1440
+  _ROOMLISTREQUEST._serialized_end = 1524
+  _ROOMLISTRESPONSE._serialized_start = 1526
+  _ROOMLISTRESPONSE._serialized_end = 1648
+  _STATUSREQUEST._serialized_start = 1650
+  _STATUSREQUEST._serialized_end = 1665
 # @@protoc_insertion_point(module_scope)
@@ -31,6 +31,11 @@ class _MessageTypeEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._En
     CREATE_ROOM_REQUEST: _MessageType.ValueType  # 7
     CREATE_ROOM_RESPONSE: _MessageType.ValueType  # 8
     STATUS: _MessageType.ValueType  # 9
+    STATUS_UPDATE: _MessageType.ValueType  # 10
+    MEDIA_HELLO: _MessageType.ValueType  # 11
+    ROOM_LIST_REQUEST: _MessageType.ValueType  # 12
+    ROOM_LIST_RESPONSE: _MessageType.ValueType  # 13
+    STATUS_REQUEST: _MessageType.ValueType  # 14
 
 
 class MessageType(_MessageType, metaclass=_MessageTypeEnumTypeWrapper):
@@ -46,20 +51,71 @@ SOUND_PACKET: MessageType.ValueType  # 6
 CREATE_ROOM_REQUEST: MessageType.ValueType  # 7
 CREATE_ROOM_RESPONSE: MessageType.ValueType  # 8
 STATUS: MessageType.ValueType  # 9
+STATUS_UPDATE: MessageType.ValueType  # 10
+MEDIA_HELLO: MessageType.ValueType  # 11
+ROOM_LIST_REQUEST: MessageType.ValueType  # 12
+ROOM_LIST_RESPONSE: MessageType.ValueType  # 13
+STATUS_REQUEST: MessageType.ValueType  # 14
 global___MessageType = MessageType
 
 
+class _Codec:
+    ValueType = typing.NewType('ValueType', builtins.int)
+    V: typing_extensions.TypeAlias = ValueType
+
+
+class _CodecEnumTypeWrapper(google.protobuf.internal.enum_type_wrapper._EnumTypeWrapper[_Codec.ValueType],
+                            builtins.type):
+    DESCRIPTOR: google.protobuf.descriptor.EnumDescriptor
+    CODEC_RAW_PCM: _Codec.ValueType  # 0
+    CODEC_MU_LAW: _Codec.ValueType  # 1
+    CODEC_OPUS: _Codec.ValueType  # 2
+
+
+class Codec(_Codec, metaclass=_CodecEnumTypeWrapper):
+    pass
+
+
+CODEC_RAW_PCM: Codec.ValueType  # 0
+CODEC_MU_LAW: Codec.ValueType  # 1
+CODEC_OPUS: Codec.ValueType  # 2
+global___Codec = Codec
+
+
 class SignInRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     TOKEN_FIELD_NUMBER: builtins.int
+    CODECS_FIELD_NUMBER: builtins.int
+    STATUS_UPDATES_FIELD_NUMBER: builtins.int
+    UDP_MEDIA_FIELD_NUMBER: builtins.int
+    RATE_FIELD_NUMBER: builtins.int
+    CHANNELS_FIELD_NUMBER: builtins.int
+    PAGED_ROOMS_FIELD_NUMBER: builtins.int
     token: typing.Text
 
+    @property
+    def codecs(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[global___Codec.ValueType]: ...
+
+    status_updates: builtins.bool
+    udp_media: builtins.bool
+    rate: builtins.int
+    channels: builtins.int
+    paged_rooms: builtins.bool
+
     def __init__(self,
                  *,
                  token: typing.Text = ...,
+                 codecs: typing.Optional[typing.Iterable[global___Codec.ValueType]] = ...,
+                 status_updates: builtins.bool = ...,
+                 udp_media: builtins.bool = ...,
+                 rate: builtins.int = ...,
+                 channels: builtins.int = ...,
+                 paged_rooms: builtins.bool = ...,
                  ) -> None: ...
 
-    def ClearField(self, field_name: typing_extensions.Literal["token", b"token"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "channels", b"channels", "codecs", b"codecs", "paged_rooms", b"paged_rooms", "rate", b"rate",
+        "status_updates", b"status_updates", "token", b"token", "udp_media", b"udp_media"]) -> None: ...
 
 
 global___SignInRequest = SignInRequest
@@ -68,14 +124,37 @@ global___SignInRequest = SignInRequest
 class SignUpRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     USERNAME_FIELD_NUMBER: builtins.int
+    CODECS_FIELD_NUMBER: builtins.int
+    STATUS_UPDATES_FIELD_NUMBER: builtins.int
+    UDP_MEDIA_FIELD_NUMBER: builtins.int
+    RATE_FIELD_NUMBER: builtins.int
+    CHANNELS_FIELD_NUMBER: builtins.int
+    PAGED_ROOMS_FIELD_NUMBER: builtins.int
     username: typing.Text
 
+    @property
+    def codecs(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[global___Codec.ValueType]: ...
+
+    status_updates: builtins.bool
+    udp_media: builtins.bool
+    rate: builtins.int
+    channels: builtins.int
+    paged_rooms: builtins.bool
+
     def __init__(self,
                  *,
                  username: typing.Text = ...,
+                 codecs: typing.Optional[typing.Iterable[global___Codec.ValueType]] = ...,
+                 status_updates: builtins.bool = ...,
+                 udp_media: builtins.bool = ...,
+                 rate: builtins.int = ...,
+                 channels: builtins.int = ...,
+                 paged_rooms: builtins.bool = ...,
                  ) -> None: ...
 
-    def ClearField(self, field_name: typing_extensions.Literal["username", b"username"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "channels", b"channels", "codecs", b"codecs", "paged_rooms", b"paged_rooms", "rate", b"rate",
+        "status_updates", b"status_updates", "udp_media", b"udp_media", "username", b"username"]) -> None: ...
 
 
 global___SignUpRequest = SignUpRequest
@@ -86,19 +165,42 @@ class AuthorizationResponse(google.protobuf.message.Message):
     OK_FIELD_NUMBER: builtins.int
     USER_ID_FIELD_NUMBER: builtins.int
     USERNAME_FIELD_NUMBER: builtins.int
+    CODEC_FIELD_NUMBER: builtins.int
+    MEDIA_SESSION_KEY_FIELD_NUMBER: builtins.int
+    MEDIA_PORT_FIELD_NUMBER: builtins.int
+    TOKEN_FIELD_NUMBER: builtins.int
+    REASON_FIELD_NUMBER: builtins.int
+    RATE_FIELD_NUMBER: builtins.int
+    CHANNELS_FIELD_NUMBER: builtins.int
     ok: builtins.bool
     user_id: builtins.int
     username: typing.Text
+    codec: global___Codec.ValueType
+    media_session_key: builtins.bytes
+    media_port: builtins.int
+    token: typing.Text
+    reason: typing.Text
+    rate: builtins.int
+    channels: builtins.int
 
     def __init__(self,
                  *,
                  ok: builtins.bool = ...,
                  user_id: builtins.int = ...,
                  username: typing.Text = ...,
+                 codec: global___Codec.ValueType = ...,
+                 media_session_key: builtins.bytes = ...,
+                 media_port: builtins.int = ...,
+                 token: typing.Text = ...,
+                 reason: typing.Text = ...,
+                 rate: builtins.int = ...,
+                 channels: builtins.int = ...,
                  ) -> None: ...
 
     def ClearField(self, field_name: typing_extensions.Literal[
-        "ok", b"ok", "user_id", b"user_id", "username", b"username"]) -> None: ...
+        "channels", b"channels", "codec", b"codec", "media_port", b"media_port",
+        "media_session_key", b"media_session_key", "ok", b"ok", "rate", b"rate", "reason", b"reason", "token", b"token",
+        "user_id", b"user_id", "username", b"username"]) -> None: ...
 
 
 global___AuthorizationResponse = AuthorizationResponse
@@ -107,14 +209,17 @@ global___AuthorizationResponse = AuthorizationResponse
 class JoinRoomRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     ROOM_ID_FIELD_NUMBER: builtins.int
+    MIXED_FIELD_NUMBER: builtins.int
     room_id: builtins.int
+    mixed: builtins.bool
 
     def __init__(self,
                  *,
                  room_id: builtins.int = ...,
+                 mixed: builtins.bool = ...,
                  ) -> None: ...
 
-    def ClearField(self, field_name: typing_extensions.Literal["room_id", b"room_id"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal["mixed", b"mixed", "room_id", b"room_id"]) -> None: ...
 
 
 global___JoinRoomRequest = JoinRoomRequest
@@ -134,16 +239,43 @@ class SoundPacket(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     DATA_FIELD_NUMBER: builtins.int
     USER_ID_FIELD_NUMBER: builtins.int
+    SEQUENCE_NUMBER_FIELD_NUMBER: builtins.int
+    CAPTURE_TIMESTAMP_US_FIELD_NUMBER: builtins.int
+    CODEC_FIELD_NUMBER: builtins.int
+    MIXED_FIELD_NUMBER: builtins.int
+    SPEAKING_USERS_IDS_FIELD_NUMBER: builtins.int
+    RATE_FIELD_NUMBER: builtins.int
+    CHANNELS_FIELD_NUMBER: builtins.int
     data: builtins.bytes
     user_id: builtins.int
+    sequence_number: builtins.int
+    capture_timestamp_us: builtins.int
+    codec: global___Codec.ValueType
+    mixed: builtins.bool
+
+    @property
+    def speaking_users_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
+
+    rate: builtins.int
+    channels: builtins.int
 
     def __init__(self,
                  *,
                  data: builtins.bytes = ...,
                  user_id: builtins.int = ...,
+                 sequence_number: builtins.int = ...,
+                 capture_timestamp_us: builtins.int = ...,
+                 codec: global___Codec.ValueType = ...,
+                 mixed: builtins.bool = ...,
+                 speaking_users_ids: typing.Optional[typing.Iterable[builtins.int]] = ...,
+                 rate: builtins.int = ...,
+                 channels: builtins.int = ...,
                  ) -> None: ...
 
-    def ClearField(self, field_name: typing_extensions.Literal["data", b"data", "user_id", b"user_id"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "capture_timestamp_us", b"capture_timestamp_us", "channels", b"channels", "codec", b"codec", "data", b"data",
+        "mixed", b"mixed", "rate", b"rate", "sequence_number", b"sequence_number",
+        "speaking_users_ids", b"speaking_users_ids", "user_id", b"user_id"]) -> None: ...
 
 
 global___SoundPacket = SoundPacket
@@ -151,10 +283,16 @@ global___SoundPacket = SoundPacket
 
 class CreateRoomRequest(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    NAME_FIELD_NUMBER: builtins.int
+    name: typing.Text
 
     def __init__(self,
+                 *,
+                 name: typing.Text = ...,
                  ) -> None: ...
 
+    def ClearField(self, field_name: typing_extensions.Literal["name", b"name"]) -> None: ...
+
 
 global___CreateRoomRequest = CreateRoomRequest
 
@@ -198,18 +336,23 @@ class Room(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor
     ID_FIELD_NUMBER: builtins.int
     USERS_FIELD_NUMBER: builtins.int
+    NAME_FIELD_NUMBER: builtins.int
     id: builtins.int
 
     @property
     def users(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___User]: ...
 
+    name: typing.Text
+
     def __init__(self,
                  *,
                  id: builtins.int = ...,
                  users: typing.Optional[typing.Iterable[global___User]] = ...,
+                 name: typing.Text = ...,
                  ) -> None: ...
 
-    def ClearField(self, field_name: typing_extensions.Literal["id", b"id", "users", b"users"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "id", b"id", "name", b"name", "users", b"users"]) -> None: ...
 
 
 global___Room = Room
@@ -220,6 +363,8 @@ class Status(google.protobuf.message.Message):
     ROOMS_IDS_FIELD_NUMBER: builtins.int
     IS_IN_ROOM_FIELD_NUMBER: builtins.int
     ROOM_FIELD_NUMBER: builtins.int
+    VERSION_FIELD_NUMBER: builtins.int
+    ROOMS_VERSION_FIELD_NUMBER: builtins.int
 
     @property
     def rooms_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
@@ -229,20 +374,192 @@ class Status(google.protobuf.message.Message):
     @property
     def room(self) -> global___Room: ...
 
+    version: builtins.int
+    rooms_version: builtins.int
+
     def __init__(self,
                  *,
                  rooms_ids: typing.Optional[typing.Iterable[builtins.int]] = ...,
                  is_in_room: builtins.bool = ...,
                  room: typing.Optional[global___Room] = ...,
+                 version: builtins.int = ...,
+                 rooms_version: builtins.int = ...,
                  ) -> None: ...
 
     def HasField(self, field_name: typing_extensions.Literal["_room", b"_room", "room", b"room"]) -> builtins.bool: ...
 
     def ClearField(self, field_name: typing_extensions.Literal[
-        "_room", b"_room", "is_in_room", b"is_in_room", "room", b"room", "rooms_ids", b"rooms_ids"]) -> None: ...
+        "_room", b"_room", "is_in_room", b"is_in_room", "room", b"room", "rooms_ids", b"rooms_ids",
+        "rooms_version", b"rooms_version", "version", b"version"]) -> None: ...
 
     def WhichOneof(self, oneof_group: typing_extensions.Literal["_room", b"_room"]) -> typing.Optional[
         typing_extensions.Literal["room"]]: ...
 
 
 global___Status = Status
+
+
+class StatusUpdate(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    VERSION_FIELD_NUMBER: builtins.int
+    ADDED_ROOMS_IDS_FIELD_NUMBER: builtins.int
+    REMOVED_ROOMS_IDS_FIELD_NUMBER: builtins.int
+    ROOM_CHANGED_FIELD_NUMBER: builtins.int
+    ROOM_FIELD_NUMBER: builtins.int
+    JOINED_USERS_FIELD_NUMBER: builtins.int
+    LEFT_USERS_IDS_FIELD_NUMBER: builtins.int
+    ROOMS_VERSION_FIELD_NUMBER: builtins.int
+    version: builtins.int
+
+    @property
+    def added_rooms_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
+
+    @property
+    def removed_rooms_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
+
+    room_changed: builtins.bool
+
+    @property
+    def room(self) -> global___Room: ...
+
+    @property
+    def joined_users(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___User]: ...
+
+    @property
+    def left_users_ids(self) -> google.protobuf.internal.containers.RepeatedScalarFieldContainer[builtins.int]: ...
+
+    rooms_version: builtins.int
+
+    def __init__(self,
+                 *,
+                 version: builtins.int = ...,
+                 added_rooms_ids: typing.Optional[typing.Iterable[builtins.int]] = ...,
+                 removed_rooms_ids: typing.Optional[typing.Iterable[builtins.int]] = ...,
+                 room_changed: builtins.bool = ...,
+                 room: typing.Optional[global___Room] = ...,
+                 joined_users: typing.Optional[typing.Iterable[global___User]] = ...,
+                 left_users_ids: typing.Optional[typing.Iterable[builtins.int]] = ...,
+                 rooms_version: builtins.int = ...,
+                 ) -> None: ...
+
+    def HasField(self, field_name: typing_extensions.Literal["_room", b"_room", "room", b"room"]) -> builtins.bool: ...
+
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "_room", b"_room", "added_rooms_ids", b"added_rooms_ids", "joined_users", b"joined_users",
+        "left_users_ids", b"left_users_ids", "removed_rooms_ids", b"removed_rooms_ids", "room", b"room",
+        "room_changed", b"room_changed", "rooms_version", b"rooms_version", "version", b"version"]) -> None: ...
+
+    def WhichOneof(self, oneof_group: typing_extensions.Literal["_room", b"_room"]) -> typing.Optional[
+        typing_extensions.Literal["room"]]: ...
+
+
+global___StatusUpdate = StatusUpdate
+
+
+class MediaHello(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    CONFIRMED_FIELD_NUMBER: builtins.int
+    confirmed: builtins.bool
+
+    def __init__(self,
+                 *,
+                 confirmed: builtins.bool = ...,
+                 ) -> None: ...
+
+    def ClearField(self, field_name: typing_extensions.Literal["confirmed", b"confirmed"]) -> None: ...
+
+
+global___MediaHello = MediaHello
+
+
+class RoomInfo(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    ID_FIELD_NUMBER: builtins.int
+    NAME_FIELD_NUMBER: builtins.int
+    USERS_COUNT_FIELD_NUMBER: builtins.int
+    id: builtins.int
+    name: typing.Text
+    users_count: builtins.int
+
+    def __init__(self,
+                 *,
+                 id: builtins.int = ...,
+                 name: typing.Text = ...,
+                 users_count: builtins.int = ...,
+                 ) -> None: ...
+
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "id", b"id", "name", b"name", "users_count", b"users_count"]) -> None: ...
+
+
+global___RoomInfo = RoomInfo
+
+
+class RoomListRequest(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    LIMIT_FIELD_NUMBER: builtins.int
+    FILTER_FIELD_NUMBER: builtins.int
+    request_id: builtins.int
+    offset: builtins.int
+    limit: builtins.int
+    filter: typing.Text
+
+    def __init__(self,
+                 *,
+                 request_id: builtins.int = ...,
+                 offset: builtins.int = ...,
+                 limit: builtins.int = ...,
+                 filter: typing.Text = ...,
+                 ) -> None: ...
+
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "filter", b"filter", "limit", b"limit", "offset", b"offset", "request_id", b"request_id"]) -> None: ...
+
+
+global___RoomListRequest = RoomListRequest
+
+
+class RoomListResponse(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+    REQUEST_ID_FIELD_NUMBER: builtins.int
+    OFFSET_FIELD_NUMBER: builtins.int
+    TOTAL_FIELD_NUMBER: builtins.int
+    ROOMS_FIELD_NUMBER: builtins.int
+    ROOMS_VERSION_FIELD_NUMBER: builtins.int
+    request_id: builtins.int
+    offset: builtins.int
+    total: builtins.int
+
+    @property
+    def rooms(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___RoomInfo]: ...
+
+    rooms_version: builtins.int
+
+    def __init__(self,
+                 *,
+                 request_id: builtins.int = ...,
+                 offset: builtins.int = ...,
+                 total: builtins.int = ...,
+                 rooms: typing.Optional[typing.Iterable[global___RoomInfo]] = ...,
+                 rooms_version: builtins.int = ...,
+                 ) -> None: ...
+
+    def ClearField(self, field_name: typing_extensions.Literal[
+        "offset", b"offset", "request_id", b"request_id", "rooms", b"rooms", "rooms_version", b"rooms_version",
+        "total", b"total"]) -> None: ...
+
+
+global___RoomListResponse = RoomListResponse
+
+
+class StatusRequest(google.protobuf.message.Message):
+    """Asks for a full Status, sent by clients whose StatusUpdate versions have a gap"""
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor
+
+    def __init__(self,
+                 ) -> None: ...
+
+
+global___StatusRequest = StatusRequest
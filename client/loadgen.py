@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import random
+import time
+import wave
+from typing import Optional
+
+import numpy
+
+from async_client import DEFAULT_CHUNK_SIZE, DEFAULT_RATE, AsyncClient
+from gen import messages_pb2
+from server import Server
+
+logger = logging.getLogger(__name__)
+
+LATENCY_SAMPLES_PER_CLIENT = 10_000
+CODECS = {'raw': messages_pb2.CODEC_RAW_PCM, 'mu-law': messages_pb2.CODEC_MU_LAW, 'opus': messages_pb2.CODEC_OPUS}
+
+
+class SineSource:
+    def __init__(self, chunk_size: int, rate: int, frequency: float = 440.0, amplitude: int = 8000):
+        self._chunk_size = chunk_size
+        self._phase_step = 2 * numpy.pi * frequency / rate
+        self._amplitude = amplitude
+        self._position = 0
+
+    def next_chunk(self) -> bytes:
+        t = numpy.arange(self._position, self._position + self._chunk_size)
+        self._position += self._chunk_size
+        return (self._amplitude * numpy.sin(t * self._phase_step)).astype(numpy.int16).tobytes()
+
+
+class NoiseSource:
+    def __init__(self, chunk_size: int, amplitude: int = 4000, seed: Optional[int] = None):
+        self._chunk_size = chunk_size
+        self._amplitude = amplitude
+        self._random = numpy.random.default_rng(seed)
+
+    def next_chunk(self) -> bytes:
+        return self._random.integers(-self._amplitude, self._amplitude, self._chunk_size, dtype=numpy.int16).tobytes()
+
+
+class WavSource:
+    def __init__(self, path: str, chunk_size: int):
+        with wave.open(path, 'rb') as f:
+            if f.getsampwidth() != 2:
+                raise ValueError(f'{path}: only 16-bit PCM WAV files are supported')
+            samples = numpy.frombuffer(f.readframes(f.getnframes()), dtype=numpy.int16)
+            samples = samples[::f.getnchannels()]
+        if len(samples) < chunk_size:
+            samples = numpy.resize(samples, chunk_size)
+        self._samples = samples
+        self._chunk_size = chunk_size
+        self._position = random.randrange(len(samples))
+
+    def next_chunk(self) -> bytes:
+        indices = numpy.arange(self._position, self._position + self._chunk_size) % len(self._samples)
+        self._position = (self._position + self._chunk_size) % len(self._samples)
+        return self._samples[indices].tobytes()
+
+
+@dataclasses.dataclass
+class ClientStats:
+    sent_packets: int = 0
+    sent_bytes: int = 0
+    received_packets: int = 0
+    received_bytes: int = 0
+    latency_samples_count: int = 0
+    latencies_ms: list[float] = dataclasses.field(default_factory=list)
+
+    def add_latency(self, latency_ms: float):
+        self.latency_samples_count += 1
+        if len(self.latencies_ms) < LATENCY_SAMPLES_PER_CLIENT:
+            self.latencies_ms.append(latency_ms)
+        else:
+            i = random.randrange(self.latency_samples_count)
+            if i < LATENCY_SAMPLES_PER_CLIENT:
+                self.latencies_ms[i] = latency_ms
+
+
+class SimulatedUser:
+    def __init__(self, index: int, source, chunk_size: int, rate: int, duty_cycle: float, talk_period_s: float,
+                 codec: int):
+        self.index = index
+        self.stats = ClientStats()
+        self.client: Optional[AsyncClient] = None
+        self._source = source
+        self._chunk_size = chunk_size
+        self._rate = rate
+        self._chunk_s = chunk_size / rate
+        self._codec = codec
+        self._duty_cycle = duty_cycle
+        self._talk_period_s = talk_period_s
+        self._phase_s = random.uniform(0, talk_period_s)
+
+    async def connect(self, server_ip: str, server_port: int):
+        self.client = await AsyncClient.connect(server_ip, server_port, f'loadgen-{self.index}',
+                                                on_sound_packet=self._on_sound_packet, codecs=[self._codec],
+                                                rate=self._rate, chunk_size=self._chunk_size)
+
+    async def speak(self, duration_s: float):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        next_chunk_time = start
+        while next_chunk_time - start < duration_s:
+            position = (next_chunk_time - start + self._phase_s) % self._talk_period_s
+            if position < self._duty_cycle * self._talk_period_s:
+                self.stats.sent_bytes += self.client.send_sound(self._source.next_chunk())
+                self.stats.sent_packets += 1
+            next_chunk_time += self._chunk_s
+            await asyncio.sleep(max(0.0, next_chunk_time - loop.time()))
+
+    def _on_sound_packet(self, packet: messages_pb2.SoundPacket):
+        if (packet.user_id == self.client.user_id and not packet.mixed) or not packet.data:
+            return
+        self.stats.received_packets += 1
+        self.stats.received_bytes += len(packet.data)
+        if packet.capture_timestamp_us:
+            self.stats.add_latency((time.time_ns() // 1000 - packet.capture_timestamp_us) / 1000)
+
+
+def make_source(args, index: int):
+    if args.source == 'sine':
+        return SineSource(args.chunk_size, args.rate, frequency=220 + 20 * (index % 40))
+    if args.source == 'noise':
+        return NoiseSource(args.chunk_size, seed=index)
+    return WavSource(args.wav_file, args.chunk_size)
+
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {}
+    p50, p90, p99 = numpy.percentile(values, [50, 90, 99])
+    return {'p50': round(p50, 3), 'p90': round(p90, 3), 'p99': round(p99, 3), 'max': round(max(values), 3)}
+
+
+def build_report(users: list[SimulatedUser], duration_s: float) -> dict:
+    clients = []
+    for user in users:
+        stats = user.stats
+        clients.append({
+            'user_id': user.client.user_id,
+            'send_packets_per_s': round(stats.sent_packets / duration_s, 2),
+            'send_bytes_per_s': round(stats.sent_bytes / duration_s, 2),
+            'receive_packets_per_s': round(stats.received_packets / duration_s, 2),
+            'receive_bytes_per_s': round(stats.received_bytes / duration_s, 2),
+            'latency_ms': percentiles(stats.latencies_ms),
+        })
+    all_latencies = [latency for user in users for latency in user.stats.latencies_ms]
+    return {
+        'duration_s': duration_s,
+        'users': len(users),
+        'total': {
+            'send_packets_per_s': round(sum(c['send_packets_per_s'] for c in clients), 2),
+            'send_bytes_per_s': round(sum(c['send_bytes_per_s'] for c in clients), 2),
+            'receive_packets_per_s': round(sum(c['receive_packets_per_s'] for c in clients), 2),
+            'receive_bytes_per_s': round(sum(c['receive_bytes_per_s'] for c in clients), 2),
+            'latency_ms': percentiles(all_latencies),
+        },
+        'clients': clients,
+    }
+
+
+def print_report(report: dict, per_client: bool):
+    header = f'{"client":>8} {"tx pkt/s":>10} {"tx B/s":>12} {"rx pkt/s":>10} {"rx B/s":>12} ' \
+             f'{"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8}'
+    print(header)
+
+    def row(name, c):
+        latency = c['latency_ms']
+        print(f'{name:>8} {c["send_packets_per_s"]:>10} {c["send_bytes_per_s"]:>12} {c["receive_packets_per_s"]:>10} '
+              f'{c["receive_bytes_per_s"]:>12} {latency.get("p50", "-"):>8} {latency.get("p90", "-"):>8} '
+              f'{latency.get("p99", "-"):>8} {latency.get("max", "-"):>8}')
+
+    if per_client:
+        for c in report['clients']:
+            row(c['user_id'], c)
+    row('total', report['total'])
+
+
+async def run(args) -> dict:
+    server = None
+    server_ip, server_port = args.server_ip, args.server_port
+    if server_ip is None:
+        server = Server()
+        server_ip, server_port = '127.0.0.1', await server.start()
+
+    users = [SimulatedUser(i, make_source(args, i), args.chunk_size, args.rate, args.duty_cycle, args.talk_period_s,
+                           CODECS[args.codec])
+             for i in range(args.users)]
+    try:
+        await asyncio.gather(*(user.connect(server_ip, server_port) for user in users))
+        rooms_ids = [await users[i % len(users)].client.create_room() for i in range(args.rooms)]
+        await asyncio.gather(*(user.client.join_room(rooms_ids[user.index % len(rooms_ids)], args.mixed)
+                               for user in users))
+        logger.info(f'{len(users)} users joined {len(rooms_ids)} rooms, speaking for {args.duration_s} s')
+        await asyncio.gather(*(user.speak(args.duration_s) for user in users))
+        return build_report(users, args.duration_s)
+    finally:
+        await asyncio.gather(*(user.client.close() for user in users if user.client is not None))
+        if server is not None:
+            await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate many voice chat clients without audio devices')
+    parser.add_argument('--server-ip', help='server to load; an in-process server is used when omitted')
+    parser.add_argument('--server-port', type=int, default=8081)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--rooms', type=int, default=10)
+    parser.add_argument('--source', choices=('sine', 'noise', 'wav'), default='sine')
+    parser.add_argument('--wav-file')
+    parser.add_argument('--duty-cycle', type=float, default=0.3, help='fraction of time each user speaks')
+    parser.add_argument('--talk-period-s', type=float, default=4.0)
+    parser.add_argument('--duration-s', type=float, default=10.0)
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--codec', choices=tuple(CODECS), default='mu-law')
+    parser.add_argument('--mixed', action='store_true',
+                        help='ask the server for one mixed stream per listener, only server.py mixes')
+    parser.add_argument('--per-client', action='store_true', help='print a line per client')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+    if args.source == 'wav' and args.wav_file is None:
+        parser.error('--source wav requires --wav-file')
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, args.per_client)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,22 @@
 import logging
 import sys
+from typing import Optional
 
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QCloseEvent, QColor, QIntValidator
-from PySide6.QtWidgets import (QApplication, QHBoxLayout, QLabel, QLineEdit, QListWidget, QListWidgetItem, QMainWindow,
-                               QPushButton, QVBoxLayout, QWidget)
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QObject, Qt, QTimer, Signal
+from PySide6.QtGui import QBrush, QCloseEvent, QColor, QHideEvent, QIntValidator, QShowEvent
+from PySide6.QtWidgets import (QApplication, QCheckBox, QComboBox, QHBoxLayout, QLabel, QLineEdit, QListView,
+                               QListWidget, QListWidgetItem, QMainWindow, QPlainTextEdit, QPushButton, QVBoxLayout,
+                               QWidget)
 
-from client import Client, User
+import metrics
+from client import Client
+from status import RoomInfo, RoomListPage, Status, User
 
 logger = logging.getLogger(__name__)
 
+ROOM_LIST_PAGE_SIZE = 100
+ROOM_LIST_REFRESH_MS = 5000
+
 
 class QListWidgetItemUser(QListWidgetItem):
     def __init__(self, user: User):
@@ -17,6 +24,117 @@ class QListWidgetItemUser(QListWidgetItem):
         self.user = user
 
 
+class ClientSignals(QObject):
+    status_changed = Signal(object)
+    speaking_changed = Signal(object)
+    room_list_received = Signal(object)
+
+
+class RoomListModel(QAbstractListModel):
+    # Rows are fetched from the server a page at a time when the view scrolls to the last loaded row. Pages for an
+    # older filter are ignored when they arrive.
+    def __init__(self, client: Client, parent: QObject = None):
+        super().__init__(parent)
+        self.client = client
+        self.rooms: list[RoomInfo] = []
+        self.total: Optional[int] = None
+        self.filter = ""
+        self.pending_requests: dict[int, str] = dict()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rooms)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rooms):
+            return None
+        room = self.rooms[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{room.name} ({room.users_count})"
+        if role == Qt.ToolTipRole:
+            return f"Room {room.id}, {room.users_count} users"
+        if role == Qt.UserRole:
+            return room.id
+        return None
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        return not parent.isValid() and (self.total is None or len(self.rooms) < self.total)
+
+    def fetchMore(self, parent: QModelIndex):
+        if self.filter not in self.pending_requests.values():
+            self.request(len(self.rooms), ROOM_LIST_PAGE_SIZE)
+
+    def set_filter(self, room_filter: str):
+        self.beginResetModel()
+        self.filter = room_filter
+        self.rooms = []
+        self.total = None
+        self.endResetModel()
+        self.request(0, ROOM_LIST_PAGE_SIZE)
+
+    def refresh(self, first_row: int, last_row: int):
+        # Occupancy and new rooms are not pushed, so the rows the user can see are fetched again
+        self.request(first_row, max(last_row - first_row + 1, ROOM_LIST_PAGE_SIZE))
+
+    def request(self, offset: int, limit: int):
+        self.pending_requests[self.client.request_room_list(offset, limit, self.filter)] = self.filter
+
+    def update_rooms(self, page: RoomListPage):
+        if self.pending_requests.pop(page.request_id, None) != self.filter or page.offset > len(self.rooms):
+            return
+        self.total = page.total
+        rooms = list(page.rooms)
+        replaced = min(len(rooms), len(self.rooms) - page.offset)
+        if replaced > 0:
+            self.rooms[page.offset:page.offset + replaced] = rooms[:replaced]
+            self.dataChanged.emit(self.index(page.offset), self.index(page.offset + replaced - 1))
+        if len(rooms) > replaced:
+            self.beginInsertRows(QModelIndex(), len(self.rooms), len(self.rooms) + len(rooms) - replaced - 1)
+            self.rooms.extend(rooms[replaced:])
+            self.endInsertRows()
+        if len(self.rooms) > self.total:
+            self.beginRemoveRows(QModelIndex(), self.total, len(self.rooms) - 1)
+            del self.rooms[self.total:]
+            self.endRemoveRows()
+
+
+class DebugWindow(QWidget):
+    FORMATS = {"Prometheus": metrics.to_prometheus, "JSON": metrics.to_json}
+
+    def __init__(self, client: Client):
+        super().__init__()
+        self.client = client
+        self.setWindowTitle("Voice Chat metrics")
+
+        self.format = QComboBox()
+        self.format.addItems(list(self.FORMATS))
+        self.format.currentTextChanged.connect(self.update_metrics)
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        layout = QVBoxLayout()
+        layout.addWidget(self.format)
+        layout.addWidget(self.text)
+        self.setLayout(layout)
+        self.resize(640, 480)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.update_metrics)
+
+    def showEvent(self, event: QShowEvent) -> None:
+        self.update_metrics()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def update_metrics(self):
+        scroll = self.text.verticalScrollBar().value()
+        self.text.setPlainText(self.FORMATS[self.format.currentText()](self.client.get_metrics()))
+        self.text.verticalScrollBar().setValue(scroll)
+
+
 class MainWindow(QMainWindow):
 
     def __init__(self, parent: QWidget, client: Client):
@@ -27,18 +145,32 @@ class MainWindow(QMainWindow):
 
         self.setAttribute(Qt.WA_DeleteOnClose, True)
 
-        self.rooms = QListWidget()
-        self.rooms.itemDoubleClicked.connect(self.join_room)
+        self.rooms_model = RoomListModel(client, self)
+        self.rooms_filter = QLineEdit()
+        self.rooms_filter.setPlaceholderText("Search rooms")
+        self.rooms_filter.textChanged.connect(self.rooms_model.set_filter)
+        self.rooms = QListView()
+        self.rooms.setModel(self.rooms_model)
+        self.rooms.setUniformItemSizes(True)
+        self.rooms.doubleClicked.connect(self.join_room)
         self.join_room_button = QPushButton("Join")
         self.join_room_button.clicked.connect(self.join_room)
+        self.mixed_checkbox = QCheckBox("Mixed by server")
+        self.mixed_checkbox.setToolTip("Receive one stream for the whole room instead of one per speaker. Only the "
+                                       "Python server (server.py) mixes, the Go server ignores this option")
+        self.room_name = QLineEdit()
+        self.room_name.setPlaceholderText("New room name")
         self.create_room_button = QPushButton("Create")
         self.create_room_button.clicked.connect(self.create_room)
         rooms_layout = QVBoxLayout()
         rooms_label = QLabel("Rooms")
         rooms_label.setAlignment(Qt.AlignCenter)
         rooms_layout.addWidget(rooms_label)
+        rooms_layout.addWidget(self.rooms_filter)
         rooms_layout.addWidget(self.rooms)
         rooms_layout.addWidget(self.join_room_button)
+        rooms_layout.addWidget(self.mixed_checkbox)
+        rooms_layout.addWidget(self.room_name)
         rooms_layout.addWidget(self.create_room_button)
 
         self.current_room_label = QLabel("Out of room")
@@ -48,37 +180,61 @@ class MainWindow(QMainWindow):
         self.current_room_mute_unmute_button.clicked.connect(self.mute_unmute)
         self.current_room_leave_button = QPushButton("Leave room")
         self.current_room_leave_button.clicked.connect(self.leave_room)
+        self.debug_window = DebugWindow(client)
+        self.debug_button = QPushButton("Metrics")
+        self.debug_button.clicked.connect(self.debug_window.show)
         user_room_layout = QVBoxLayout()
         user_room_layout.addWidget(self.current_room_label)
         user_room_layout.addWidget(self.current_room_users)
         user_room_layout.addWidget(self.current_room_mute_unmute_button)
         user_room_layout.addWidget(self.current_room_leave_button)
+        user_room_layout.addWidget(self.debug_button)
 
         layout = QHBoxLayout()
         layout.addLayout(rooms_layout, 2)
         layout.addLayout(user_room_layout, 3)
 
-        self.timer = QTimer(self)
-        self.timer.setInterval(50)
-        self.timer.timeout.connect(self.update_window_with_new_data)
-        self.timer.start()
-
         widget = QWidget()
         widget.setLayout(layout)
         self.setCentralWidget(widget)
 
+        self.rooms_version = None
+        self.user_id_to_item: dict[int, QListWidgetItemUser] = dict()
+        self.current_room_id = None
+        self.speaking_users_ids = frozenset()
+        self.current_room_users.setSortingEnabled(True)
+        self.update_current_room(None)
+
+        self.signals = ClientSignals(self)
+        self.signals.status_changed.connect(self.update_status, Qt.QueuedConnection)
+        self.signals.speaking_changed.connect(self.update_speaking_users, Qt.QueuedConnection)
+        self.signals.room_list_received.connect(self.rooms_model.update_rooms, Qt.QueuedConnection)
+        self.client.add_status_listener(self.signals.status_changed.emit)
+        self.client.add_speaking_listener(self.signals.speaking_changed.emit)
+        self.client.add_room_list_listener(self.signals.room_list_received.emit)
+        self.rooms_model.set_filter("")
+        self.rooms_refresh_timer = QTimer(self)
+        self.rooms_refresh_timer.setInterval(ROOM_LIST_REFRESH_MS)
+        self.rooms_refresh_timer.timeout.connect(self.refresh_rooms)
+        self.rooms_refresh_timer.start()
+        status = self.client.get_status()
+        if status is not None:
+            self.update_status(status)
+
     def closeEvent(self, event: QCloseEvent) -> None:
+        self.debug_window.close()
         self.client.close()
         event.accept()
         self.parent.show()
 
     def create_room(self):
-        self.client.create_room()
+        self.client.create_room(self.room_name.text())
+        self.room_name.clear()
 
     def join_room(self):
-        item = self.rooms.currentItem()
-        if item is not None:
-            self.client.join_room(int(item.text()))
+        index = self.rooms.currentIndex()
+        if index.isValid():
+            self.client.join_room(index.data(Qt.UserRole), self.mixed_checkbox.isChecked())
 
     def mute_unmute(self, event):
         if self.current_room_mute_unmute_button.text() == "Mute mic":
@@ -90,32 +246,62 @@ class MainWindow(QMainWindow):
 
     def leave_room(self):
         self.client.leave_room()
-        self.rooms.currentItem().setSelected(False)
-
-    def update_window_with_new_data(self):
-        status = self.client.get_status()
-        if status is None:
-            return
-
-        for i in range(self.rooms.count(), len(status.rooms_ids)):
-            self.rooms.addItem(str(status.rooms_ids[i]))
-
-        self.current_room_users.clear()
-        if status.room is None:
+        self.rooms.clearSelection()
+
+    def refresh_rooms(self):
+        first = self.rooms.indexAt(self.rooms.viewport().rect().topLeft())
+        last = self.rooms.indexAt(self.rooms.viewport().rect().bottomLeft())
+        first_row = first.row() if first.isValid() else 0
+        last_row = last.row() if last.isValid() else self.rooms_model.rowCount() - 1
+        self.rooms_model.refresh(first_row, last_row)
+
+    def update_status(self, status: Status):
+        if status.rooms_version != self.rooms_version:
+            self.rooms_version = status.rooms_version
+            self.refresh_rooms()
+
+        room_id = None if status.room is None else status.room.id
+        if room_id != self.current_room_id:
+            self.update_current_room(room_id, status.room.name if status.room is not None else "")
+        users = dict() if status.room is None else {user.id: user for user in status.room.users}
+        for user_id in [id for id in self.user_id_to_item if id not in users]:
+            item = self.user_id_to_item.pop(user_id)
+            self.current_room_users.takeItem(self.current_room_users.row(item))
+        for user_id, user in users.items():
+            item = self.user_id_to_item.get(user_id)
+            if item is not None and item.user == user:
+                continue
+            if item is not None:
+                self.current_room_users.takeItem(self.current_room_users.row(item))
+            item = QListWidgetItemUser(user)
+            self.recolor_user_item(item)
+            self.user_id_to_item[user_id] = item
+            self.current_room_users.addItem(item)
+
+    def update_current_room(self, room_id, room_name: str = ""):
+        self.current_room_id = room_id
+        if room_id is None:
             self.current_room_label.setText("Out of room")
             self.current_room_leave_button.setDisabled(True)
             self.current_room_mute_unmute_button.setDisabled(True)
         else:
-            speaking_users_ids = self.client.get_speaking_users_ids()
-            self.current_room_label.setText(f"Current room: {status.room.id}")
+            self.current_room_label.setText(f"Current room: {room_name or room_id}")
             self.current_room_leave_button.setDisabled(False)
             self.current_room_mute_unmute_button.setDisabled(False)
-            for user in status.room.users:
-                item = QListWidgetItemUser(user)
-                if user.id in speaking_users_ids:
-                    item.setBackground(QColor('green'))
-                self.current_room_users.addItem(item)
-            self.current_room_users.sortItems()
+
+    def update_speaking_users(self, speaking_users_ids: frozenset[int]):
+        changed_users_ids = speaking_users_ids ^ self.speaking_users_ids
+        self.speaking_users_ids = speaking_users_ids
+        for user_id in changed_users_ids:
+            item = self.user_id_to_item.get(user_id)
+            if item is not None:
+                self.recolor_user_item(item)
+
+    def recolor_user_item(self, item: QListWidgetItemUser):
+        if item.user.id in self.speaking_users_ids:
+            item.setBackground(QColor('green'))
+        else:
+            item.setBackground(QBrush())
 
 
 class ServerConnectionWindow(QMainWindow):
@@ -135,6 +321,15 @@ class ServerConnectionWindow(QMainWindow):
         self.username = QLineEdit()
         self.username.setPlaceholderText("Username")
 
+        self.record_path = QLineEdit()
+        self.record_path.setPlaceholderText("Record session to file (optional)")
+
+        self.echo_cancellation_checkbox = QCheckBox("Echo cancellation")
+        self.echo_cancellation_checkbox.setChecked(True)
+        self.noise_suppression_checkbox = QCheckBox("Noise suppression")
+        self.noise_suppression_checkbox.setChecked(True)
+        self.audio_process_checkbox = QCheckBox("Audio in a separate process")
+
         self.connect_button = QPushButton("Connect")
         self.connect_button.clicked.connect(self.connect_to_server)
         self.setCentralWidget(self.connect_button)
@@ -146,6 +341,10 @@ class ServerConnectionWindow(QMainWindow):
         layout.addWidget(self.ip)
         layout.addWidget(self.port)
         layout.addWidget(self.username)
+        layout.addWidget(self.record_path)
+        layout.addWidget(self.echo_cancellation_checkbox)
+        layout.addWidget(self.noise_suppression_checkbox)
+        layout.addWidget(self.audio_process_checkbox)
         layout.addWidget(self.connect_button)
         layout.addWidget(self.status)
 
@@ -158,7 +357,10 @@ class ServerConnectionWindow(QMainWindow):
         self.status.show()
         try:
             client = Client(server_ip=self.ip.text(), server_port=int(self.port.text()),
-                            sign_up_username=self.username.text())
+                            sign_up_username=self.username.text(), record_path=self.record_path.text() or None,
+                            echo_cancellation=self.echo_cancellation_checkbox.isChecked(),
+                            noise_suppression=self.noise_suppression_checkbox.isChecked(),
+                            audio_process=self.audio_process_checkbox.isChecked())
             self.status.hide()
         except:
             self.status.setText("Connection error!")
@@ -0,0 +1,111 @@
+import dataclasses
+import json
+
+from outbound import OutboundQueueStats
+
+PROMETHEUS_PREFIX = 'voice_chat_'
+
+
+@dataclasses.dataclass
+class LatencySummary:
+    count: int = 0
+    sum_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def observe(self, latency_ms: float):
+        self.count += 1
+        self.sum_ms += latency_ms
+        if latency_ms > self.max_ms:
+            self.max_ms = latency_ms
+
+
+@dataclasses.dataclass(frozen=True)
+class SpeakerMetrics:
+    user_id: int
+    received_packets: int
+    packets_per_s: float
+    jitter_ms: float
+    queue_depth: int
+    target_queue_depth: int
+    late_packets: int
+    overflows: int
+    underruns: int
+    concealed_chunks: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CaptureStageMetrics:
+    stage: str
+    processed_blocks: int
+    mean_us: float
+    max_us: float
+    # Mean CPU time of the stage divided by the duration of a block
+    budget_fraction: float
+
+
+@dataclasses.dataclass(frozen=True)
+class ClientMetrics:
+    capture_overflows: int
+    playback_underruns: int
+    send_latency: LatencySummary
+    outbound: OutboundQueueStats
+    speakers: tuple[SpeakerMetrics, ...]
+    protobuf_backend: str
+    capture_stages: tuple[CaptureStageMetrics, ...] = ()
+
+
+def to_json(metrics: ClientMetrics) -> str:
+    return json.dumps(dataclasses.asdict(metrics), indent=2)
+
+
+def to_prometheus(metrics: ClientMetrics) -> str:
+    lines = []
+
+    def add(name: str, metric_type: str, help_text: str, samples: list[tuple[str, float]]):
+        lines.append(f'# HELP {PROMETHEUS_PREFIX}{name} {help_text}')
+        lines.append(f'# TYPE {PROMETHEUS_PREFIX}{name} {metric_type}')
+        for suffix_and_labels, value in samples:
+            lines.append(f'{PROMETHEUS_PREFIX}{name}{suffix_and_labels} {value}')
+
+    add('protobuf_backend_info', 'gauge', 'Active protobuf implementation',
+        [(f'{{backend="{metrics.protobuf_backend}"}}', 1)])
+    add('capture_overflows_total', 'counter', 'Capture blocks lost because the encoder fell behind',
+        [('', metrics.capture_overflows)])
+    add('playback_underruns_total', 'counter', 'Playback callbacks that ran out of mixed audio',
+        [('', metrics.playback_underruns)])
+    add('send_latency_ms', 'summary', 'Time sent messages spent in the outbound queue',
+        [('_count', metrics.send_latency.count), ('_sum', round(metrics.send_latency.sum_ms, 3))])
+    add('send_latency_max_ms', 'gauge', 'Longest time a sent message spent in the outbound queue',
+        [('', round(metrics.send_latency.max_ms, 3))])
+    for field in dataclasses.fields(OutboundQueueStats):
+        is_counter = not field.name.startswith('queued_')
+        add(f'outbound_{field.name}' + ('_total' if is_counter else ''), 'counter' if is_counter else 'gauge',
+            f'Outbound queue {field.name.replace("_", " ")}', [('', getattr(metrics.outbound, field.name))])
+
+    speaker_fields = [
+        ('received_packets', 'counter', 'Sound packets received from the speaker'),
+        ('packets_per_s', 'gauge', 'Recent packet rate of the speaker'),
+        ('jitter_ms', 'gauge', 'Inter-arrival jitter estimate'),
+        ('queue_depth', 'gauge', 'Packets waiting in the jitter buffer'),
+        ('target_queue_depth', 'gauge', 'Packets the jitter buffer aims to hold'),
+        ('late_packets', 'counter', 'Packets that arrived after their playout time'),
+        ('overflows', 'counter', 'Packets dropped because the jitter buffer was full'),
+        ('underruns', 'counter', 'Mixed blocks with no audio while the speaker was talking'),
+        ('concealed_chunks', 'counter', 'Missing packets replaced by the previous one'),
+    ]
+    for name, metric_type, help_text in speaker_fields:
+        suffix = '_total' if metric_type == 'counter' else ''
+        add(f'speaker_{name}{suffix}', metric_type, help_text,
+            [(f'{{user_id="{s.user_id}"}}', round(getattr(s, name), 3)) for s in metrics.speakers])
+
+    stage_fields = [
+        ('processed_blocks', 'counter', 'Capture blocks processed by the stage'),
+        ('mean_us', 'gauge', 'Mean CPU time the stage spent on a block'),
+        ('max_us', 'gauge', 'Longest CPU time the stage spent on a block'),
+        ('budget_fraction', 'gauge', 'Mean CPU time of the stage divided by the block duration'),
+    ]
+    for name, metric_type, help_text in stage_fields:
+        suffix = '_total' if metric_type == 'counter' else ''
+        add(f'capture_stage_{name}{suffix}', metric_type, help_text,
+            [(f'{{stage="{s.stage}"}}', round(getattr(s, name), 6)) for s in metrics.capture_stages])
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,213 @@
+import dataclasses
+import math
+import time
+from typing import Callable, Optional
+
+import numpy
+
+from metrics import SpeakerMetrics
+
+AUDIO_FORMAT = 'int16'
+SPEAK_TIME_MS = 200
+IDLE_USER_TIMEOUT_MS = 5000
+JITTER_BUFFER_MIN_CHUNKS = 1
+JITTER_BUFFER_MAX_CHUNKS = 10
+JITTER_BUFFER_EXTRA_CHUNKS = 2
+JITTER_BUFFER_RESET_CHUNKS = 100
+JITTER_MULTIPLIER = 3
+MAX_CONCEALED_CHUNKS = 2
+MIXED_STREAM_ID = -1
+
+
+class JitterBuffer:
+    def __init__(self, rate: int, channels: int, chunk_ms: float, clock: Callable[[], int] = time.time_ns):
+        self.jitter_ms = 0.0
+        self._clock = clock
+        self.chunk_ms = chunk_ms
+        self._bytes_per_ms = numpy.dtype(AUDIO_FORMAT).itemsize * channels * rate / 1000
+        self._chunks: dict[int, bytes] = dict()
+        self._next_sequence_number: Optional[int] = None
+        self._last_sequence_number = 0
+        self._last_transit_ms: Optional[float] = None
+        self._last_chunk: Optional[bytes] = None
+        self._concealed_in_row = 0
+        self.late_packets = 0
+        self.overflows = 0
+        self.concealed_chunks = 0
+
+    def target_chunks(self) -> int:
+        chunks = math.ceil(JITTER_MULTIPLIER * self.jitter_ms / self.chunk_ms)
+        return min(max(chunks, JITTER_BUFFER_MIN_CHUNKS), JITTER_BUFFER_MAX_CHUNKS)
+
+    def __len__(self):
+        return len(self._chunks)
+
+    def put(self, sequence_number: int, capture_timestamp_us: int, data: bytes):
+        if sequence_number == 0:
+            sequence_number = self._last_sequence_number + 1
+        elif capture_timestamp_us != 0:
+            transit_ms = self._clock() / 1_000_000 - capture_timestamp_us / 1000
+            if self._last_transit_ms is not None:
+                self.jitter_ms += (abs(transit_ms - self._last_transit_ms) - self.jitter_ms) / 16
+            self._last_transit_ms = transit_ms
+        self._last_sequence_number = sequence_number
+        self.chunk_ms = len(data) / self._bytes_per_ms
+
+        if self._next_sequence_number is not None and sequence_number < self._next_sequence_number:
+            if self._next_sequence_number - sequence_number < JITTER_BUFFER_RESET_CHUNKS:
+                self.late_packets += 1
+                return
+            self._chunks.clear()
+            self._next_sequence_number = None
+        self._chunks[sequence_number] = data
+
+        max_chunks = self.target_chunks() + JITTER_BUFFER_EXTRA_CHUNKS
+        if len(self._chunks) > max_chunks:
+            sequence_numbers = sorted(self._chunks)
+            self.overflows += len(sequence_numbers) - max_chunks
+            for dropped in sequence_numbers[:len(sequence_numbers) - max_chunks]:
+                del self._chunks[dropped]
+            if self._next_sequence_number is not None:
+                self._next_sequence_number = max(self._next_sequence_number, min(self._chunks))
+
+    def get(self) -> Optional[bytes]:
+        if self._next_sequence_number is None:
+            if len(self._chunks) < self.target_chunks():
+                return None
+            self._next_sequence_number = min(self._chunks)
+
+        data = self._chunks.pop(self._next_sequence_number, None)
+        if data is None:
+            if not self._chunks:
+                self._next_sequence_number = None
+                self._last_chunk = None
+                return None
+            self._next_sequence_number += 1
+            self._concealed_in_row += 1
+            if self._last_chunk is None or self._concealed_in_row > MAX_CONCEALED_CHUNKS:
+                return None
+            self.concealed_chunks += 1
+            return self._last_chunk
+        self._next_sequence_number += 1
+        self._concealed_in_row = 0
+        self._last_chunk = data
+        return data
+
+
+class Mixer:
+    # Not thread safe, the owner serializes access. Replays pass a clock that follows the recording.
+    @dataclasses.dataclass
+    class _UserData:
+        jitter_buffer: JitterBuffer
+        last_receive_time_in_ms: float
+        is_speaking: bool
+        pending: Optional[numpy.ndarray] = None
+        pending_offset: int = 0
+        received_packets: int = 0
+        interarrival_ms: float = 0.0
+        underruns: int = 0
+
+    def __init__(self, block_size: int, rate: int, channels: int, clock: Callable[[], int] = time.time_ns):
+        self._clock = clock
+        self._rate = rate
+        self._channels = channels
+        self._chunk_ms = block_size * 1000 / rate
+        self._user_id_to_data: dict[int, Mixer._UserData] = dict()
+        self._mix_buffer = numpy.zeros((block_size, channels), dtype=numpy.int32)
+        self._mix_output = numpy.zeros((block_size, channels), dtype=AUDIO_FORMAT)
+
+    def has_users(self) -> bool:
+        return bool(self._user_id_to_data)
+
+    def write_user_data(self, user_id: int, data: bytes, sequence_number: int = 0, capture_timestamp_us: int = 0):
+        user_data = self._user_id_to_data.get(user_id)
+        if user_data is None:
+            user_data = Mixer._UserData(JitterBuffer(self._rate, self._channels, self._chunk_ms, self._clock), 0, False)
+            self._user_id_to_data[user_id] = user_data
+        cur_time = self._clock() / 1_000_000
+        if user_data.received_packets:
+            user_data.interarrival_ms += (cur_time - user_data.last_receive_time_in_ms - user_data.interarrival_ms) / 16
+        user_data.received_packets += 1
+        user_data.last_receive_time_in_ms = cur_time
+        user_data.is_speaking = len(data) > 0
+        if data:
+            user_data.jitter_buffer.put(sequence_number, capture_timestamp_us, data)
+
+    def get_speaking_users_ids(self) -> list[int]:
+        users_ids = []
+        cur_time = self._clock() / 1_000_000
+        for user_id, user_data in self._user_id_to_data.items():
+            if user_data.is_speaking and (cur_time - user_data.last_receive_time_in_ms) <= SPEAK_TIME_MS:
+                users_ids.append(user_id)
+        return users_ids
+
+    def get_speakers_metrics(self) -> list[SpeakerMetrics]:
+        return [SpeakerMetrics(user_id=user_id,
+                               received_packets=user_data.received_packets,
+                               packets_per_s=1000 / user_data.interarrival_ms if user_data.interarrival_ms else 0.0,
+                               jitter_ms=user_data.jitter_buffer.jitter_ms,
+                               queue_depth=len(user_data.jitter_buffer),
+                               target_queue_depth=user_data.jitter_buffer.target_chunks(),
+                               late_packets=user_data.jitter_buffer.late_packets,
+                               overflows=user_data.jitter_buffer.overflows,
+                               underruns=user_data.underruns,
+                               concealed_chunks=user_data.jitter_buffer.concealed_chunks)
+                for user_id, user_data in self._user_id_to_data.items()]
+
+    def mix_next_chunk(self) -> numpy.ndarray:
+        self._mix(self._mix_buffer, ())
+        numpy.clip(self._mix_buffer, -32768, 32767, out=self._mix_output, casting='unsafe')
+        return self._mix_output
+
+    def mix_next_chunk_without(self, users_ids) \
+            -> Optional[tuple[numpy.ndarray, dict[int, numpy.ndarray], list[int]]]:
+        # Mixes once for everybody and subtracts the own voice of each given user that contributed to the block, so
+        # the cost grows with the number of listeners instead of listeners times speakers. Returns None when nobody
+        # contributed, otherwise the full mix, the mixes without each contributing given user and all contributors.
+        contributions = self._mix(self._mix_buffer, users_ids)
+        if not contributions:
+            return None
+        total = numpy.clip(self._mix_buffer, -32768, 32767).astype(AUDIO_FORMAT)
+        without = {user_id: numpy.clip(self._mix_buffer - contribution, -32768, 32767).astype(AUDIO_FORMAT)
+                   for user_id, contribution in contributions.items() if contribution is not None}
+        return total, without, list(contributions)
+
+    def _mix(self, mix: numpy.ndarray, separate_users_ids) -> dict[int, Optional[numpy.ndarray]]:
+        mix.fill(0)
+        contributions = dict()
+        cur_time = self._clock() / 1_000_000
+        for user_id, user_data in list(self._user_id_to_data.items()):
+            if user_id in separate_users_ids:
+                contribution = numpy.zeros_like(mix)
+                if self._mix_user_data(user_data, contribution):
+                    mix += contribution
+                    contributions[user_id] = contribution
+                    continue
+            elif self._mix_user_data(user_data, mix):
+                contributions[user_id] = None
+                continue
+            if (cur_time - user_data.last_receive_time_in_ms) > IDLE_USER_TIMEOUT_MS:
+                del self._user_id_to_data[user_id]
+            elif user_data.is_speaking:
+                user_data.underruns += 1
+        return contributions
+
+    def _mix_user_data(self, user_data: _UserData, mix: numpy.ndarray) -> bool:
+        # Packets from other clients do not have to match the local block size, so a partly played packet is kept
+        mixed = 0
+        while mixed < len(mix):
+            if user_data.pending is None:
+                data = user_data.jitter_buffer.get()
+                if data is None:
+                    break
+                user_data.pending = numpy.frombuffer(data, dtype=AUDIO_FORMAT).reshape(-1, self._channels)
+                user_data.pending_offset = 0
+            pending, offset = user_data.pending, user_data.pending_offset
+            n = min(len(mix) - mixed, len(pending) - offset)
+            mix[mixed:mixed + n] += pending[offset:offset + n]
+            mixed += n
+            if offset + n == len(pending):
+                user_data.pending = None
+            else:
+                user_data.pending_offset = offset + n
+        return mixed > 0
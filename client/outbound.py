@@ -0,0 +1,93 @@
+import collections
+import dataclasses
+import threading
+import time
+from typing import Optional
+
+import protocol
+
+DEFAULT_MAX_AUDIO_FRAMES = 16
+DEFAULT_MAX_BATCH_SIZE = 64
+
+
+@dataclasses.dataclass(frozen=True)
+class OutboundQueueStats:
+    queued_control_messages: int
+    queued_audio_frames: int
+    sent_control_messages: int
+    sent_audio_frames: int
+    dropped_audio_frames: int
+
+
+class OutboundQueue:
+    # Control messages are never dropped and always go out before audio; audio frames are bounded and the oldest
+    # one is dropped when a new frame does not fit.
+    def __init__(self, max_audio_frames: int = DEFAULT_MAX_AUDIO_FRAMES):
+        self._m = threading.Condition()
+        self._control: collections.deque[tuple[int, protocol.TransportMessage]] = collections.deque()
+        self._audio: collections.deque[tuple[int, protocol.TransportMessage]] = collections.deque(
+            maxlen=max_audio_frames)
+        self._sent_control_messages = 0
+        self._sent_audio_frames = 0
+        self._dropped_audio_frames = 0
+        self._close = False
+
+    def put_control(self, pb_message, first: bool = False):
+        transport_message = protocol.TransportMessage.from_protobuf(pb_message)
+        with self._m:
+            if self._close:
+                return
+            if first:
+                self._control.appendleft((time.monotonic_ns(), transport_message))
+            else:
+                self._control.append((time.monotonic_ns(), transport_message))
+            self._m.notify()
+
+    def put_audio(self, packet):
+        self.put_audio_message(protocol.encode_sound_packet(packet))
+
+    def put_audio_message(self, transport_message: protocol.TransportMessage):
+        with self._m:
+            if self._close:
+                return
+            if len(self._audio) == self._audio.maxlen:
+                self._dropped_audio_frames += 1
+            self._audio.append((time.monotonic_ns(), transport_message))
+            self._m.notify()
+
+    def get_batch(self, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE) \
+            -> Optional[tuple[list[protocol.TransportMessage], int]]:
+        # Also returns when the oldest message of the batch was queued, in time.monotonic_ns()
+        with self._m:
+            while not self._control and not self._audio:
+                if self._close:
+                    return None
+                self._m.wait()
+            oldest_time_ns = min(messages[0][0] for messages in (self._control, self._audio) if messages)
+            batch = []
+            while self._control and len(batch) < max_batch_size:
+                batch.append(self._control.popleft()[1])
+            control_messages = len(batch)
+            while self._audio and len(batch) < max_batch_size:
+                batch.append(self._audio.popleft()[1])
+            self._sent_control_messages += control_messages
+            self._sent_audio_frames += len(batch) - control_messages
+            return batch, oldest_time_ns
+
+    def clear_audio(self):
+        with self._m:
+            self._dropped_audio_frames += len(self._audio)
+            self._audio.clear()
+
+    def get_stats(self) -> OutboundQueueStats:
+        with self._m:
+            return OutboundQueueStats(queued_control_messages=len(self._control),
+                                      queued_audio_frames=len(self._audio),
+                                      sent_control_messages=self._sent_control_messages,
+                                      sent_audio_frames=self._sent_audio_frames,
+                                      dropped_audio_frames=self._dropped_audio_frames)
+
+    def close(self):
+        with self._m:
+            self._close = True
+            self._m.notify_all()
@@ -1,7 +1,12 @@
+import asyncio
 import dataclasses
+import socket
 import struct
-from typing import BinaryIO
+from typing import BinaryIO, Iterable, Iterator, Union
 
+from google.protobuf.internal import api_implementation
+
+import soundpacket
 from gen import messages_pb2
 
 MESSAGE_TYPE_TO_PB_CLASS = {
@@ -14,15 +19,34 @@ MESSAGE_TYPE_TO_PB_CLASS = {
     messages_pb2.CREATE_ROOM_REQUEST: messages_pb2.CreateRoomRequest,
     messages_pb2.CREATE_ROOM_RESPONSE: messages_pb2.CreateRoomResponse,
     messages_pb2.STATUS: messages_pb2.Status,
+    messages_pb2.STATUS_UPDATE: messages_pb2.StatusUpdate,
+    messages_pb2.MEDIA_HELLO: messages_pb2.MediaHello,
+    messages_pb2.ROOM_LIST_REQUEST: messages_pb2.RoomListRequest,
+    messages_pb2.ROOM_LIST_RESPONSE: messages_pb2.RoomListResponse,
+    messages_pb2.STATUS_REQUEST: messages_pb2.StatusRequest,
 }
 
 BP_CLASS_TO_MESSAGE_TYPE = {v: k for k, v in MESSAGE_TYPE_TO_PB_CLASS.items()}
 
+HEADER = struct.Struct('>LL')
+RECEIVE_BUFFER_SIZE = 64 * 1024
+MAX_BUFFERS_PER_SENDMSG = 512
+MEDIA_SESSION_KEY_SIZE = 16
+DATAGRAM_HEADER = struct.Struct(f'>L{MEDIA_SESSION_KEY_SIZE}s')
+MAX_DATAGRAM_SIZE = 65507
+# Sound format of peers that do not send SoundPacket.rate and SoundPacket.channels
+LEGACY_RATE = 20000
+LEGACY_CHANNELS = 1
+PROTOBUF_BACKEND = api_implementation.Type()
+# Generated classes run in C with the 'upb' and 'cpp' backends; with the pure Python one the hand-rolled SoundPacket
+# codec is about twice as fast
+HAND_ROLLED_SOUND_PACKETS = PROTOBUF_BACKEND == 'python'
+
 
 @dataclasses.dataclass
 class TransportMessage:
     message_type: int
-    message_data: bytes
+    message_data: Union[bytes, memoryview]
 
     def to_protobuf(self):
         if self.message_type not in MESSAGE_TYPE_TO_PB_CLASS:
@@ -36,17 +60,157 @@ class TransportMessage:
         return TransportMessage(BP_CLASS_TO_MESSAGE_TYPE[type(pb_obj)], pb_obj.SerializeToString())
 
 
+class SoundPacketParser:
+    # The returned packet is reused by the next call, so it is only valid until then
+    def __init__(self):
+        self._packet = new_sound_packet()
+
+    def parse(self, message_data: Union[bytes, memoryview]):
+        if HAND_ROLLED_SOUND_PACKETS:
+            return soundpacket.decode(message_data, self._packet)
+        self._packet.Clear()
+        self._packet.ParseFromString(message_data)
+        return self._packet
+
+
+def sound_packet_format(packet) -> tuple[int, int]:
+    return packet.rate or LEGACY_RATE, packet.channels or LEGACY_CHANNELS
+
+
+def new_sound_packet(**fields):
+    if HAND_ROLLED_SOUND_PACKETS:
+        return soundpacket.SoundPacket(**fields)
+    return messages_pb2.SoundPacket(**fields)
+
+
+def encode_sound_packet(packet) -> TransportMessage:
+    if type(packet) is soundpacket.SoundPacket:
+        return TransportMessage(messages_pb2.SOUND_PACKET, soundpacket.encode(packet))
+    return TransportMessage(messages_pb2.SOUND_PACKET, packet.SerializeToString())
+
+
+class TransportMessageReader:
+    # Yielded messages reference the receive buffer, so they are only valid until the next one is requested.
+    def __init__(self, sock: socket.socket, buffer_size: int = RECEIVE_BUFFER_SIZE):
+        self._sock = sock
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def __iter__(self) -> Iterator[TransportMessage]:
+        while True:
+            yield from self._parse_frames()
+            self._receive()
+
+    def read_transport_message(self) -> TransportMessage:
+        return next(iter(self))
+
+    def _parse_frames(self) -> Iterator[TransportMessage]:
+        while self._end - self._start >= HEADER.size:
+            message_type, message_length = HEADER.unpack_from(self._buffer, self._start)
+            data_start = self._start + HEADER.size
+            data_end = data_start + message_length
+            if data_end > self._end:
+                return
+            self._start = data_end
+            yield TransportMessage(message_type, self._view[data_start:data_end])
+
+    def _receive(self):
+        pending = self._end - self._start
+        needed = HEADER.size
+        if pending >= HEADER.size:
+            needed += HEADER.unpack_from(self._buffer, self._start)[1]
+        if needed > len(self._buffer):
+            buffer = bytearray(max(needed, 2 * len(self._buffer)))
+            buffer[:pending] = self._view[self._start:self._end]
+            self._buffer, self._view = buffer, memoryview(buffer)
+            self._start, self._end = 0, pending
+        elif self._start + needed > len(self._buffer):
+            self._buffer[:pending] = self._buffer[self._start:self._end]
+            self._start, self._end = 0, pending
+
+        n = self._sock.recv_into(self._view[self._end:])
+        if n == 0:
+            raise ConnectionError('Connection closed by peer')
+        self._end += n
+
+
+def encode_transport_message(transport_message: TransportMessage) -> bytes:
+    return HEADER.pack(transport_message.message_type, len(transport_message.message_data))
+
+
+def send_transport_messages(transport_messages: Iterable[TransportMessage], sock: socket.socket):
+    buffers = []
+    for transport_message in transport_messages:
+        buffers.append(encode_transport_message(transport_message))
+        buffers.append(transport_message.message_data)
+    _send_buffers(buffers, sock)
+
+
+def send_protobuf_messages(pb_messages: Iterable, sock: socket.socket):
+    send_transport_messages((TransportMessage.from_protobuf(m) for m in pb_messages), sock)
+
+
+def send_protobuf_message(pb_message, sock: socket.socket):
+    send_protobuf_messages((pb_message,), sock)
+
+
+def _send_buffers(buffers: list, sock: socket.socket):
+    if not hasattr(sock, 'sendmsg'):
+        sock.sendall(b''.join(buffers))
+        return
+    i = 0
+    while i < len(buffers):
+        sent = sock.sendmsg(buffers[i:i + MAX_BUFFERS_PER_SENDMSG])
+        while i < len(buffers) and sent >= len(buffers[i]):
+            sent -= len(buffers[i])
+            i += 1
+        if sent:
+            buffers[i] = memoryview(buffers[i])[sent:]
+
+
+def send_datagram(transport_message: TransportMessage, session_key: bytes, sock: socket.socket):
+    header = DATAGRAM_HEADER.pack(transport_message.message_type, session_key)
+    if hasattr(sock, 'sendmsg'):
+        sock.sendmsg((header, transport_message.message_data))
+    else:
+        sock.send(header + bytes(transport_message.message_data))
+
+
+def decode_datagram(datagram: Union[bytes, memoryview]) -> tuple[bytes, TransportMessage]:
+    if len(datagram) < DATAGRAM_HEADER.size:
+        raise ValueError(f'Datagram length = {len(datagram)} is too short')
+    message_type, session_key = DATAGRAM_HEADER.unpack_from(datagram)
+    return session_key, TransportMessage(message_type, datagram[DATAGRAM_HEADER.size:])
+
+
+def _read_exactly(f: BinaryIO, n: int) -> bytes:
+    data = f.read(n)
+    if data is None or len(data) < n:
+        parts = [data or b'']
+        received = len(parts[0])
+        while received < n:
+            part = f.read(n - received)
+            if not part:
+                raise ConnectionError('Connection closed by peer')
+            parts.append(part)
+            received += len(part)
+        data = b''.join(parts)
+    return data
+
+
 def read_transport_message(f: BinaryIO):
-    type_and_length: bytes = f.read(8)
-    message_type, message_length = struct.unpack(">LL", type_and_length)
-    message_data = f.read(message_length)
+    message_type, message_length = HEADER.unpack(_read_exactly(f, HEADER.size))
+    message_data = _read_exactly(f, message_length)
     return TransportMessage(message_type, message_data)
 
 
 def write_transport_message(transport_message: TransportMessage, f: BinaryIO):
-    type_and_length = struct.pack(">LL", transport_message.message_type, len(transport_message.message_data))
-    f.write(type_and_length)
-    f.write(transport_message.message_data)
+    data = memoryview(encode_transport_message(transport_message) + transport_message.message_data)
+    while data:
+        n = f.write(data)
+        data = data[len(data) if n is None else n:]
 
 
 def write_protobuf_message(pb_message, f: BinaryIO):
@@ -55,3 +219,16 @@ def write_protobuf_message(pb_message, f: BinaryIO):
 
 def read_protobuf_message(f: BinaryIO):
     return read_transport_message(f).to_protobuf()
+
+
+async def read_transport_message_async(reader: asyncio.StreamReader) -> TransportMessage:
+    message_type, message_length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    return TransportMessage(message_type, await reader.readexactly(message_length))
+
+
+def write_transport_messages_async(transport_messages: Iterable[TransportMessage], writer: asyncio.StreamWriter):
+    buffers = []
+    for transport_message in transport_messages:
+        buffers.append(encode_transport_message(transport_message))
+        buffers.append(transport_message.message_data)
+    writer.writelines(buffers)
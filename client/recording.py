@@ -0,0 +1,102 @@
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Iterator
+
+import numpy
+
+import protocol
+
+MAGIC = b'VCREC\x00\x01\x00'
+RECORD_HEADER = struct.Struct('<QLL')
+INDEX_SUFFIX = '.idx'
+INDEX_DTYPE = numpy.dtype([('timestamp_ns', '<u8'), ('offset', '<u8')])
+
+
+class Recorder:
+    # Appends every message with the time.monotonic_ns() it was received at, relative to the start of the recording.
+    # The index file holds an INDEX_DTYPE entry per message, so a reader can memory map both files.
+    def __init__(self, path: str):
+        self._m = threading.Lock()
+        self._file = open(path, 'wb')
+        self._index_file = open(path + INDEX_SUFFIX, 'wb')
+        self._file.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._start_ns = time.monotonic_ns()
+        self.recorded_messages = 0
+
+    def record(self, transport_message: protocol.TransportMessage):
+        timestamp_ns = time.monotonic_ns() - self._start_ns
+        data = transport_message.message_data
+        with self._m:
+            if self._file.closed:
+                return
+            self._file.write(RECORD_HEADER.pack(timestamp_ns, transport_message.message_type, len(data)))
+            self._file.write(data)
+            self._index_file.write(numpy.array((timestamp_ns, self._offset), dtype=INDEX_DTYPE).tobytes())
+            self._offset += RECORD_HEADER.size + len(data)
+            self.recorded_messages += 1
+
+    def close(self):
+        with self._m:
+            self._file.close()
+            self._index_file.close()
+
+
+class Recording:
+    # Messages reference the mapped file, so they are only valid until the recording is closed
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path} is not a recording')
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.index = self._load_index(path + INDEX_SUFFIX)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i: int) -> tuple[int, protocol.TransportMessage]:
+        timestamp_ns, offset = self.index[i]
+        _, message_type, length = RECORD_HEADER.unpack_from(self._mmap, offset)
+        data_start = int(offset) + RECORD_HEADER.size
+        return int(timestamp_ns), protocol.TransportMessage(message_type, self._view[data_start:data_start + length])
+
+    def __iter__(self) -> Iterator[tuple[int, protocol.TransportMessage]]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def duration_ns(self) -> int:
+        return int(self.index['timestamp_ns'][-1]) if len(self) else 0
+
+    def close(self):
+        self.index = numpy.zeros(0, dtype=INDEX_DTYPE)
+        self._view.release()
+        self._mmap.close()
+
+    def _load_index(self, index_path: str) -> numpy.ndarray:
+        # A recorder that did not close cleanly may leave a partial last entry or record, which are skipped
+        if os.path.exists(index_path) and os.path.getsize(index_path) >= INDEX_DTYPE.itemsize:
+            index = numpy.memmap(index_path, dtype=INDEX_DTYPE, mode='r',
+                                 shape=(os.path.getsize(index_path) // INDEX_DTYPE.itemsize,))
+        else:
+            index = self._scan()
+        while len(index) and self._record_end(int(index['offset'][-1])) > len(self._mmap):
+            index = index[:-1]
+        return index
+
+    def _scan(self) -> numpy.ndarray:
+        entries = []
+        offset = len(MAGIC)
+        while offset + RECORD_HEADER.size <= len(self._mmap):
+            timestamp_ns, _, length = RECORD_HEADER.unpack_from(self._mmap, offset)
+            entries.append((timestamp_ns, offset))
+            offset += RECORD_HEADER.size + length
+        return numpy.array(entries, dtype=INDEX_DTYPE)
+
+    def _record_end(self, offset: int) -> int:
+        if offset + RECORD_HEADER.size > len(self._mmap):
+            return offset + RECORD_HEADER.size
+        return offset + RECORD_HEADER.size + RECORD_HEADER.unpack_from(self._mmap, offset)[2]
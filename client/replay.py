@@ -0,0 +1,178 @@
+import argparse
+import logging
+import os
+import time
+import wave
+from typing import Callable, Iterator, Optional
+
+import numpy
+
+import codec
+import protocol
+from async_client import DEFAULT_CHANNELS, DEFAULT_CHUNK_SIZE, DEFAULT_RATE
+from gen import messages_pb2
+from metrics import SpeakerMetrics
+from mixer import AUDIO_FORMAT, JITTER_BUFFER_EXTRA_CHUNKS, JITTER_BUFFER_MAX_CHUNKS, MIXED_STREAM_ID, Mixer
+from recording import Recording
+from resampler import Resampler, convert_channels
+
+logger = logging.getLogger(__name__)
+
+
+class _Decoders:
+    # Converts every stream to the replay rate and channels, like the client does for its playback device
+    def __init__(self, rate: int, channels: int, block_size: int):
+        self._rate = rate
+        self._channels = channels
+        self._block_size = block_size
+        self._decoders: dict[int, tuple[tuple[int, int, int], codec.Codec, Resampler]] = dict()
+
+    def decode(self, stream_id: int, packet) -> Optional[bytes]:
+        if not packet.data:
+            return b''
+        rate, channels = protocol.sound_packet_format(packet)
+        key = (packet.codec, rate, channels)
+        decoder_key, decoder, resampler = self._decoders.get(stream_id, (None, None, None))
+        try:
+            if decoder_key != key:
+                decoder = codec.create_codec(packet.codec, rate, channels, self._block_size)
+                resampler = Resampler(rate, self._rate, self._channels)
+                self._decoders[stream_id] = (key, decoder, resampler)
+            frames = numpy.frombuffer(decoder.decode(packet.data), dtype=AUDIO_FORMAT).reshape(-1, channels)
+        except ValueError as e:
+            logger.debug(f'Dropped sound packet from user {packet.user_id}: {e}')
+            return None
+        return resampler.process(convert_channels(frames, self._channels)).tobytes()
+
+
+def sound_packets(recording: Recording) -> Iterator[tuple[int, object]]:
+    # The packet is reused for the next one
+    parser = protocol.SoundPacketParser()
+    for timestamp_ns, transport_message in recording:
+        if transport_message.message_type == messages_pb2.SOUND_PACKET:
+            yield timestamp_ns, parser.parse(transport_message.message_data)
+
+
+def stream_id_of(packet) -> int:
+    return MIXED_STREAM_ID if packet.mixed else packet.user_id
+
+
+def replay(recording: Recording, rate: int, channels: int, block_size: int, speed: float = 0.0,
+           on_block: Optional[Callable[[numpy.ndarray], None]] = None) -> tuple[numpy.ndarray, list[SpeakerMetrics]]:
+    # Feeds the packets to a Mixer at the recorded arrival times and returns what the player would have played. The
+    # mixer runs on the recording clock, so the result does not depend on the speed or on the machine.
+    clock_ns = 0
+    mixer = Mixer(block_size, rate, channels, clock=lambda: clock_ns)
+    decoders = _Decoders(rate, channels, block_size)
+    block_ns = block_size * 1_000_000_000 / rate
+    blocks = []
+    first_block_ns: Optional[float] = None
+    next_block_ns = 0.0
+    start = time.monotonic()
+
+    def mix_block():
+        nonlocal clock_ns, next_block_ns
+        clock_ns = int(next_block_ns)
+        if speed > 0:
+            time.sleep(max(0.0, start + (next_block_ns - first_block_ns) / 1e9 / speed - time.monotonic()))
+        block = mixer.mix_next_chunk().copy()
+        blocks.append(block)
+        if on_block is not None:
+            on_block(block)
+        next_block_ns += block_ns
+
+    for timestamp_ns, packet in sound_packets(recording):
+        if first_block_ns is None:
+            first_block_ns = next_block_ns = timestamp_ns
+        while next_block_ns <= timestamp_ns:
+            mix_block()
+        clock_ns = timestamp_ns
+        data = decoders.decode(stream_id_of(packet), packet)
+        if data is not None:
+            mixer.write_user_data(stream_id_of(packet), data, packet.sequence_number, packet.capture_timestamp_us)
+    for _ in range(JITTER_BUFFER_MAX_CHUNKS + JITTER_BUFFER_EXTRA_CHUNKS):
+        if not any(m.queue_depth for m in mixer.get_speakers_metrics()):
+            break
+        mix_block()
+    mixed = numpy.concatenate(blocks) if blocks else numpy.zeros((0, channels), dtype=AUDIO_FORMAT)
+    return mixed, mixer.get_speakers_metrics()
+
+
+def export_speakers(recording: Recording, rate: int, channels: int, block_size: int) -> dict[int, numpy.ndarray]:
+    # Packets are placed by their capture time, or by arrival time when the sender did not set it, so gaps in the
+    # output are packets that never arrived
+    decoders = _Decoders(rate, channels, block_size)
+    chunks: dict[int, list[tuple[int, numpy.ndarray]]] = dict()
+    first_time_us: dict[int, int] = dict()
+    for timestamp_ns, packet in sound_packets(recording):
+        stream_id = stream_id_of(packet)
+        data = decoders.decode(stream_id, packet)
+        if not data:
+            continue
+        time_us = packet.capture_timestamp_us or timestamp_ns // 1000
+        first_time_us.setdefault(stream_id, time_us)
+        position = (time_us - first_time_us[stream_id]) * rate // 1_000_000
+        if position >= 0:
+            chunks.setdefault(stream_id, []).append(
+                (position, numpy.frombuffer(data, dtype=AUDIO_FORMAT).reshape(-1, channels)))
+
+    speakers = dict()
+    for stream_id, stream_chunks in chunks.items():
+        samples = numpy.zeros((max(p + len(c) for p, c in stream_chunks), channels), dtype=AUDIO_FORMAT)
+        for position, chunk in stream_chunks:
+            samples[position:position + len(chunk)] = chunk
+        speakers[stream_id] = samples
+    return speakers
+
+
+def write_wav(path: str, samples: numpy.ndarray, rate: int):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(samples.shape[1])
+        f.setsampwidth(numpy.dtype(AUDIO_FORMAT).itemsize)
+        f.setframerate(rate)
+        f.writeframes(samples.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a recorded session through the mixer and export audio')
+    parser.add_argument('recording', help='file written by Client(record_path=...)')
+    parser.add_argument('--output', help='write the mixed playback to this WAV file')
+    parser.add_argument('--speakers-dir', help='write a WAV file per speaker into this directory')
+    parser.add_argument('--speed', type=float, default=0.0, help='1 replays in real time, 0 as fast as possible')
+    parser.add_argument('--play', action='store_true', help='play the mix on the default output device')
+    parser.add_argument('--rate', type=int, default=DEFAULT_RATE)
+    parser.add_argument('--channels', type=int, default=DEFAULT_CHANNELS)
+    parser.add_argument('--block-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    recording = Recording(args.recording)
+    logger.info(f'{len(recording)} messages, {recording.duration_ns() / 1e9:.1f} s')
+
+    if args.play:
+        import sounddevice
+
+        # The output stream blocks on write, so it paces the replay
+        with sounddevice.OutputStream(samplerate=args.rate, blocksize=args.block_size, dtype=AUDIO_FORMAT,
+                                      channels=args.channels) as stream:
+            mixed, speakers_metrics = replay(recording, args.rate, args.channels, args.block_size, 0.0, stream.write)
+    else:
+        start = time.perf_counter()
+        mixed, speakers_metrics = replay(recording, args.rate, args.channels, args.block_size, args.speed)
+        elapsed = time.perf_counter() - start
+        logger.info(f'Mixed {len(mixed) / args.rate:.1f} s of audio in {elapsed:.2f} s')
+    for m in speakers_metrics:
+        logger.info(m)
+    if args.output is not None:
+        write_wav(args.output, mixed, args.rate)
+
+    if args.speakers_dir is not None:
+        os.makedirs(args.speakers_dir, exist_ok=True)
+        for stream_id, samples in export_speakers(recording, args.rate, args.channels, args.block_size).items():
+            name = 'mixed' if stream_id == MIXED_STREAM_ID else f'user-{stream_id}'
+            write_wav(os.path.join(args.speakers_dir, f'{name}.wav'), samples, args.rate)
+    recording.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import math
+from typing import Optional
+
+import numpy
+
+from mixer import AUDIO_FORMAT
+
+TAPS_PER_ZERO_CROSSING = 16
+KAISER_BETA = 8.0
+
+
+class Resampler:
+    # Polyphase FIR resampler for a stream cut into blocks of any length. The input history and the position of the
+    # next output sample are kept between calls, so block boundaries do not click. Keep one instance per stream.
+    def __init__(self, from_rate: int, to_rate: int, channels: int = 1):
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.channels = channels
+        g = math.gcd(from_rate, to_rate)
+        self._up = to_rate // g
+        self._down = from_rate // g
+        taps_per_phase = TAPS_PER_ZERO_CROSSING * max(1, math.ceil(self._down / self._up))
+        n = taps_per_phase * self._up
+        cutoff = 1 / max(self._up, self._down)
+        t = numpy.arange(n) - (n - 1) / 2
+        h = self._up * cutoff * numpy.sinc(cutoff * t) * numpy.kaiser(n, KAISER_BETA)
+        # Phase p holds ..., h[p + 2 up], h[p + up], h[p] applied to ..., x[base - 2], x[base - 1], x[base], so it
+        # lines up with a window of the input that ends at base
+        self._phases = h.reshape(taps_per_phase, self._up).T[:, ::-1].astype(numpy.float32)
+        self._taps = taps_per_phase
+        self._history = numpy.zeros((taps_per_phase - 1, channels), dtype=numpy.float32)
+        # Position of the next output sample in the upsampled stream, relative to the first sample of the next input
+        self._offset = 0
+        # Scratch arrays for the longest block so far, so blocks of a steady length allocate nothing
+        self._block_frames = -1
+        self._reserve(0)
+
+    def output_frames(self, input_frames: int) -> int:
+        end = input_frames * self._up
+        return max(0, -(-(end - self._offset) // self._down))
+
+    def max_output_frames(self, input_frames: int) -> int:
+        # The next output sample is never before the first input sample, so no block gives more than this
+        return -(-input_frames * self._up // self._down)
+
+    def process(self, frames: numpy.ndarray, out: Optional[numpy.ndarray] = None) -> numpy.ndarray:
+        # frames may have another channel count, it is converted like convert_channels does. With out, which needs
+        # max_output_frames(len(frames)) rows, the result is a view of it and nothing is allocated.
+        if frames.ndim == 1:
+            frames = frames.reshape(-1, self.channels)
+        if out is None:
+            if self._up == self._down:
+                return convert_channels(frames, self.channels)
+            out = numpy.empty((self.max_output_frames(len(frames)), self.channels), dtype=AUDIO_FORMAT)
+        n = len(frames)
+        h = self._taps - 1
+        self._reserve(n)
+        buffer = self._buffer[:h + n]
+        _stage(frames, buffer[h:])
+        if self._up == self._down:
+            out[:n] = buffer[h:]
+            return out[:n]
+        buffer[:h] = self._history
+
+        count = self.output_frames(n)
+        positions = numpy.add(self._steps[:count], self._offset, out=self._positions[:count])
+        phases = numpy.remainder(positions, self._up, out=self._phase_indices[:count])
+        # Output n uses buffer[positions[n] // up:][:taps]. The indices are computed for every tap rather than
+        # broadcast, numpy allocates buffers for broadcast operands.
+        indices = numpy.add(self._step_grid[:count], self._offset, out=self._indices[:count])
+        numpy.floor_divide(indices, self._up, out=indices)
+        indices += self._tap_grid[:count]
+        weights = numpy.take(self._phases, phases, axis=0, out=self._weights[:count], mode='clip')
+        gathered = numpy.take(buffer, indices, axis=0, out=self._gathered[:count], mode='clip')
+        mixed = numpy.einsum('nk,nkc->nc', weights, gathered, out=self._mixed[:count])
+        numpy.clip(mixed, -32768, 32767, out=mixed)
+        result = out[:count]
+        result[:] = mixed
+        self._history[:] = buffer[n:]
+        self._offset += count * self._down - n * self._up
+        return result
+
+    def _reserve(self, input_frames: int):
+        if input_frames <= self._block_frames:
+            return
+        self._block_frames = input_frames
+        count = self.max_output_frames(input_frames)
+        self._buffer = numpy.zeros((self._taps - 1 + input_frames, self.channels), dtype=numpy.float32)
+        self._steps = numpy.arange(count) * self._down
+        self._positions = numpy.empty(count, dtype=self._steps.dtype)
+        self._phase_indices = numpy.empty_like(self._positions)
+        self._step_grid = numpy.repeat(self._steps[:, None], self._taps, axis=1)
+        self._tap_grid = numpy.tile(numpy.arange(self._taps), (count, 1))
+        self._indices = numpy.empty_like(self._step_grid)
+        self._weights = numpy.empty((count, self._taps), dtype=numpy.float32)
+        self._gathered = numpy.empty((count, self._taps, self.channels), dtype=numpy.float32)
+        self._mixed = numpy.empty((count, self.channels), dtype=numpy.float32)
+
+
+def _stage(frames: numpy.ndarray, out: numpy.ndarray):
+    # Same conversion as convert_channels, into float32 so a mono mix of int16 can not overflow
+    if frames.shape[1] == out.shape[1]:
+        out[:] = frames
+    elif out.shape[1] == 1:
+        numpy.mean(frames, axis=1, keepdims=True, dtype=numpy.float32, out=out)
+    else:
+        out[:] = frames[:, :1]
+
+
+def convert_channels(frames: numpy.ndarray, channels: int) -> numpy.ndarray:
+    if frames.shape[1] == channels:
+        return frames
+    if channels == 1:
+        return frames.mean(axis=1, keepdims=True).astype(frames.dtype)
+    return numpy.repeat(frames[:, :1], channels, axis=1)
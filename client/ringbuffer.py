@@ -0,0 +1,47 @@
+import numpy
+
+
+class RingBuffer:
+    # Single producer, single consumer: the producer only moves the write index and the consumer only moves the read
+    # index, so audio callbacks never take a lock.
+    def __init__(self, capacity: int, channels: int = 1, dtype=numpy.int16):
+        self._buffer = numpy.zeros((capacity, channels), dtype=dtype)
+        self._capacity = capacity
+        self._write_index = 0
+        self._read_index = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def readable(self) -> int:
+        return self._write_index - self._read_index
+
+    def writable(self) -> int:
+        return self._capacity - self.readable()
+
+    def write(self, frames: numpy.ndarray) -> int:
+        n = min(len(frames), self.writable())
+        start = self._write_index % self._capacity
+        first = min(n, self._capacity - start)
+        self._buffer[start:start + first] = frames[:first]
+        self._buffer[:n - first] = frames[first:n]
+        self._write_index += n
+        return n
+
+    def read_into(self, out: numpy.ndarray) -> int:
+        n = min(len(out), self.readable())
+        start = self._read_index % self._capacity
+        first = min(n, self._capacity - start)
+        out[:first] = self._buffer[start:start + first]
+        out[first:n] = self._buffer[:n - first]
+        self._read_index += n
+        return n
+
+    def discard(self, n: int) -> int:
+        n = min(n, self.readable())
+        self._read_index += n
+        return n
+
+    def clear(self):
+        self._read_index = self._write_index
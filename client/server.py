@@ -0,0 +1,510 @@
+import argparse
+import asyncio
+import collections
+import dataclasses
+import logging
+import secrets
+import time
+from typing import Optional
+
+import numpy
+from google.protobuf.message import DecodeError
+
+import codec
+import protocol
+from async_client import DEFAULT_CHANNELS, DEFAULT_CHUNK_SIZE, DEFAULT_RATE
+from gen import messages_pb2
+from mixer import AUDIO_FORMAT, Mixer
+from resampler import Resampler, convert_channels
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8081
+DEFAULT_CODECS = (messages_pb2.CODEC_MU_LAW, messages_pb2.CODEC_RAW_PCM)
+DEFAULT_MAX_QUEUED_SOUND_PACKETS = 32
+# Same as the Go server, the first one is used when a client asks for a rate that is not listed
+DEFAULT_RATES = (16000, 48000, 24000, 12000, 8000)
+DEFAULT_MAX_CHANNELS = 2
+DEFAULT_ROOM_LIST_LIMIT = 50
+MAX_ROOM_LIST_LIMIT = 500
+TOKEN_SIZE = 16
+
+
+@dataclasses.dataclass(frozen=True)
+class ServerStats:
+    sessions: int
+    rooms: int
+    received_sound_packets: int
+    forwarded_sound_packets: int
+    dropped_sound_packets: int
+
+
+@dataclasses.dataclass
+class _User:
+    id: int
+    name: str
+    token: str
+
+
+@dataclasses.dataclass
+class _StatusSnapshot:
+    version: int
+    rooms_ids: frozenset[int]
+    rooms_version: int
+    room_id: Optional[int]
+    users_ids: frozenset[int]
+
+
+class _Session:
+    # Control messages are never dropped; sound packets are bounded per recipient and the oldest one is dropped when
+    # the connection can not keep up, so one slow client never delays the others.
+    def __init__(self, user: _User, writer: asyncio.StreamWriter, status_updates: bool, paged_rooms: bool,
+                 codec_id: int, rate: int, channels: int, max_queued_sound_packets: int):
+        self.user = user
+        self.codec_id = codec_id
+        self.rate = rate
+        self.channels = channels
+        self.mixed_resampler: Optional[Resampler] = None
+        # Encodes the mix only this session gets; codecs keep state between frames, so it is never shared
+        self.mixed_encoder: Optional[codec.Codec] = None
+        self.room: Optional['_Room'] = None
+        self.mixed = False
+        self.receives_mixed_stream = False
+        self.status_updates = status_updates
+        self.paged_rooms = paged_rooms
+        self.last_status: Optional[_StatusSnapshot] = None
+        self.forwarded_sound_packets = 0
+        self.dropped_sound_packets = 0
+        self._writer = writer
+        self._control: collections.deque[tuple[bytes, bytes]] = collections.deque()
+        self._sound: collections.deque[tuple[bytes, bytes]] = collections.deque(maxlen=max_queued_sound_packets)
+        self._ready = asyncio.Event()
+
+    def send(self, pb_message):
+        transport_message = protocol.TransportMessage.from_protobuf(pb_message)
+        self._control.append((protocol.encode_transport_message(transport_message), transport_message.message_data))
+        self._ready.set()
+
+    def send_sound_packet(self, frame: tuple[bytes, bytes]):
+        if len(self._sound) == self._sound.maxlen:
+            self.dropped_sound_packets += 1
+        self._sound.append(frame)
+        self._ready.set()
+
+    async def write_messages(self):
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                buffers = []
+                while self._control:
+                    buffers.extend(self._control.popleft())
+                self.forwarded_sound_packets += len(self._sound)
+                while self._sound:
+                    buffers.extend(self._sound.popleft())
+                self._writer.writelines(buffers)
+                await self._writer.drain()
+        except ConnectionError:
+            self._writer.close()
+
+    def close(self):
+        self._writer.close()
+
+
+@dataclasses.dataclass
+class _Room:
+    id: int
+    name: str
+    sessions: dict[int, _Session] = dataclasses.field(default_factory=dict)
+    mixed_sessions: dict[int, _Session] = dataclasses.field(default_factory=dict)
+    mixer: Optional[Mixer] = None
+    mixer_task: Optional[asyncio.Task] = None
+    decoders: dict[int, tuple[tuple[int, int, int], codec.Codec]] = dataclasses.field(default_factory=dict)
+    resamplers: dict[int, Resampler] = dataclasses.field(default_factory=dict)
+    # Encoders of the mix shared by the members that do not hear themselves, by codec
+    mixed_encoders: dict[int, codec.Codec] = dataclasses.field(default_factory=dict)
+
+
+class Server:
+    # Reference implementation of the Go server on asyncio, so the system can be run and load tested without Docker.
+    # Sound packets are framed once and the same buffers are queued for every member of the room. Members that joined
+    # with JoinRoomRequest.mixed get one stream mixed by the server instead, without their own voice. The room is
+    # mixed at rate and channels and converted from and to the format each member negotiated.
+    def __init__(self, codecs: tuple[int, ...] = DEFAULT_CODECS,
+                 max_queued_sound_packets: int = DEFAULT_MAX_QUEUED_SOUND_PACKETS, rate: int = DEFAULT_RATE,
+                 channels: int = DEFAULT_CHANNELS, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 rates: tuple[int, ...] = DEFAULT_RATES, max_channels: int = DEFAULT_MAX_CHANNELS):
+        self._codecs = codecs
+        self._rates = rates
+        self._max_channels = max_channels
+        self._max_queued_sound_packets = max_queued_sound_packets
+        self._rate = rate
+        self._channels = channels
+        self._chunk_size = chunk_size
+        self._sound_packet_parser = protocol.SoundPacketParser()
+        self._users: list[_User] = []
+        self._token_to_user: dict[str, _User] = dict()
+        self._sessions: dict[int, _Session] = dict()
+        self._rooms: dict[int, _Room] = dict()
+        # Changes whenever a room is created, so clients that page through the rooms know to fetch again
+        self._rooms_version = 0
+        self._received_sound_packets = 0
+        self._closed_sessions_forwarded_sound_packets = 0
+        self._closed_sessions_dropped_sound_packets = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        for session in list(self._sessions.values()):
+            session.close()
+        await self._server.wait_closed()
+
+    def get_stats(self) -> ServerStats:
+        sessions = self._sessions.values()
+        return ServerStats(
+            sessions=len(self._sessions),
+            rooms=len(self._rooms),
+            received_sound_packets=self._received_sound_packets,
+            forwarded_sound_packets=self._closed_sessions_forwarded_sound_packets + sum(
+                s.forwarded_sound_packets for s in sessions),
+            dropped_sound_packets=self._closed_sessions_dropped_sound_packets + sum(
+                s.dropped_sound_packets for s in sessions),
+        )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session: Optional[_Session] = None
+        writer_task: Optional[asyncio.Task] = None
+        try:
+            session = await self._authorize(reader, writer)
+            if session is None:
+                return
+            writer_task = asyncio.create_task(session.write_messages())
+            self._publish_status((session,))
+
+            while True:
+                transport_message = await protocol.read_transport_message_async(reader)
+                if transport_message.message_type == messages_pb2.SOUND_PACKET:
+                    self._forward_sound_packet(session, transport_message)
+                    continue
+                try:
+                    message = transport_message.to_protobuf()
+                except DecodeError as e:
+                    logger.warning(f'Malformed message of type = {transport_message.message_type}, closing: {e}')
+                    break
+                except ValueError:
+                    logger.warning(f'Unknown message type = {transport_message.message_type}, ignored')
+                    continue
+                self._handle_message(session, message)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if writer_task is not None:
+                writer_task.cancel()
+            if session is not None:
+                self._remove_session(session)
+            writer.close()
+
+    async def _authorize(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Optional[_Session]:
+        transport_message = await protocol.read_transport_message_async(reader)
+        try:
+            request = transport_message.to_protobuf()
+        except (ValueError, DecodeError) as e:
+            logger.warning(f'Malformed first message of type = {transport_message.message_type}, closing: {e}')
+            return None
+        if type(request) is messages_pb2.SignUpRequest:
+            user = _User(id=len(self._users), name=request.username, token=secrets.token_hex(TOKEN_SIZE))
+            self._users.append(user)
+            self._token_to_user[user.token] = user
+        elif type(request) is messages_pb2.SignInRequest:
+            user = self._token_to_user.get(request.token)
+            if user is None:
+                response = messages_pb2.AuthorizationResponse(ok=False, reason='unknown token')
+                protocol.write_transport_messages_async((protocol.TransportMessage.from_protobuf(response),), writer)
+                await writer.drain()
+                return None
+        else:
+            logger.warning(f'Expected SignUpRequest or SignInRequest, got {type(request).__name__}')
+            return None
+
+        old_session = self._sessions.get(user.id)
+        if old_session is not None:
+            old_session.close()
+        rate = self._negotiate_rate(request.rate)
+        session = _Session(user, writer, request.status_updates, request.paged_rooms,
+                           self._negotiate_codec(request.codecs),
+                           rate or protocol.LEGACY_RATE, self._negotiate_channels(request.channels),
+                           self._max_queued_sound_packets)
+        self._sessions[user.id] = session
+        session.send(messages_pb2.AuthorizationResponse(ok=True, user_id=user.id, username=user.name,
+                                                        codec=session.codec_id, token=user.token, rate=rate,
+                                                        channels=session.channels))
+        logger.debug(f'User authorized, id = {user.id}, name = {user.name}')
+        return session
+
+    def _negotiate_codec(self, offered) -> int:
+        for codec_id in self._codecs:
+            if codec_id in offered:
+                return codec_id
+        return messages_pb2.CODEC_RAW_PCM
+
+    def _negotiate_rate(self, requested: int) -> int:
+        # Clients that predate the field do not send a rate and keep using the legacy one
+        if not requested:
+            return 0
+        return requested if requested in self._rates else self._rates[0]
+
+    def _negotiate_channels(self, requested: int) -> int:
+        return min(max(requested, 1), self._max_channels)
+
+    def _handle_message(self, session: _Session, message):
+        if type(message) is messages_pb2.CreateRoomRequest:
+            room = _Room(id=len(self._rooms), name=message.name or f'Room {len(self._rooms)}')
+            self._rooms[room.id] = room
+            self._rooms_version += 1
+            session.send(messages_pb2.CreateRoomResponse(room_id=room.id))
+            self._publish_status(self._sessions.values())
+        elif type(message) is messages_pb2.JoinRoomRequest:
+            room = self._rooms.get(message.room_id)
+            if room is None:
+                return
+            changed = self._leave_room(session)
+            room.sessions[session.user.id] = session
+            session.room = room
+            session.mixed = message.mixed
+            if session.mixed:
+                room.mixed_sessions[session.user.id] = session
+                if room.mixer is None:
+                    room.mixer = Mixer(self._chunk_size, self._rate, self._channels)
+                    room.mixer_task = asyncio.create_task(self._mix_room(room))
+            self._publish_status(changed + tuple(room.sessions.values()))
+        elif type(message) is messages_pb2.LeaveRoomRequest:
+            self._publish_status(self._leave_room(session) + (session,))
+        elif type(message) is messages_pb2.RoomListRequest:
+            session.send(self._list_rooms(message))
+        elif type(message) is messages_pb2.StatusRequest:
+            self._publish_status((session,), full=True)
+
+    def _list_rooms(self, request: messages_pb2.RoomListRequest) -> messages_pb2.RoomListResponse:
+        limit = min(request.limit or DEFAULT_ROOM_LIST_LIMIT, MAX_ROOM_LIST_LIMIT)
+        room_filter = request.filter.lower()
+        response = messages_pb2.RoomListResponse(request_id=request.request_id, offset=request.offset,
+                                                 rooms_version=self._rooms_version)
+        for room in self._rooms.values():
+            if room_filter and room_filter not in room.name.lower() and room_filter not in str(room.id):
+                continue
+            if request.offset <= response.total < request.offset + limit:
+                response.rooms.add(id=room.id, name=room.name, users_count=len(room.sessions))
+            response.total += 1
+        return response
+
+    def _leave_room(self, session: _Session) -> tuple[_Session, ...]:
+        room = session.room
+        if room is None:
+            return ()
+        session.room = None
+        session.receives_mixed_stream = False
+        session.mixed_resampler = None
+        session.mixed_encoder = None
+        if room.sessions.get(session.user.id) is session:
+            del room.sessions[session.user.id]
+        if room.mixed_sessions.get(session.user.id) is session:
+            del room.mixed_sessions[session.user.id]
+            if not room.mixed_sessions:
+                room.mixer_task.cancel()
+                room.mixer, room.mixer_task = None, None
+                room.decoders.clear()
+                room.resamplers.clear()
+                room.mixed_encoders.clear()
+        return tuple(room.sessions.values())
+
+    def _remove_session(self, session: _Session):
+        changed = self._leave_room(session)
+        if self._sessions.get(session.user.id) is session:
+            del self._sessions[session.user.id]
+        self._closed_sessions_forwarded_sound_packets += session.forwarded_sound_packets
+        self._closed_sessions_dropped_sound_packets += session.dropped_sound_packets
+        self._publish_status(changed)
+
+    def _forward_sound_packet(self, sender: _Session, transport_message: protocol.TransportMessage):
+        room = sender.room
+        if room is None:
+            return
+        self._received_sound_packets += 1
+        frame = (protocol.encode_transport_message(transport_message), transport_message.message_data)
+        for session in room.sessions.values():
+            if not session.mixed:
+                session.send_sound_packet(frame)
+        if room.mixer is not None:
+            try:
+                packet = self._sound_packet_parser.parse(transport_message.message_data)
+            except (ValueError, DecodeError) as e:
+                logger.debug(f'Dropped malformed sound packet from user {sender.user.id}: {e}')
+                return
+            self._write_to_mixer(room, packet)
+
+    def _write_to_mixer(self, room: _Room, packet):
+        data = b''
+        if packet.data:
+            rate, channels = protocol.sound_packet_format(packet)
+            key = (packet.codec, rate, channels)
+            decoder_key, decoder = room.decoders.get(packet.user_id, (None, None))
+            try:
+                if decoder_key != key:
+                    decoder = codec.create_codec(packet.codec, rate, channels, self._chunk_size)
+                    room.decoders[packet.user_id] = (key, decoder)
+                    room.resamplers[packet.user_id] = Resampler(rate, self._rate, self._channels)
+                frames = numpy.frombuffer(decoder.decode(packet.data), dtype=AUDIO_FORMAT).reshape(-1, channels)
+            except ValueError as e:
+                logger.debug(f'Dropped sound packet from user {packet.user_id}: {e}')
+                return
+            data = room.resamplers[packet.user_id].process(convert_channels(frames, self._channels)).tobytes()
+        room.mixer.write_user_data(packet.user_id, data, packet.sequence_number, packet.capture_timestamp_us)
+
+    async def _mix_room(self, room: _Room):
+        loop = asyncio.get_running_loop()
+        chunk_s = self._chunk_size / self._rate
+        next_chunk_time = loop.time()
+        sequence_number = 0
+        while True:
+            next_chunk_time += chunk_s
+            await asyncio.sleep(max(0.0, next_chunk_time - loop.time()))
+            mixed = room.mixer.mix_next_chunk_without(room.mixed_sessions.keys())
+            sequence_number += 1
+            shared_frames: dict[int, tuple[bytes, bytes]] = dict()
+            for user_id, session in room.mixed_sessions.items():
+                speaking_users_ids = [] if mixed is None else [id for id in mixed[2] if id != user_id]
+                if not speaking_users_ids:
+                    if session.receives_mixed_stream:
+                        session.receives_mixed_stream = False
+                        session.send_sound_packet(self._mixed_frame(session, None, [], sequence_number))
+                    continue
+                total, without, _ = mixed
+                # Only listeners that use the mix format and do not hear themselves can share the encoded frame
+                if user_id in without or (session.rate, session.channels) != (self._rate, self._channels):
+                    pcm = without.get(user_id, total)
+                    frame = self._mixed_frame(session, pcm, speaking_users_ids, sequence_number)
+                else:
+                    frame = shared_frames.get(session.codec_id)
+                    if frame is None:
+                        frame = self._mixed_frame(session, total, speaking_users_ids, sequence_number, room)
+                        shared_frames[session.codec_id] = frame
+                session.receives_mixed_stream = True
+                session.send_sound_packet(frame)
+
+    def _mixed_frame(self, session: _Session, pcm, speaking_users_ids: list[int], sequence_number: int,
+                     shared_by: Optional[_Room] = None) -> tuple[bytes, bytes]:
+        # With shared_by the frame is the total mix of that room and goes to every member in the mix format
+        packet = protocol.new_sound_packet(codec=session.codec_id, mixed=True, speaking_users_ids=speaking_users_ids,
+                                           rate=session.rate, channels=session.channels)
+        if pcm is not None:
+            if session.rate != self._rate or session.channels != self._channels:
+                if session.mixed_resampler is None:
+                    session.mixed_resampler = Resampler(self._rate, session.rate, session.channels)
+                pcm = session.mixed_resampler.process(convert_channels(pcm, session.channels))
+            if shared_by is not None:
+                encoder = shared_by.mixed_encoders.get(session.codec_id)
+                if encoder is None:
+                    encoder = codec.create_codec(session.codec_id, self._rate, self._channels, self._chunk_size)
+                    shared_by.mixed_encoders[session.codec_id] = encoder
+            else:
+                if session.mixed_encoder is None:
+                    session.mixed_encoder = codec.create_codec(session.codec_id, session.rate, session.channels,
+                                                               self._chunk_size)
+                encoder = session.mixed_encoder
+            packet.data = encoder.encode(pcm)
+            packet.sequence_number = sequence_number
+            packet.capture_timestamp_us = time.time_ns() // 1000
+        transport_message = protocol.encode_sound_packet(packet)
+        return protocol.encode_transport_message(transport_message), transport_message.message_data
+
+    def _publish_status(self, sessions, full: bool = False):
+        rooms_ids = list(self._rooms)
+        for session in sessions:
+            room = session.room
+            status = messages_pb2.Status(rooms_ids=() if session.paged_rooms else rooms_ids,
+                                         is_in_room=room is not None, rooms_version=self._rooms_version)
+            if room is not None:
+                status.room.id = room.id
+                status.room.name = room.name
+                for s in room.sessions.values():
+                    status.room.users.add(id=s.user.id, name=s.user.name)
+            if not session.status_updates:
+                session.send(status)
+            elif session.last_status is None or full:
+                # Versions keep counting after a resync, so the client can tell the updates sent before it
+                status.version = 1 if session.last_status is None else session.last_status.version + 1
+                session.last_status = _snapshot(status)
+                session.send(status)
+            else:
+                update = _status_update(session.last_status, status)
+                if update is not None:
+                    session.last_status = _snapshot(status)
+                    session.send(update)
+
+
+def _snapshot(status: messages_pb2.Status) -> _StatusSnapshot:
+    return _StatusSnapshot(version=status.version, rooms_ids=frozenset(status.rooms_ids),
+                           rooms_version=status.rooms_version,
+                           room_id=status.room.id if status.is_in_room else None,
+                           users_ids=frozenset(u.id for u in status.room.users))
+
+
+def _status_update(snapshot: _StatusSnapshot, status: messages_pb2.Status) -> Optional[messages_pb2.StatusUpdate]:
+    status.version = snapshot.version + 1
+    next_snapshot = _snapshot(status)
+    update = messages_pb2.StatusUpdate(version=status.version, rooms_version=status.rooms_version)
+    update.added_rooms_ids.extend(id for id in status.rooms_ids if id not in snapshot.rooms_ids)
+    update.removed_rooms_ids.extend(id for id in snapshot.rooms_ids if id not in next_snapshot.rooms_ids)
+    if next_snapshot.room_id != snapshot.room_id:
+        update.room_changed = True
+        if status.is_in_room:
+            update.room.CopyFrom(status.room)
+    elif status.is_in_room:
+        update.joined_users.extend(u for u in status.room.users if u.id not in snapshot.users_ids)
+        update.left_users_ids.extend(id for id in snapshot.users_ids if id not in next_snapshot.users_ids)
+
+    if not (update.room_changed or update.added_rooms_ids or update.removed_rooms_ids or update.joined_users
+            or update.left_users_ids or next_snapshot.rooms_version != snapshot.rooms_version):
+        return None
+    return update
+
+
+async def run(args):
+    server = Server(max_queued_sound_packets=args.max_queued_sound_packets)
+    port = await server.start(args.host, args.port)
+    logger.info(f'Launching server on {args.host}:{port}, protobuf backend: {protocol.PROTOBUF_BACKEND}')
+    if args.stats_interval_s > 0:
+        async def log_stats():
+            while True:
+                await asyncio.sleep(args.stats_interval_s)
+                logger.info(f'{server.get_stats()}')
+
+        asyncio.create_task(log_stats())
+    await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Voice chat server on asyncio, compatible with the Go server')
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-queued-sound-packets', type=int, default=DEFAULT_MAX_QUEUED_SOUND_PACKETS,
+                        help='sound packets kept per recipient before the oldest one is dropped')
+    parser.add_argument('--stats-interval-s', type=float, default=0, help='log fan-out counters this often')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+import dataclasses
+from typing import Optional, Union
+
+_DATA_TAG = 1 << 3 | 2
+_USER_ID_TAG = 2 << 3
+_SEQUENCE_NUMBER_TAG = 3 << 3
+_CAPTURE_TIMESTAMP_US_TAG = 4 << 3
+_CODEC_TAG = 5 << 3
+_MIXED_TAG = 6 << 3
+_SPEAKING_USERS_IDS_TAG = 7 << 3
+_PACKED_SPEAKING_USERS_IDS_TAG = 7 << 3 | 2
+_RATE_TAG = 8 << 3
+_CHANNELS_TAG = 9 << 3
+
+_ONE_BYTE_VARINTS = [bytes((i,)) for i in range(128)]
+
+
+@dataclasses.dataclass
+class SoundPacket:
+    # Same fields as messages_pb2.SoundPacket, so either can be passed to code that plays or sends sound
+    data: bytes = b''
+    user_id: int = 0
+    sequence_number: int = 0
+    capture_timestamp_us: int = 0
+    codec: int = 0
+    mixed: bool = False
+    speaking_users_ids: list[int] = dataclasses.field(default_factory=list)
+    rate: int = 0
+    channels: int = 0
+
+
+def _varint(value: int) -> bytes:
+    if value < 0:
+        # Negative ints are ten bytes in protobuf, as their 64 bit two's complement
+        value += 1 << 64
+    elif value < 128:
+        return _ONE_BYTE_VARINTS[value]
+    out = bytearray()
+    while value > 127:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def encode(packet) -> bytes:
+    # Fields are written in field number order and defaults are skipped, like SerializeToString does
+    parts = []
+    if packet.data:
+        parts += (b'\x0a', _varint(len(packet.data)), packet.data)
+    if packet.user_id:
+        parts += (b'\x10', _varint(packet.user_id))
+    if packet.sequence_number:
+        parts += (b'\x18', _varint(packet.sequence_number))
+    if packet.capture_timestamp_us:
+        parts += (b'\x20', _varint(packet.capture_timestamp_us))
+    if packet.codec:
+        parts += (b'\x28', _varint(packet.codec))
+    if packet.mixed:
+        parts.append(b'\x30\x01')
+    if packet.speaking_users_ids:
+        ids = b''.join(_varint(i) for i in packet.speaking_users_ids)
+        parts += (b'\x3a', _varint(len(ids)), ids)
+    if packet.rate:
+        parts += (b'\x40', _varint(packet.rate))
+    if packet.channels:
+        parts += (b'\x48', _varint(packet.channels))
+    return b''.join(parts)
+
+
+def _read_varint(data, i: int) -> tuple[int, int]:
+    b = data[i]
+    if b < 128:
+        return b, i + 1
+    value = b & 0x7F
+    shift = 7
+    while True:
+        i += 1
+        b = data[i]
+        value |= (b & 0x7F) << shift
+        if b < 128:
+            return value, i + 1
+        shift += 7
+
+
+def decode(data: Union[bytes, memoryview], packet: Optional[SoundPacket] = None) -> SoundPacket:
+    # Fills and returns packet when it is given, so the receive loop does not allocate a message per packet
+    if packet is None:
+        packet = SoundPacket()
+    else:
+        packet.data = b''
+        packet.user_id = packet.sequence_number = packet.capture_timestamp_us = packet.codec = 0
+        packet.rate = packet.channels = 0
+        packet.mixed = False
+        packet.speaking_users_ids = []
+    end = len(data)
+    i = 0
+    try:
+        while i < end:
+            tag, i = _read_varint(data, i)
+            wire_type = tag & 7
+            if wire_type == 0:
+                value, i = _read_varint(data, i)
+                if tag == _USER_ID_TAG:
+                    packet.user_id = value & 0xFFFFFFFF
+                elif tag == _SEQUENCE_NUMBER_TAG:
+                    packet.sequence_number = value & 0xFFFFFFFF
+                elif tag == _CAPTURE_TIMESTAMP_US_TAG:
+                    packet.capture_timestamp_us = value & 0xFFFFFFFFFFFFFFFF
+                elif tag == _CODEC_TAG:
+                    # Enums are int32, negative ones come as ten bytes
+                    value &= 0xFFFFFFFF
+                    packet.codec = value - (1 << 32) if value & 0x80000000 else value
+                elif tag == _MIXED_TAG:
+                    packet.mixed = value != 0
+                elif tag == _SPEAKING_USERS_IDS_TAG:
+                    packet.speaking_users_ids.append(value & 0xFFFFFFFF)
+                elif tag == _RATE_TAG:
+                    packet.rate = value & 0xFFFFFFFF
+                elif tag == _CHANNELS_TAG:
+                    packet.channels = value & 0xFFFFFFFF
+            elif wire_type == 2:
+                length, i = _read_varint(data, i)
+                if i + length > end:
+                    raise ValueError('Truncated SoundPacket')
+                if tag == _DATA_TAG:
+                    packet.data = bytes(data[i:i + length])
+                elif tag == _PACKED_SPEAKING_USERS_IDS_TAG:
+                    j = i
+                    while j < i + length:
+                        value, j = _read_varint(data, j)
+                        packet.speaking_users_ids.append(value & 0xFFFFFFFF)
+                i += length
+            elif wire_type == 1:
+                i += 8
+            elif wire_type == 5:
+                i += 4
+            else:
+                raise ValueError(f'Unsupported wire type = {wire_type} in SoundPacket')
+    except IndexError:
+        raise ValueError('Truncated SoundPacket') from None
+    if i > end:
+        raise ValueError('Truncated SoundPacket')
+    return packet
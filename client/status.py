@@ -0,0 +1,126 @@
+import dataclasses
+import logging
+from typing import Callable, Optional
+
+from gen import messages_pb2
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class User:
+    id: int
+    name: str
+
+    @staticmethod
+    def from_protobuf(pb: messages_pb2.User):
+        return User(id=pb.id, name=pb.name)
+
+
+@dataclasses.dataclass(frozen=True)
+class Room:
+    id: int
+    users: tuple[User, ...]
+    name: str = ''
+
+    @staticmethod
+    def from_protobuf(pb: messages_pb2.Room):
+        return Room(id=pb.id, users=tuple(User.from_protobuf(u) for u in pb.users), name=pb.name)
+
+
+@dataclasses.dataclass(frozen=True)
+class RoomInfo:
+    id: int
+    name: str
+    users_count: int
+
+    @staticmethod
+    def from_protobuf(pb: messages_pb2.RoomInfo):
+        return RoomInfo(id=pb.id, name=pb.name, users_count=pb.users_count)
+
+
+@dataclasses.dataclass(frozen=True)
+class RoomListPage:
+    request_id: int
+    offset: int
+    # Number of rooms that match the filter, not only the ones in this page
+    total: int
+    rooms: tuple[RoomInfo, ...]
+    rooms_version: int
+
+    @staticmethod
+    def from_protobuf(pb: messages_pb2.RoomListResponse):
+        return RoomListPage(request_id=pb.request_id, offset=pb.offset, total=pb.total,
+                            rooms=tuple(RoomInfo.from_protobuf(r) for r in pb.rooms), rooms_version=pb.rooms_version)
+
+
+@dataclasses.dataclass(frozen=True)
+class Status:
+    rooms_ids: tuple[int, ...]
+    room: Optional[Room]
+    version: int = 0
+    # Changes when rooms are created; rooms_ids stays empty for clients that page through the rooms
+    rooms_version: int = 0
+
+    @staticmethod
+    def from_protobuf(pb: messages_pb2.Status):
+        return Status(
+            rooms_ids=tuple(pb.rooms_ids),
+            room=None if pb.is_in_room is False else Room.from_protobuf(pb.room),
+            version=pb.version,
+            rooms_version=pb.rooms_version
+        )
+
+
+class StatusStore:
+    # A StatusUpdate is only applied to the version right before it. After a gap the store calls request_status and
+    # drops updates until the full Status comes, so the rooms and users are never built from a partial history.
+    def __init__(self, request_status: Callable[[], None]):
+        self._status: Optional[Status] = None
+        self._request_status = request_status
+        self._awaiting_status = False
+
+    def get(self) -> Optional[Status]:
+        return self._status
+
+    def apply_status(self, pb: messages_pb2.Status) -> Status:
+        self._awaiting_status = False
+        self._status = Status.from_protobuf(pb)
+        return self._status
+
+    def apply_update(self, pb: messages_pb2.StatusUpdate) -> Optional[Status]:
+        status = self._status
+        if status is None:
+            logger.warning(f'StatusUpdate version = {pb.version} received before Status, ignored')
+            return None
+        if self._awaiting_status:
+            logger.debug(f'StatusUpdate version = {pb.version} received while waiting for Status, ignored')
+            return None
+        if pb.version <= status.version:
+            logger.debug(f'StatusUpdate version = {pb.version} is not newer than version = {status.version}, ignored')
+            return None
+        if pb.version != status.version + 1:
+            logger.warning(f'StatusUpdate version = {pb.version} does not follow version = {status.version}, '
+                           f'requesting Status')
+            self._awaiting_status = True
+            self._request_status()
+            return None
+
+        rooms_ids = status.rooms_ids
+        if pb.removed_rooms_ids:
+            removed_rooms_ids = set(pb.removed_rooms_ids)
+            rooms_ids = tuple(id for id in rooms_ids if id not in removed_rooms_ids)
+        if pb.added_rooms_ids:
+            rooms_ids = rooms_ids + tuple(pb.added_rooms_ids)
+
+        room = status.room
+        if pb.room_changed:
+            room = Room.from_protobuf(pb.room) if pb.HasField('room') else None
+        elif room is not None and (pb.joined_users or pb.left_users_ids):
+            left_users_ids = set(pb.left_users_ids)
+            users = tuple(u for u in room.users if u.id not in left_users_ids)
+            room = Room(id=room.id, users=users + tuple(User.from_protobuf(u) for u in pb.joined_users),
+                        name=room.name)
+
+        self._status = Status(rooms_ids=rooms_ids, room=room, version=pb.version, rooms_version=pb.rooms_version)
+        return self._status
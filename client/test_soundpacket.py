@@ -0,0 +1,129 @@
+import dataclasses
+
+import pytest
+from google.protobuf.message import DecodeError
+
+import soundpacket
+from gen import messages_pb2
+
+
+def _fields(message) -> dict:
+    fields = {field.name: getattr(message, field.name) for field in message.DESCRIPTOR.fields}
+    fields['speaking_users_ids'] = list(fields['speaking_users_ids'])
+    return fields
+
+
+def _parse(data: bytes) -> messages_pb2.SoundPacket:
+    pb = messages_pb2.SoundPacket()
+    pb.ParseFromString(data)
+    return pb
+
+
+def _check_round_trip(fields: dict):
+    pb = messages_pb2.SoundPacket(**fields)
+    expected = pb.SerializeToString()
+    assert soundpacket.encode(pb) == expected
+    assert soundpacket.encode(soundpacket.SoundPacket(**fields)) == expected
+    assert dataclasses.asdict(soundpacket.decode(expected)) == _fields(pb)
+    assert _parse(soundpacket.encode(soundpacket.SoundPacket(**fields))) == pb
+
+
+@pytest.mark.parametrize('value', [0, 1, 127, 128, 255, 16383, 16384, 2 ** 31 - 1, 2 ** 31, 2 ** 32 - 1])
+@pytest.mark.parametrize('name', ['user_id', 'sequence_number', 'capture_timestamp_us', 'rate', 'channels'])
+def test_uint32_boundaries(name: str, value: int):
+    _check_round_trip({name: value})
+
+
+@pytest.mark.parametrize('value', [2 ** 32, 2 ** 35 - 1, 2 ** 35, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1])
+def test_uint64_boundaries(value: int):
+    _check_round_trip({'capture_timestamp_us': value})
+
+
+@pytest.mark.parametrize('value', [-1, -2, -128, -2 ** 31, 2 ** 31 - 1, 127, 128])
+def test_int32_codec(value: int):
+    # Unknown enum values are kept by proto3, negative ones are ten byte varints
+    _check_round_trip({'codec': value})
+
+
+@pytest.mark.parametrize('value', [-1, -128, -2 ** 31, -2 ** 63])
+def test_negative_values_are_ten_bytes(value: int):
+    encoded = soundpacket.encode(soundpacket.SoundPacket(user_id=value, capture_timestamp_us=value))
+    assert len(encoded) == 2 * (1 + 10)
+    pb = _parse(encoded)
+    assert pb.user_id == value & 0xFFFFFFFF
+    assert pb.capture_timestamp_us == value & 0xFFFFFFFFFFFFFFFF
+    packet = soundpacket.decode(encoded)
+    assert (packet.user_id, packet.capture_timestamp_us) == (pb.user_id, pb.capture_timestamp_us)
+
+
+@pytest.mark.parametrize('data', [b'', b'\x00', b'\x7f' * 127, b'\xff' * 128, bytes(range(256)) * 64])
+def test_data(data: bytes):
+    _check_round_trip({'data': data, 'user_id': 1})
+
+
+def test_empty_packet():
+    assert soundpacket.encode(soundpacket.SoundPacket()) == b''
+    assert soundpacket.decode(b'') == soundpacket.SoundPacket()
+
+
+def test_all_fields():
+    _check_round_trip({'data': b'\x01\x02\x03', 'user_id': 7, 'sequence_number': 2 ** 32 - 1,
+                       'capture_timestamp_us': 1_700_000_000_000_000, 'codec': messages_pb2.CODEC_MU_LAW,
+                       'mixed': True, 'speaking_users_ids': [0, 1, 127, 128, 2 ** 32 - 1], 'rate': 48000,
+                       'channels': 2})
+
+
+def test_decode_reuses_packet():
+    packet = soundpacket.decode(soundpacket.encode(soundpacket.SoundPacket(b'abc', 1, 2, 3, 4, True, [5], 6, 7)))
+    assert soundpacket.decode(b'\x10\x09', packet) is packet
+    assert packet == soundpacket.SoundPacket(user_id=9)
+
+
+def test_repeated_scalar_fields_keep_the_last():
+    data = b'\x10\x01\x0a\x01a\x10\x02\x0a\x02bc\x30\x01\x30\x00'
+    pb = _parse(data)
+    assert dataclasses.asdict(soundpacket.decode(data)) == _fields(pb)
+    assert (pb.user_id, pb.data, pb.mixed) == (2, b'bc', False)
+
+
+def test_unpacked_and_packed_speaking_users_ids():
+    # Parsers have to accept both encodings of a repeated field and append across occurrences
+    data = b'\x38\x01\x3a\x03\x02\x80\x01\x38\x04'
+    pb = _parse(data)
+    assert dataclasses.asdict(soundpacket.decode(data)) == _fields(pb)
+    assert list(pb.speaking_users_ids) == [1, 2, 128, 4]
+
+
+def test_unknown_fields_are_skipped():
+    unknown = (b'\x50\x96\x01'  # field 10, varint
+               b'\x59' + bytes(8) +  # field 11, fixed64
+               b'\x62\x03xyz'  # field 12, length delimited
+               b'\x6d' + bytes(4) +  # field 13, fixed32
+               b'\x80\x08\x01')  # field 128, varint with a two byte tag
+    data = unknown + b'\x10\x05' + unknown + b'\x0a\x01a' + unknown
+    pb = _parse(data)
+    assert dataclasses.asdict(soundpacket.decode(data)) == _fields(pb)
+    assert (pb.user_id, pb.data) == (5, b'a')
+
+
+def test_truncated_input():
+    encoded = messages_pb2.SoundPacket(data=b'x' * 200, user_id=300, capture_timestamp_us=2 ** 60,
+                                       speaking_users_ids=[1, 2 ** 20], rate=16000).SerializeToString()
+    for n in range(len(encoded)):
+        prefix = encoded[:n]
+        try:
+            pb = _parse(prefix)
+        except DecodeError:
+            with pytest.raises(ValueError):
+                soundpacket.decode(prefix)
+        else:
+            assert dataclasses.asdict(soundpacket.decode(prefix)) == _fields(pb)
+
+
+@pytest.mark.parametrize('data', [b'\x10', b'\x10\x80', b'\x0a\x05ab', b'\x0a\x80', b'\x59\x00', b'\x6d\x00\x00',
+                                  b'\x3a\x02\x01'])
+def test_malformed_input(data: bytes):
+    with pytest.raises(ValueError):
+        soundpacket.decode(data)
+    with pytest.raises(DecodeError):
+        _parse(data)
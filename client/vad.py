@@ -0,0 +1,41 @@
+import numpy
+
+DEFAULT_THRESHOLD_DB = -45.0
+WEAK_SPEECH_MARGIN_DB = 10.0
+UNVOICED_ZERO_CROSSING_RATE = 0.25
+DEFAULT_HANGOVER_CHUNKS = 8
+# Speech is kept going this long after the last loud chunk, whatever the chunk duration
+DEFAULT_HANGOVER_MS = 400
+
+
+def hangover_chunks(chunk_size: int, rate: int, hangover_ms: int = DEFAULT_HANGOVER_MS) -> int:
+    return max(1, round(hangover_ms * rate / 1000 / chunk_size))
+
+
+class VoiceActivityDetector:
+    def __init__(self, threshold_db: float = DEFAULT_THRESHOLD_DB, hangover_chunks: int = DEFAULT_HANGOVER_CHUNKS):
+        self.threshold_db = threshold_db
+        self.hangover_chunks = hangover_chunks
+        self._hangover_left = 0
+
+    def is_speech(self, pcm: bytes) -> bool:
+        energy_db, zero_crossing_rate = chunk_features(pcm)
+        if energy_db >= self.threshold_db or (energy_db >= self.threshold_db - WEAK_SPEECH_MARGIN_DB and
+                                              zero_crossing_rate >= UNVOICED_ZERO_CROSSING_RATE):
+            self._hangover_left = self.hangover_chunks
+            return True
+        if self._hangover_left > 0:
+            self._hangover_left -= 1
+            return True
+        return False
+
+
+def chunk_features(pcm: bytes) -> tuple[float, float]:
+    samples = numpy.frombuffer(pcm, dtype=numpy.int16)
+    if len(samples) == 0:
+        return -numpy.inf, 0.0
+    normalized = samples.astype(numpy.float32) / 32768
+    energy_db = 10 * numpy.log10(numpy.dot(normalized, normalized) / len(samples) + 1e-12)
+    signs = numpy.signbit(samples)
+    zero_crossing_rate = numpy.count_nonzero(signs[1:] != signs[:-1]) / len(samples)
+    return float(energy_db), float(zero_crossing_rate)
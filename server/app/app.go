@@ -10,9 +10,19 @@ import (
 )
 
 type App struct {
+	// Codecs clients may send, in order of preference; every client has to be able to decode all of them
+	Codecs []gen.Codec
+	// UdpMedia offers clients a datagram path for sound packets on the same port number as TCP
+	UdpMedia bool
+	// Rates clients may send sound at; the first one is used when a client asks for another. Clients resample every
+	// speaker, so peers do not have to agree on a rate
+	Rates []uint32
+	// Channels is the maximal channel count of sent sound
+	Channels uint32
 	users    userPool
 	sessions sessionPool
 	rooms    roomPool
+	media    mediaServer
 }
 
 func (app *App) Run(port string) {
@@ -23,6 +33,13 @@ func (app *App) Run(port string) {
 		fmt.Println(err)
 		return
 	}
+	if app.UdpMedia {
+		if err := app.media.listen(port); err != nil {
+			fmt.Println(err)
+			return
+		}
+		go app.media.serve()
+	}
 
 	for {
 		c, err := ln.Accept()
@@ -47,7 +64,13 @@ func (app *App) handle(c net.Conn) {
 			fmt.Println("Connection.Close() error:", err)
 		}
 		if s.RoomInside != nil {
-			s.RoomInside.removeUser(s.User)
+			s.RoomInside.removeUser(s.User, s)
+		}
+		if s.User != nil {
+			app.sessions.removeClientSession(s.User.Id, s)
+		}
+		if s.MediaKey != nil {
+			app.media.unregister(s)
 		}
 		if err := recover(); err != nil {
 			fmt.Println("Recover from panic:", err)
@@ -61,18 +84,59 @@ func (app *App) handle(c net.Conn) {
 
 func (app *App) authorizeUser(s *session) {
 	transportMessage := <-s.FromConnectionForwarder.Channel
-	if transportMessage.Type != uint32(gen.MessageType_SIGN_UP_REQUEST) {
-		panic("expected MessageType_SIGN_UP_REQUEST")
-	}
+	var codecs []gen.Codec
+	var udpMedia bool
+	var rate, channels uint32
+	switch gen.MessageType(transportMessage.Type) {
+	case gen.MessageType_SIGN_UP_REQUEST:
+		signUpRequest := &gen.SignUpRequest{}
+		if err := proto.Unmarshal(transportMessage.Data, signUpRequest); err != nil {
+			panic("proto.Unmarshal error:" + err.Error())
+		}
+		s.User = app.users.addUser(&user{Name: signUpRequest.Username})
+		s.StatusUpdates = signUpRequest.StatusUpdates
+		s.PagedRooms = signUpRequest.PagedRooms
+		codecs, udpMedia = signUpRequest.Codecs, signUpRequest.UdpMedia
+		rate, channels = signUpRequest.Rate, signUpRequest.Channels
 
-	signUpRequest := &gen.SignUpRequest{}
-	if err := proto.Unmarshal(transportMessage.Data, signUpRequest); err != nil {
-		panic("proto.Unmarshal error:" + err.Error())
-	}
+	case gen.MessageType_SIGN_IN_REQUEST:
+		signInRequest := &gen.SignInRequest{}
+		if err := proto.Unmarshal(transportMessage.Data, signInRequest); err != nil {
+			panic("proto.Unmarshal error:" + err.Error())
+		}
+		u, ok := app.users.getUserByToken(signInRequest.Token)
+		if !ok {
+			rejection, _ := protocol.NewTransportMessageFromProtobuf(
+				gen.MessageType_AUTHORIZATION_RESPONSE, &gen.AuthorizationResponse{Ok: false, Reason: "unknown token"},
+			)
+			_ = protocol.WriteTransportMessage(&rejection, s.Connection)
+			panic("unknown token")
+		}
+		s.User = u
+		s.StatusUpdates = signInRequest.StatusUpdates
+		s.PagedRooms = signInRequest.PagedRooms
+		codecs, udpMedia = signInRequest.Codecs, signInRequest.UdpMedia
+		rate, channels = signInRequest.Rate, signInRequest.Channels
 
-	s.User = app.users.addUser(&user{Name: signUpRequest.Username})
+	default:
+		panic("expected MessageType_SIGN_UP_REQUEST or MessageType_SIGN_IN_REQUEST")
+	}
+	app.sessions.updateClientSession(s.User.Id, s)
 
-	authorizationResponse := &gen.AuthorizationResponse{Ok: true, UserId: s.User.Id, Username: s.User.Name}
+	authorizationResponse := &gen.AuthorizationResponse{
+		Ok:       true,
+		UserId:   s.User.Id,
+		Username: s.User.Name,
+		Codec:    app.negotiateCodec(codecs),
+		Token:    s.User.Token,
+		Rate:     app.negotiateRate(rate),
+		Channels: app.negotiateChannels(channels),
+	}
+	if app.UdpMedia && udpMedia {
+		app.media.register(s)
+		authorizationResponse.MediaSessionKey = s.MediaKey
+		authorizationResponse.MediaPort = app.media.port()
+	}
 	authorizationResponseTransportMessage, err := protocol.NewTransportMessageFromProtobuf(
 		gen.MessageType_AUTHORIZATION_RESPONSE, authorizationResponse,
 	)
@@ -83,17 +147,56 @@ func (app *App) authorizeUser(s *session) {
 	fmt.Println("User authorized!", s.User)
 }
 
+func (app *App) negotiateCodec(offered []gen.Codec) gen.Codec {
+	for _, supported := range app.Codecs {
+		for _, codec := range offered {
+			if codec == supported {
+				return codec
+			}
+		}
+	}
+	return gen.Codec_CODEC_RAW_PCM
+}
+
+func (app *App) negotiateRate(requested uint32) uint32 {
+	// Clients that predate the field do not send a rate and keep using the legacy one
+	if requested == 0 {
+		return 0
+	}
+	for _, rate := range app.Rates {
+		if rate == requested {
+			return rate
+		}
+	}
+	if len(app.Rates) == 0 {
+		return requested
+	}
+	return app.Rates[0]
+}
+
+func (app *App) negotiateChannels(requested uint32) uint32 {
+	if requested == 0 {
+		return 1
+	}
+	if app.Channels != 0 && requested > app.Channels {
+		return app.Channels
+	}
+	return requested
+}
+
 func (app *App) handleSession(session *session) {
 	ticker := time.NewTicker(time.Millisecond * 50)
 	for {
 		select {
 		case <-ticker.C:
-			app.sendStatusToUser(session)
+			app.sendStatusToUser(session, false)
 		case transportMessage, ok := <-session.FromConnectionForwarder.Channel:
 			if !ok {
 				return
 			}
 			app.handleMessageFromClient(session, transportMessage)
+		case transportMessage := <-session.MediaChannel:
+			app.handleMessageFromClient(session, transportMessage)
 		}
 	}
 }
@@ -105,7 +208,7 @@ func (app *App) handleMessageFromClient(session *session, transportMessage *prot
 		if err := proto.Unmarshal(transportMessage.Data, message); err != nil {
 			break
 		}
-		room := newRoom()
+		room := newRoom(message.Name)
 		app.rooms.createNewRoom(room)
 		responseMessage := gen.CreateRoomResponse{RoomId: room.Id}
 		responseTransportMessage, _ := protocol.NewTransportMessageFromProtobuf(
@@ -123,10 +226,10 @@ func (app *App) handleMessageFromClient(session *session, transportMessage *prot
 			break
 		}
 		if session.RoomInside != nil {
-			session.RoomInside.removeUser(session.User)
+			session.RoomInside.removeUser(session.User, session)
 			session.RoomInside = nil
 		}
-		room.addUser(session.User, session.ToConnectionForwarder.Channel)
+		room.addUser(session.User, session)
 		session.RoomInside = room
 
 	case gen.MessageType_LEAVE_ROOM_REQUEST:
@@ -135,10 +238,31 @@ func (app *App) handleMessageFromClient(session *session, transportMessage *prot
 			break
 		}
 		if session.RoomInside != nil {
-			session.RoomInside.removeUser(session.User)
+			session.RoomInside.removeUser(session.User, session)
 			session.RoomInside = nil
 		}
 
+	case gen.MessageType_ROOM_LIST_REQUEST:
+		message := &gen.RoomListRequest{}
+		if err := proto.Unmarshal(transportMessage.Data, message); err != nil {
+			break
+		}
+		rooms, total, version := app.rooms.listRooms(message.Offset, message.Limit, message.Filter)
+		responseMessage := gen.RoomListResponse{
+			RequestId:    message.RequestId,
+			Offset:       message.Offset,
+			Total:        total,
+			Rooms:        rooms,
+			RoomsVersion: version,
+		}
+		responseTransportMessage, _ := protocol.NewTransportMessageFromProtobuf(
+			gen.MessageType_ROOM_LIST_RESPONSE, &responseMessage,
+		)
+		session.ToConnectionForwarder.Channel <- &responseTransportMessage
+
+	case gen.MessageType_STATUS_REQUEST:
+		app.sendStatusToUser(session, true)
+
 	case gen.MessageType_SOUND_PACKET:
 		if session.RoomInside != nil {
 			session.RoomInside.getInputChannel() <- transportMessage
@@ -146,18 +270,40 @@ func (app *App) handleMessageFromClient(session *session, transportMessage *prot
 	}
 }
 
-func (app *App) sendStatusToUser(session *session) {
+func (app *App) sendStatusToUser(session *session, full bool) {
 	status := gen.Status{
-		RoomsIds: app.rooms.getRoomsIds(),
-		IsInRoom: false,
-		Room:     nil,
+		IsInRoom:     false,
+		Room:         nil,
+		RoomsVersion: app.rooms.getVersion(),
+	}
+	// Clients that page through the rooms with RoomListRequest only need to know when the list changed
+	if !session.PagedRooms {
+		status.RoomsIds = app.rooms.getRoomsIds()
 	}
 	if session.RoomInside != nil {
 		status.IsInRoom = true
 		status.Room = session.RoomInside.toProtobufMessage()
 	}
 
-	transportMessage, err := protocol.NewTransportMessageFromProtobuf(gen.MessageType_STATUS, &status)
+	var transportMessage protocol.TransportMessage
+	var err error
+	if !session.StatusUpdates {
+		transportMessage, err = protocol.NewTransportMessageFromProtobuf(gen.MessageType_STATUS, &status)
+	} else if session.LastStatus == nil || full {
+		// Versions keep counting after a resync, so the client can tell the updates sent before it
+		status.Version = 1
+		if session.LastStatus != nil {
+			status.Version = session.LastStatus.version + 1
+		}
+		session.LastStatus = newStatusSnapshot(&status)
+		transportMessage, err = protocol.NewTransportMessageFromProtobuf(gen.MessageType_STATUS, &status)
+	} else {
+		update := session.LastStatus.update(&status)
+		if update == nil {
+			return
+		}
+		transportMessage, err = protocol.NewTransportMessageFromProtobuf(gen.MessageType_STATUS_UPDATE, update)
+	}
 	if err != nil {
 		panic(err)
 	}
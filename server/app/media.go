@@ -0,0 +1,91 @@
+package app
+
+import (
+	"crypto/rand"
+	"fmt"
+	"google.golang.org/protobuf/proto"
+	"net"
+	"server/gen"
+	"server/protocol"
+	"sync"
+)
+
+const mediaChannelSize = 64
+
+type mediaServer struct {
+	connection   *net.UDPConn
+	keyToSession sync.Map
+}
+
+func (media *mediaServer) listen(port string) error {
+	addr, err := net.ResolveUDPAddr("udp", port)
+	if err != nil {
+		return err
+	}
+	media.connection, err = net.ListenUDP("udp", addr)
+	return err
+}
+
+func (media *mediaServer) port() uint32 {
+	return uint32(media.connection.LocalAddr().(*net.UDPAddr).Port)
+}
+
+func (media *mediaServer) register(s *session) {
+	s.MediaKey = make([]byte, protocol.DatagramKeySize)
+	if _, err := rand.Read(s.MediaKey); err != nil {
+		panic("rand.Read error:" + err.Error())
+	}
+	s.MediaChannel = make(chan *protocol.TransportMessage, mediaChannelSize)
+	s.media = media
+	media.keyToSession.Store(string(s.MediaKey), s)
+}
+
+func (media *mediaServer) unregister(s *session) {
+	media.keyToSession.Delete(string(s.MediaKey))
+}
+
+func (media *mediaServer) send(addr *net.UDPAddr, key []byte, transportMessage *protocol.TransportMessage) error {
+	_, err := media.connection.WriteToUDP(protocol.NewDatagram(key, transportMessage), addr)
+	return err
+}
+
+// The server answers every hello, but only switches a session to datagrams once the client has seen an answer
+// and confirmed it, or has started sending sound packets itself
+func (media *mediaServer) serve() {
+	buffer := make([]byte, protocol.MaxDatagramSize)
+	for {
+		n, addr, err := media.connection.ReadFromUDP(buffer)
+		if err != nil {
+			fmt.Println(err)
+			return
+		}
+		key, transportMessage, err := protocol.ReadDatagram(buffer[:n])
+		if err != nil {
+			continue
+		}
+		value, ok := media.keyToSession.Load(string(key))
+		if !ok {
+			continue
+		}
+		s := value.(*session)
+
+		switch gen.MessageType(transportMessage.Type) {
+		case gen.MessageType_MEDIA_HELLO:
+			hello := &gen.MediaHello{}
+			if err := proto.Unmarshal(transportMessage.Data, hello); err != nil {
+				continue
+			}
+			if hello.Confirmed {
+				s.mediaAddr.Store(addr)
+			}
+			_ = media.send(addr, key, transportMessage)
+
+		case gen.MessageType_SOUND_PACKET:
+			s.mediaAddr.Store(addr)
+			select {
+			case s.MediaChannel <- transportMessage:
+			default:
+			}
+		}
+	}
+}
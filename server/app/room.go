@@ -1,49 +1,63 @@
 package app
 
 import (
+	"fmt"
 	"server/gen"
 	"server/protocol"
+	"strconv"
+	"strings"
 	"sync"
+	"sync/atomic"
+)
+
+const (
+	defaultRoomListLimit = 50
+	maxRoomListLimit     = 500
 )
 
 type room struct {
-	userToChannel sync.Map
+	userToSession sync.Map
 	InputChannel  chan *protocol.TransportMessage
 	Id            uint32
+	Name          string
+	usersCount    int32
 }
 
-func newRoom() *room {
+func newRoom(name string) *room {
 	return &room{
 		InputChannel: make(chan *protocol.TransportMessage),
+		Name:         name,
 	}
 }
 
-func (room *room) addUser(user *user, channel chan<- *protocol.TransportMessage) {
-	room.userToChannel.Store(user, channel)
+func (room *room) addUser(user *user, session *session) {
+	if _, loaded := room.userToSession.LoadOrStore(user, session); loaded {
+		room.userToSession.Store(user, session)
+	} else {
+		atomic.AddInt32(&room.usersCount, 1)
+	}
 }
 
-func (room *room) removeUser(user *user) {
-	room.userToChannel.Delete(user)
+// A user that reconnected may already be in the room with a newer session, which must stay
+func (room *room) removeUser(user *user, s *session) {
+	if value, ok := room.userToSession.Load(user); ok && value.(*session) == s {
+		room.userToSession.Delete(user)
+		atomic.AddInt32(&room.usersCount, -1)
+	}
 }
 
 func (room *room) streamDataToUsers() {
 	for message := range room.InputChannel {
-		room.userToChannel.Range(func(user, channel interface{}) bool {
-			defer func() {
-				recover()
-			}()
-			select {
-			case channel.(chan<- *protocol.TransportMessage) <- message:
-			default:
-			}
+		room.userToSession.Range(func(user, s interface{}) bool {
+			s.(*session).sendSoundPacket(message)
 			return true
 		})
 	}
 }
 
 func (room *room) toProtobufMessage() *gen.Room {
-	message := gen.Room{Id: room.Id}
-	room.userToChannel.Range(func(u, channel interface{}) bool {
+	message := gen.Room{Id: room.Id, Name: room.Name}
+	room.userToSession.Range(func(u, s interface{}) bool {
 		message.Users = append(message.Users, &gen.User{
 			Id:   u.(*user).Id,
 			Name: u.(*user).Name,
@@ -60,6 +74,8 @@ func (room *room) getInputChannel() chan<- *protocol.TransportMessage {
 type roomPool struct {
 	m        sync.Mutex
 	idToRoom []*room
+	// version changes whenever a room is created, so clients that page through the rooms know to fetch again
+	version uint64
 }
 
 func (roomPool *roomPool) getRoom(id uint32) (*room, bool) {
@@ -75,7 +91,11 @@ func (roomPool *roomPool) createNewRoom(room *room) {
 	roomPool.m.Lock()
 	defer roomPool.m.Unlock()
 	room.Id = uint32(len(roomPool.idToRoom))
+	if room.Name == "" {
+		room.Name = fmt.Sprintf("Room %d", room.Id)
+	}
 	roomPool.idToRoom = append(roomPool.idToRoom, room)
+	roomPool.version++
 	go room.streamDataToUsers()
 }
 
@@ -85,3 +105,39 @@ func (roomPool *roomPool) getRoomsIds() (ids []uint32) {
 	}
 	return
 }
+
+func (roomPool *roomPool) getVersion() uint64 {
+	roomPool.m.Lock()
+	defer roomPool.m.Unlock()
+	return roomPool.version
+}
+
+// listRooms returns up to limit rooms whose name or id contains filter, skipping the first offset of them, with the
+// number of matching rooms
+func (roomPool *roomPool) listRooms(offset uint32, limit uint32, filter string) ([]*gen.RoomInfo, uint32, uint64) {
+	if limit == 0 {
+		limit = defaultRoomListLimit
+	} else if limit > maxRoomListLimit {
+		limit = maxRoomListLimit
+	}
+	filter = strings.ToLower(filter)
+	roomPool.m.Lock()
+	defer roomPool.m.Unlock()
+	var rooms []*gen.RoomInfo
+	var total uint32
+	for _, room := range roomPool.idToRoom {
+		if filter != "" && !strings.Contains(strings.ToLower(room.Name), filter) &&
+			!strings.Contains(strconv.FormatUint(uint64(room.Id), 10), filter) {
+			continue
+		}
+		if total >= offset && total-offset < limit {
+			rooms = append(rooms, &gen.RoomInfo{
+				Id:         room.Id,
+				Name:       room.Name,
+				UsersCount: uint32(atomic.LoadInt32(&room.usersCount)),
+			})
+		}
+		total++
+	}
+	return rooms, total, roomPool.version
+}
@@ -2,7 +2,9 @@ package app
 
 import (
 	"net"
+	"server/protocol"
 	"sync"
+	"sync/atomic"
 )
 
 type session struct {
@@ -11,6 +13,27 @@ type session struct {
 	FromConnectionForwarder fromConnectionForwarder
 	Connection              net.Conn
 	RoomInside              *room
+	StatusUpdates           bool
+	PagedRooms              bool
+	LastStatus              *statusSnapshot
+	MediaKey                []byte
+	MediaChannel            chan *protocol.TransportMessage
+	media                   *mediaServer
+	mediaAddr               atomic.Value
+}
+
+func (session *session) sendSoundPacket(transportMessage *protocol.TransportMessage) {
+	if addr, ok := session.mediaAddr.Load().(*net.UDPAddr); ok {
+		_ = session.media.send(addr, session.MediaKey, transportMessage)
+		return
+	}
+	defer func() {
+		recover()
+	}()
+	select {
+	case session.ToConnectionForwarder.Channel <- transportMessage:
+	default:
+	}
 }
 
 type sessionPool struct {
@@ -18,12 +41,23 @@ type sessionPool struct {
 	userIdToSession map[uint32]*session
 }
 
-func (sessionPool *sessionPool) updateClientSession(usedId uint32, session *session) {
+func (sessionPool *sessionPool) updateClientSession(usedId uint32, newSession *session) {
 	sessionPool.m.Lock()
 	defer sessionPool.m.Unlock()
 	oldSession, ok := sessionPool.userIdToSession[usedId]
 	if ok {
 		_ = oldSession.Connection.Close()
 	}
-	sessionPool.userIdToSession[usedId] = session
+	if sessionPool.userIdToSession == nil {
+		sessionPool.userIdToSession = make(map[uint32]*session)
+	}
+	sessionPool.userIdToSession[usedId] = newSession
+}
+
+func (sessionPool *sessionPool) removeClientSession(usedId uint32, session *session) {
+	sessionPool.m.Lock()
+	defer sessionPool.m.Unlock()
+	if sessionPool.userIdToSession[usedId] == session {
+		delete(sessionPool.userIdToSession, usedId)
+	}
 }
@@ -0,0 +1,73 @@
+package app
+
+import "server/gen"
+
+type statusSnapshot struct {
+	version      uint64
+	roomsIds     map[uint32]bool
+	roomsVersion uint64
+	isInRoom     bool
+	roomId       uint32
+	usersIds     map[uint32]bool
+}
+
+func newStatusSnapshot(status *gen.Status) *statusSnapshot {
+	snapshot := &statusSnapshot{
+		version:      status.Version,
+		roomsIds:     make(map[uint32]bool, len(status.RoomsIds)),
+		roomsVersion: status.RoomsVersion,
+		isInRoom:     status.IsInRoom,
+		usersIds:     make(map[uint32]bool),
+	}
+	for _, id := range status.RoomsIds {
+		snapshot.roomsIds[id] = true
+	}
+	if status.Room != nil {
+		snapshot.roomId = status.Room.Id
+		for _, u := range status.Room.Users {
+			snapshot.usersIds[u.Id] = true
+		}
+	}
+	return snapshot
+}
+
+// update returns the StatusUpdate that turns the snapshot into status and advances the snapshot,
+// or nil when nothing changed
+func (snapshot *statusSnapshot) update(status *gen.Status) *gen.StatusUpdate {
+	status.Version = snapshot.version + 1
+	next := newStatusSnapshot(status)
+	update := &gen.StatusUpdate{Version: next.version, RoomsVersion: next.roomsVersion}
+
+	for _, id := range status.RoomsIds {
+		if !snapshot.roomsIds[id] {
+			update.AddedRoomsIds = append(update.AddedRoomsIds, id)
+		}
+	}
+	for id := range snapshot.roomsIds {
+		if !next.roomsIds[id] {
+			update.RemovedRoomsIds = append(update.RemovedRoomsIds, id)
+		}
+	}
+	if next.isInRoom != snapshot.isInRoom || next.roomId != snapshot.roomId {
+		update.RoomChanged = true
+		update.Room = status.Room
+	} else if next.isInRoom {
+		for _, u := range status.Room.Users {
+			if !snapshot.usersIds[u.Id] {
+				update.JoinedUsers = append(update.JoinedUsers, u)
+			}
+		}
+		for id := range snapshot.usersIds {
+			if !next.usersIds[id] {
+				update.LeftUsersIds = append(update.LeftUsersIds, id)
+			}
+		}
+	}
+
+	if !update.RoomChanged && len(update.AddedRoomsIds) == 0 && len(update.RemovedRoomsIds) == 0 &&
+		len(update.JoinedUsers) == 0 && len(update.LeftUsersIds) == 0 && next.roomsVersion == snapshot.roomsVersion {
+		return nil
+	}
+	*snapshot = *next
+	return update
+}
@@ -1,17 +1,23 @@
 package app
 
 import (
+	"crypto/rand"
+	"encoding/hex"
 	"sync"
 )
 
+const tokenSize = 16
+
 type user struct {
-	Name string
-	Id   uint32
+	Name  string
+	Id    uint32
+	Token string
 }
 
 type userPool struct {
-	m        sync.Mutex
-	idToUser []*user
+	m           sync.Mutex
+	idToUser    []*user
+	tokenToUser map[string]*user
 }
 
 func (userPool *userPool) getUser(id uint32) (*user, bool) {
@@ -23,10 +29,26 @@ func (userPool *userPool) getUser(id uint32) (*user, bool) {
 	return userPool.idToUser[id], true
 }
 
-func (userPool *userPool) addUser(user *user) *user {
+func (userPool *userPool) getUserByToken(token string) (*user, bool) {
 	userPool.m.Lock()
 	defer userPool.m.Unlock()
-	user.Id = uint32(len(userPool.idToUser))
-	userPool.idToUser = append(userPool.idToUser, user)
-	return user
+	user, ok := userPool.tokenToUser[token]
+	return user, ok
+}
+
+func (userPool *userPool) addUser(u *user) *user {
+	token := make([]byte, tokenSize)
+	if _, err := rand.Read(token); err != nil {
+		panic("rand.Read error:" + err.Error())
+	}
+	userPool.m.Lock()
+	defer userPool.m.Unlock()
+	u.Id = uint32(len(userPool.idToUser))
+	u.Token = hex.EncodeToString(token)
+	userPool.idToUser = append(userPool.idToUser, u)
+	if userPool.tokenToUser == nil {
+		userPool.tokenToUser = make(map[string]*user)
+	}
+	userPool.tokenToUser[u.Token] = u
+	return u
 }
@@ -1,10 +1,18 @@
 package main
 
-import "server/app"
+import (
+	"server/app"
+	"server/gen"
+)
 
 var PORT = ":8081"
 
 func main() {
-	application := app.App{}
+	application := app.App{
+		Codecs:   []gen.Codec{gen.Codec_CODEC_MU_LAW, gen.Codec_CODEC_RAW_PCM},
+		UdpMedia: true,
+		Rates:    []uint32{16000, 48000, 24000, 12000, 8000},
+		Channels: 2,
+	}
 	application.Run(PORT)
 }
@@ -2,11 +2,15 @@ package protocol
 
 import (
 	"encoding/binary"
+	"errors"
 	"google.golang.org/protobuf/proto"
 	"io"
 	"server/gen"
 )
 
+const DatagramKeySize = 16
+const MaxDatagramSize = 65507
+
 type TransportMessage struct {
 	Type uint32
 	Data []byte
@@ -49,6 +53,24 @@ func NewTransportMessageFromProtobuf(messageType gen.MessageType, message proto.
 	return TransportMessage{uint32(messageType), encodedMessage}, nil
 }
 
+// Datagrams carry the message type and the media session key instead of the length
+func ReadDatagram(datagram []byte) ([]byte, *TransportMessage, error) {
+	if len(datagram) < 4+DatagramKeySize {
+		return nil, nil, errors.New("datagram is too short")
+	}
+	messageData := make([]byte, len(datagram)-4-DatagramKeySize)
+	copy(messageData, datagram[4+DatagramKeySize:])
+	return datagram[4 : 4+DatagramKeySize], &TransportMessage{binary.BigEndian.Uint32(datagram[:4]), messageData}, nil
+}
+
+func NewDatagram(key []byte, transportMessage *TransportMessage) []byte {
+	datagram := make([]byte, 4+DatagramKeySize+len(transportMessage.Data))
+	binary.BigEndian.PutUint32(datagram[:4], transportMessage.Type)
+	copy(datagram[4:4+DatagramKeySize], key)
+	copy(datagram[4+DatagramKeySize:], transportMessage.Data)
+	return datagram
+}
+
 func writeFull(writer io.Writer, buf []byte) error {
 	done := 0
 	for done < len(buf) {